@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: `gh` subprocess backend vs in-process HTTP backend
+
+Serves a small fake REST API from a local thread (pointed at with
+KEEP_GITHUB_API_URL) and a fake `gh` that answers from the same data,
+then fetches the same issues through both backends. The fake gh does no
+network or auth work, so the gap shown is process spawn alone; real gh
+calls also pay a TLS handshake each time. Fails if the backends return
+different issues.
+
+Usage:
+    python benchmarks/bench_backend.py [--count 50] [--concurrency 4]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'skills' / 'keep' / 'scripts'))
+
+import github_sync  # noqa: E402
+from bench_fetch import install_fake_gh  # noqa: E402
+
+
+def rest_issue(number: int) -> dict:
+    return {
+        'number': number,
+        'title': f'Issue {number}',
+        'body': f'Depends on #{number + 1}',
+        'labels': [{'node_id': 'L1', 'name': 'bug', 'description': None, 'color': 'd73a4a'}],
+        'state': 'open',
+        'created_at': '2024-01-01T00:00:00Z',
+        'updated_at': '2024-01-02T00:00:00Z',
+        'html_url': f'https://github.com/o/r/issues/{number}',
+    }
+
+
+FAKE_GH = '''#!{python} -S
+import json, sys
+args = sys.argv[1:]
+# fetch_issue reads `gh api repos/{{owner}}/{{repo}}/issues/N --include`
+if args[:1] == ['api'] and '--include' in args and '/issues/' in args[1]:
+    number = int(args[1].split('?')[0].rsplit('/', 1)[-1])
+    sys.stdout.write('HTTP/2.0 200 OK\\r\\nContent-Type: application/json\\r\\n\\r\\n')
+    print(json.dumps({{
+        'number': number, 'title': 'Issue %d' % number, 'body': 'Depends on #%d' % (number + 1),
+        'labels': [{{'node_id': 'L1', 'name': 'bug', 'description': None, 'color': 'd73a4a'}}],
+        'state': 'open', 'created_at': '2024-01-01T00:00:00Z', 'updated_at': '2024-01-02T00:00:00Z',
+        'html_url': 'https://github.com/o/r/issues/%d' % number,
+    }}))
+else:
+    print('fake gh: unsupported command: %s' % ' '.join(args), file=sys.stderr)
+    sys.exit(1)
+'''
+
+
+class FakeAPI(BaseHTTPRequestHandler):
+    """GET /repos/o/r/issues/<n> over HTTP/1.1 keep-alive"""
+
+    protocol_version = 'HTTP/1.1'
+    # Send headers and body in one write (avoids Nagle/delayed-ACK stalls)
+    wbufsize = 64 * 1024
+
+    def do_GET(self):
+        number = int(self.path.rstrip('/').rsplit('/', 1)[-1])
+        payload = json.dumps(rest_issue(number)).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark gh vs HTTP backend')
+    parser.add_argument('--count', type=int, default=50, help='Issues to fetch')
+    parser.add_argument('--concurrency', type=int, default=4, help='Worker pool size')
+    args = parser.parse_args()
+
+    numbers = [str(n) for n in range(1, args.count + 1)]
+    os.environ['KEEP_RATE_LIMIT'] = 'off'
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeAPI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        install_fake_gh(Path(tmp), 0)
+        (Path(tmp) / 'gh').write_text(FAKE_GH.format(python=sys.executable))
+
+        start = time.perf_counter()
+        via_gh = github_sync.fetch_issues(numbers, args.concurrency, use_cache=False)
+        gh_time = time.perf_counter() - start
+
+        os.environ.update({
+            'KEEP_GH_BACKEND': 'http',
+            'KEEP_GITHUB_API_URL': f'http://127.0.0.1:{server.server_port}',
+            'GH_TOKEN': 'bench',
+            'GH_REPO': 'o/r',
+        })
+        start = time.perf_counter()
+        via_http = github_sync.fetch_issues(numbers, args.concurrency, use_cache=False)
+        http_time = time.perf_counter() - start
+
+    server.shutdown()
+
+    if via_gh != via_http:
+        print("ERROR: HTTP backend results differ from gh", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{args.count} issues, concurrency {args.concurrency}")
+    print(f"gh subprocess: {gh_time:.3f}s")
+    print(f"in-process:    {http_time:.3f}s ({gh_time / http_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-scan continuity matching vs per-pattern substring checks
+
+Builds a context with many recent directories and issue references
+(default 50 patterns) and matches it against a synthetic backlog (default
+10k issues) using ContinuityMatcher and the previous approach of one
+`in` check per pattern. Fails if the two disagree on any issue.
+
+Usage:
+    python benchmarks/bench_continuity.py [--patterns 50] [--size 10000]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'skills' / 'keep' / 'scripts'))
+
+from score_issues import ContinuityMatcher  # noqa: E402
+
+
+WORDS = ['handler', 'cache', 'token', 'session', 'retry', 'config', 'the', 'and', 'fix']
+
+
+def naive_match(
+    title: str,
+    body: str,
+    directories: Sequence[str],
+    recent_issues: Sequence[str]
+) -> Tuple[Optional[str], Optional[str]]:
+    """Previous per-pattern substring scan"""
+    issue_text = f"{title} {body}".lower()
+    directory = next((d for d in directories if d.lower() in issue_text), None)
+    recent_issue = next((n for n in recent_issues if f'#{n}' in body), None)
+    return directory, recent_issue
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark continuity matching')
+    parser.add_argument('--patterns', type=int, default=50, help='Directories + issue refs')
+    parser.add_argument('--size', type=int, default=10000, help='Number of issues')
+    parser.add_argument('--body-words', type=int, default=400, help='Words per body')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    directories = tuple(
+        f"src/{rng.choice(['api', 'auth', 'core', 'web'])}/module{i}"
+        for i in range(args.patterns // 2)
+    )
+    recent_issues = tuple(str(rng.randint(1, 5000)) for _ in range(args.patterns - len(directories)))
+
+    issues = []
+    for number in range(args.size):
+        words = [rng.choice(WORDS) for _ in range(args.body_words)]
+        if rng.random() < 0.3:
+            words[rng.randrange(len(words))] = rng.choice(directories).upper()
+        if rng.random() < 0.3:
+            words[rng.randrange(len(words))] = f"#{rng.randint(1, 5000)}"
+        issues.append((f"Issue {number}", ' '.join(words)))
+
+    matcher = ContinuityMatcher(directories, recent_issues)
+
+    start = time.perf_counter()
+    expected = [naive_match(title, body, directories, recent_issues) for title, body in issues]
+    naive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [matcher.match(title, body) for title, body in issues]
+    matcher_time = time.perf_counter() - start
+
+    if expected != actual:
+        print("ERROR: matcher disagrees with substring checks", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{args.patterns} patterns x {args.size} issues")
+    print(f"per-pattern scan: {naive_time:.3f}s")
+    print(f"single scan:      {matcher_time:.3f}s ({naive_time / matcher_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sequential fetch_issue vs concurrent fetch_issues
+
+Puts a fake `gh` on PATH that sleeps before answering issue reads, to
+stand in for process spawn + network latency, then fetches the same
+issues one at a time and through the worker pool.
+
+Usage:
+    python benchmarks/bench_fetch.py [--count 12] [--delay 0.3] [--concurrency 4]
+"""
+
+import os
+import stat
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'skills' / 'keep' / 'scripts'))
+
+from github_sync import fetch_issue, fetch_issues  # noqa: E402
+
+
+FAKE_GH = '''#!{python}
+import json, sys, time
+time.sleep({delay})
+args = sys.argv[1:]
+# fetch_issue reads `gh api repos/{{owner}}/{{repo}}/issues/N --include`
+if args[:1] == ['api'] and '--include' in args and '/issues/' in args[1]:
+    number = int(args[1].split('?')[0].rsplit('/', 1)[-1])
+    print('HTTP/2.0 200 OK')
+    print('Content-Type: application/json; charset=utf-8')
+    print('Etag: W/"%d"' % number)
+    print()
+    print(json.dumps({{'number': number, 'title': 'Issue %d' % number, 'body': '',
+                      'labels': [], 'state': 'open', 'updated_at': '2024-01-01T00:00:00Z'}}))
+else:
+    print('fake gh: unsupported command: %s' % ' '.join(args), file=sys.stderr)
+    sys.exit(1)
+'''
+
+
+def install_fake_gh(directory: Path, delay: float):
+    """Write a fake gh executable into `directory` and put it first on PATH"""
+    gh = directory / 'gh'
+    gh.write_text(FAKE_GH.format(python=sys.executable, delay=delay))
+    gh.chmod(gh.stat().st_mode | stat.S_IEXEC)
+    os.environ['PATH'] = f"{directory}{os.pathsep}{os.environ['PATH']}"
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark concurrent issue fetching')
+    parser.add_argument('--count', type=int, default=12, help='Issues to fetch')
+    parser.add_argument('--delay', type=float, default=0.3, help='Fake gh latency (seconds)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Worker pool size')
+    args = parser.parse_args()
+
+    numbers = [str(n) for n in range(1, args.count + 1)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        install_fake_gh(Path(tmp), args.delay)
+
+        start = time.perf_counter()
+        sequential = [fetch_issue(number, use_cache=False) for number in numbers]
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        concurrent = fetch_issues(numbers, args.concurrency, use_cache=False)
+        concurrent_time = time.perf_counter() - start
+
+    if sequential != concurrent:
+        print("ERROR: concurrent results differ from sequential", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{args.count} issues, {args.delay}s per gh call")
+    print(f"{'sequential:':<18} {sequential_time:.2f}s")
+    print(f"{f'concurrent (x{args.concurrency}):':<18} {concurrent_time:.2f}s "
+          f"({sequential_time / concurrent_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
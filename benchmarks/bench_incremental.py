@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: incremental re-scoring with a ScoreMemo
+
+Scores a synthetic backlog with long bodies from scratch, then again
+with a warm memo: unchanged, after one issue is edited, and after
+state.md gains a directory. Every result is checked against a full
+score_all_issues run.
+
+Usage:
+    python benchmarks/bench_incremental.py [--size 20000] [--body-words 300]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'skills' / 'keep' / 'scripts'))
+
+from bench_scoring import make_issues  # noqa: E402
+from score_issues import ScoreMemo, score_all_issues  # noqa: E402
+
+
+def timed(label: str, expected, issues, context, memo):
+    start = time.perf_counter()
+    scored = score_all_issues(issues, context, engine='auto', memo=memo)
+    elapsed = time.perf_counter() - start
+    if scored != expected:
+        print(f"ERROR: {label} differs from a full run", file=sys.stderr)
+        sys.exit(1)
+    print(f"{label:<22} {elapsed:.3f}s")
+    return elapsed
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark incremental re-scoring')
+    parser.add_argument('--size', type=int, default=20000, help='Number of issues')
+    parser.add_argument('--body-words', type=int, default=300, help='Extra words per body')
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    words = ['handler', 'cache', 'token', 'session', 'retry', 'config', 'the', 'and', 'fix']
+    issues = make_issues(args.size)
+    for issue in issues:
+        issue['body'] += ' ' + ' '.join(rng.choice(words) for _ in range(args.body_words))
+
+    context = {
+        'recent_directories': [f'src/module{i}' for i in range(10)],
+        'recent_labels': ['auth'],
+        'recent_issues': ['1', '2'],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'scores.json'
+        expected = score_all_issues(issues, context)
+
+        start = time.perf_counter()
+        score_all_issues(issues, context)
+        print(f"{'full (no memo):':<22} {time.perf_counter() - start:.3f}s")
+
+        memo = ScoreMemo.load(path)
+        timed('cold memo:', expected, issues, context, memo)
+        memo.save()
+
+        memo = ScoreMemo.load(path)
+        timed('warm, unchanged:', expected, issues, context, memo)
+
+        issues[len(issues) // 2]['body'] += ' touches src/module3'
+        expected = score_all_issues(issues, context)
+        timed('warm, one edited:', expected, issues, context, memo)
+
+        context['recent_directories'].append('src/module42')
+        expected = score_all_issues(issues, context)
+        timed('warm, new directory:', expected, issues, context, memo)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak memory of score_issues.py on large exports
+
+Runs the CLI end to end (fresh process per run) on a generated backlog
+and reports the child's peak RSS, once per input mode. Peak RSS minus
+that of a bare interpreter, divided by the issue count, is the number
+to compare across changes; the export's own size is shown for scale.
+
+With --save-output DIR the outputs are written there, so two trees can
+be checked for identical results with `cmp`.
+
+Usage:
+    python benchmarks/bench_memory.py [--size 50000] [--save-output DIR]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent / 'skills' / 'keep' / 'scripts'
+
+
+def peak_rss_kb(cmd, cwd: str, env, stdin_path=None, stdout=subprocess.DEVNULL) -> int:
+    """Run a command and return its peak RSS in KiB"""
+    stdin = open(stdin_path) if stdin_path else subprocess.DEVNULL
+    try:
+        proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdin=stdin, stdout=stdout)
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    finally:
+        if stdin_path:
+            stdin.close()
+    if proc.returncode:
+        print(f"ERROR: {' '.join(cmd)} exited with {proc.returncode}", file=sys.stderr)
+        sys.exit(1)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark score_issues.py peak memory')
+    parser.add_argument('--size', type=int, default=50000, help='Number of issues')
+    parser.add_argument('--save-output', help='Directory to write each mode\'s output to')
+    args = parser.parse_args()
+
+    # Fixed hash seed: label overlaps are listed in set order
+    env = dict(os.environ, KEEP_DAEMON='off', PYTHONHASHSEED='0')
+    env.pop('KEEP_TRACE', None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Generated in a child so this process stays small: children
+        # start from a copy of it, which counts towards their peak RSS
+        subprocess.run(
+            [sys.executable, str(BENCH_DIR / 'generate.py'), '--count', str(args.size), '--out', tmp],
+            stdout=subprocess.DEVNULL, check=True
+        )
+        issues_path = Path(tmp) / 'issues.json'
+        export_mb = issues_path.stat().st_size / 2 ** 20
+
+        score = [sys.executable, str(SCRIPTS_DIR / 'score_issues.py'), '--recent-work', 'state.md']
+        modes = [
+            ('--json --issues FILE', score + ['--json', '--issues', str(issues_path)], None),
+            ('--json < stdin', score + ['--json'], str(issues_path)),
+            ('text --issues FILE', score + ['--issues', str(issues_path)], None),
+            ('--stream --json (top 5)', score + ['--stream', '--json', '--issues', str(issues_path)], None),
+        ]
+
+        baseline = peak_rss_kb([sys.executable, '-c', 'pass'], tmp, env)
+        print(f"{args.size} issues, export {export_mb:.1f} MiB; bare interpreter {baseline / 1024:.1f} MiB")
+        for label, cmd, stdin_path in modes:
+            if args.save_output:
+                out_dir = Path(args.save_output)
+                out_dir.mkdir(parents=True, exist_ok=True)
+                name = ''.join(c if c.isalnum() else '_' for c in label).strip('_')
+                with open(out_dir / f'{name}.out', 'w') as out:
+                    peak = peak_rss_kb(cmd, tmp, env, stdin_path, out)
+            else:
+                peak = peak_rss_kb(cmd, tmp, env, stdin_path)
+            per_issue = (peak - baseline) * 1024 / args.size
+            print(f"{label:<26} {peak / 1024:8.1f} MiB  ({per_issue:7.0f} B/issue over interpreter)")
+
+
+if __name__ == '__main__':
+    main()
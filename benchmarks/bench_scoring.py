@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for score_all_issues
+
+Scores synthetic backlogs of increasing size and reports time per issue.
+With a shared issue index the per-issue cost should stay flat as the
+backlog grows (linear total time).
+
+Usage:
+    python benchmarks/bench_scoring.py [--sizes 1000,10000,100000]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'skills' / 'keep' / 'scripts'))
+
+from score_issues import score_all_issues  # noqa: E402
+
+
+LABELS = ['urgent', 'high-priority', 'low-priority', 'bug', 'feature', 'auth', 'api', 'docs']
+
+
+def make_issues(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Generate a deterministic synthetic backlog
+
+    Roughly a third of issues reference blockers, a quarter are closed.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    issues = []
+
+    for number in range(1, count + 1):
+        body = f"Work on src/module{number % 50}/ and related code."
+        for _ in range(rng.choice([0, 0, 1, 2])):
+            body += f" Depends on #{rng.randint(1, count)}."
+
+        updated = now - timedelta(days=rng.randint(0, 60))
+        issues.append({
+            'number': number,
+            'title': f"Synthetic issue {number}",
+            'body': body,
+            'labels': [{'name': name} for name in rng.sample(LABELS, rng.randint(0, 2))],
+            'state': 'CLOSED' if rng.random() < 0.25 else 'OPEN',
+            'updatedAt': updated.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        })
+
+    return issues
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark score_all_issues scaling')
+    parser.add_argument(
+        '--sizes',
+        default='1000,10000,100000',
+        help='Comma-separated backlog sizes'
+    )
+    args = parser.parse_args()
+
+    context = {
+        'recent_directories': ['src/module1', 'src/module2'],
+        'recent_labels': ['auth'],
+        'recent_issues': ['1', '2'],
+    }
+
+    print(f"{'issues':>8}  {'seconds':>8}  {'us/issue':>9}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        issues = make_issues(size)
+        start = time.perf_counter()
+        score_all_issues(issues, context)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>8}  {elapsed:>8.3f}  {elapsed / size * 1e6:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: scoring a columnar snapshot vs the JSON export it came from
+
+Writes a synthetic backlog as JSON and as a snapshot (github_sync.py
+snapshot --issues), then times fresh `score_issues.py` processes on
+each (median of --runs, interpreter start-up included). Fails unless
+both give byte-identical output, for the top N and for --json.
+
+Target: cold start on a 100k-issue snapshot well under a second.
+
+Usage:
+    python benchmarks/bench_snapshot.py [--count 100000] [--runs 5]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent / 'skills' / 'keep' / 'scripts'
+sys.path.insert(0, str(BENCH_DIR))
+
+from generate import make_backlog, make_state  # noqa: E402
+
+
+def run(cmd, cwd: str, env) -> bytes:
+    return subprocess.run(cmd, cwd=cwd, env=env, stdout=subprocess.PIPE, check=True).stdout
+
+
+def median_ms(cmd, runs: int, cwd: str, env) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        run(cmd, cwd, env)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark snapshot scoring')
+    parser.add_argument('--count', type=int, default=100000, help='Issues in the backlog')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per command')
+    args = parser.parse_args()
+
+    env = dict(os.environ, KEEP_DAEMON='off', KEEP_TEXT_INDEX='off', PYTHONHASHSEED='0')
+    env.pop('KEEP_TRACE', None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        issues = make_backlog(args.count, 1)
+        issues_path = Path(tmp) / 'issues.json'
+        issues_path.write_text(json.dumps(issues))
+        state_path = Path(tmp) / 'state.md'
+        state_path.write_text(make_state(issues, 1))
+        issues = None
+
+        snapshot_path = Path(tmp) / 'issues.snap'
+        start = time.perf_counter()
+        run([
+            sys.executable, str(SCRIPTS_DIR / 'github_sync.py'), 'snapshot', str(snapshot_path),
+            '--issues', str(issues_path)
+        ], tmp, env)
+        written = time.perf_counter() - start
+
+        print(f"{args.count} issues: JSON {issues_path.stat().st_size / 2 ** 20:.1f} MiB, "
+              f"snapshot {snapshot_path.stat().st_size / 2 ** 20:.1f} MiB (written in {written:.1f} s)")
+
+        score = [sys.executable, str(SCRIPTS_DIR / 'score_issues.py'), '--recent-work', str(state_path)]
+        for extra in ([], ['--json']):
+            if run(score + ['--issues', str(issues_path)] + extra, tmp, env) != \
+                    run(score + ['--snapshot', str(snapshot_path)] + extra, tmp, env):
+                print(f"FAIL: snapshot output differs from JSON ({' '.join(extra) or 'top N'})")
+                sys.exit(1)
+        print("Outputs identical (top N and --json)")
+
+        for label, source in (('--issues issues.json', ['--issues', str(issues_path)]),
+                              ('--snapshot issues.snap', ['--snapshot', str(snapshot_path)])):
+            elapsed = median_ms(score + source, args.runs, tmp, env)
+            print(f"{label:<24} {elapsed:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: start-up cost of the Keep CLIs
+
+Agents run the scripts as fresh processes many times per session, so for
+small inputs interpreter start-up and imports dominate. Times each
+command end to end (median of --runs) next to a bare `python -c pass`,
+in a throwaway project with a 20-issue backlog.
+
+Target: `score_issues.py --json` on a small input under 40 ms.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 30]
+    python -X importtime skills/keep/scripts/score_issues.py --help 2>&1 | sort -t'|' -k2 -n | tail
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent / 'skills' / 'keep' / 'scripts'
+sys.path.insert(0, str(BENCH_DIR))
+
+from generate import make_backlog, make_state  # noqa: E402
+
+
+def median_ms(cmd, runs: int, cwd: str, env, stdin_path=None) -> float:
+    samples = []
+    for _ in range(runs):
+        stdin = open(stdin_path) if stdin_path else subprocess.DEVNULL
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=cwd, env=env, stdin=stdin, stdout=subprocess.DEVNULL, check=False)
+        samples.append((time.perf_counter() - start) * 1000)
+        if stdin_path:
+            stdin.close()
+    return statistics.median(samples)
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark CLI start-up')
+    parser.add_argument('--runs', type=int, default=30, help='Runs per command')
+    args = parser.parse_args()
+
+    env = dict(os.environ, KEEP_DAEMON='off', KEEP_RATE_LIMIT='off')
+    env.pop('KEEP_TRACE', None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / '.claude').mkdir()
+        issues = make_backlog(20, 1)
+        issues_path = Path(tmp) / 'issues.json'
+        issues_path.write_text(json.dumps(issues))
+        (Path(tmp) / '.claude' / 'state.md').write_text(make_state(issues, 1))
+
+        score = [sys.executable, str(SCRIPTS_DIR / 'score_issues.py')]
+        sync = [sys.executable, str(SCRIPTS_DIR / 'github_sync.py')]
+        commands = [
+            ('python -c pass', [sys.executable, '-c', 'pass'], None),
+            ('score_issues.py --json', score + ['--json'], str(issues_path)),
+            ('score_issues.py (text)', score, str(issues_path)),
+            ('github_sync.py check', sync + ['check'], None),
+        ]
+        baseline = None
+        for label, cmd, stdin_path in commands:
+            elapsed = median_ms(cmd, args.runs, tmp, env, stdin_path)
+            if baseline is None:
+                baseline = elapsed
+                print(f"{label:<26} {elapsed:7.1f} ms")
+            else:
+                print(f"{label:<26} {elapsed:7.1f} ms  (+{elapsed - baseline:.1f} ms over interpreter)")
+
+
+if __name__ == '__main__':
+    main()
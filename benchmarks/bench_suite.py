@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: Keep scripts at 100 to 100k issues
+
+For each backlog size, a synthetic backlog and state.md (see
+generate.py) are written to a temp directory. Each phase then runs in
+its own worker process, so peak RSS is measured per phase:
+
+- parse_state:  parse_state_file on the generated state.md
+- json_load:    json.loads of the issue list
+- score_all:    score_all_issues, full ranking (--json output path)
+- score_top:    score_all_issues, top 5 with the auto engine (text path)
+- format:       format_recommendations for the top 5
+- json_dump:    json.dumps(scored, indent=2) as the CLI prints it
+- gh_list:      github_sync.list_issues through a fake `gh` binary
+                serving prebuilt GraphQL pages (one process spawn +
+                JSON decode per page of 100, no network)
+
+Each result reports the best wall time over a few repeats, time per
+issue, peak RSS of the worker, and tracemalloc peak and retained bytes
+per issue. Results are written as JSON so runs from different commits
+can be compared with --compare.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 100,1000,10000,100000] [--output out.json]
+    python benchmarks/bench_suite.py --compare before.json after.json
+"""
+
+import json
+import os
+import platform
+import resource
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent / 'skills' / 'keep' / 'scripts'
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+PHASES = ['parse_state', 'json_load', 'score_all', 'score_top', 'format', 'json_dump', 'gh_list']
+
+# Total issues processed per phase across repeats (small sizes repeat more)
+REPEAT_BUDGET = 20000
+MAX_REPEATS = 20
+
+FAKE_GH = '''#!{python}
+import os, sys
+if sys.argv[1:3] == ['api', 'graphql']:
+    cursor = [a[7:] for a in sys.argv if a.startswith('cursor=')]
+    with open(os.path.join(os.environ['BENCH_PAGES'], (cursor or ['0'])[0] + '.json')) as f:
+        sys.stdout.write(f.read())
+else:
+    sys.exit(1)
+'''
+
+
+def write_fake_pages(issues: List[Dict[str, Any]], directory: Path, page_size: int = 100):
+    """Write GraphQL issue pages for FAKE_GH (cursor = page index)"""
+    directory.mkdir(exist_ok=True)
+    pages = max(1, -(-len(issues) // page_size))
+    for page in range(pages):
+        nodes = [
+            dict(issue, labels={'nodes': issue.get('labels', [])})
+            for issue in issues[page * page_size:(page + 1) * page_size]
+        ]
+        has_next = page + 1 < pages
+        (directory / f'{page}.json').write_text(json.dumps({'data': {'repository': {'issues': {
+            'pageInfo': {'hasNextPage': has_next, 'endCursor': str(page + 1) if has_next else None},
+            'nodes': nodes,
+        }}}}))
+
+
+def _reset_memos():
+    """Drop in-process parse memos so every repeat starts cold"""
+    import blockers
+    blockers._memo.clear()
+    blockers._memo_used.clear()
+
+
+def prepare(phase: str, data: Path) -> Callable[[], Any]:
+    """Load inputs for a phase and return the callable to measure"""
+    import github_sync
+    from score_issues import format_recommendations, parse_state_file, score_all_issues
+
+    state_path = str(data / 'state.md')
+    issues_text = (data / 'issues.json').read_text()
+    if phase == 'parse_state':
+        return lambda: parse_state_file(state_path)
+    if phase == 'json_load':
+        return lambda: json.loads(issues_text)
+
+    issues = json.loads(issues_text)
+    context = parse_state_file(state_path)
+
+    if phase == 'score_all':
+        return lambda: (_reset_memos(), score_all_issues(issues, context))
+    if phase == 'score_top':
+        return lambda: (_reset_memos(), score_all_issues(issues, context, 5, engine='auto'))
+    if phase == 'format':
+        top = score_all_issues(issues, context, 5)
+        return lambda: format_recommendations(top, 5)
+    if phase == 'json_dump':
+        scored = score_all_issues(issues, context)
+        return lambda: json.dumps(scored, indent=2)
+    if phase == 'gh_list':
+        fake = data / 'bin'
+        fake.mkdir(exist_ok=True)
+        gh = fake / 'gh'
+        gh.write_text(FAKE_GH.format(python=sys.executable))
+        gh.chmod(gh.stat().st_mode | stat.S_IEXEC)
+        write_fake_pages(issues, data / 'pages')
+        os.environ.update({
+            'PATH': f"{fake}{os.pathsep}{os.environ['PATH']}",
+            'BENCH_PAGES': str(data / 'pages'),
+        })
+        return lambda: sum(1 for _ in github_sync.list_issues('all', use_cache=False))
+    raise ValueError(f"Unknown phase: {phase}")
+
+
+def run_worker(phase: str, size: int, data: Path) -> Dict[str, Any]:
+    """Measure one phase in this process"""
+    run = prepare(phase, data)
+    repeats = max(1, min(MAX_REPEATS, REPEAT_BUDGET // size))
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tracemalloc.start()
+    result = run()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return {
+        'phase': phase,
+        'issues': size,
+        'repeats': repeats,
+        'wall_s': round(best, 6),
+        'us_per_issue': round(best / size * 1e6, 3),
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        'peak_rss_kb': rss_peak // 1024 if sys.platform == 'darwin' else rss_peak,
+        'rss_growth_kb': (rss_peak - rss_before) // (1024 if sys.platform == 'darwin' else 1),
+        'alloc_peak_bytes_per_issue': round(peak / size, 1),
+        'alloc_retained_bytes_per_issue': round(retained / size, 1),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=BENCH_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return ''
+
+
+def run_suite(sizes: List[int], phases: List[str], seed: int) -> Dict[str, Any]:
+    """Generate backlogs and run every phase in a fresh worker"""
+    from generate import make_backlog, make_state
+
+    results = []
+    env = dict(os.environ, KEEP_RATE_LIMIT='off', KEEP_DAEMON='off', KEEP_GH_BACKEND='gh')
+    env.pop('KEEP_ISSUE_CACHE', None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            data = Path(tmp) / str(size)
+            data.mkdir()
+            issues = make_backlog(size, seed)
+            (data / 'issues.json').write_text(json.dumps(issues))
+            (data / 'state.md').write_text(make_state(issues, seed))
+            del issues
+
+            for phase in phases:
+                # Run outside any Keep project so no caches are used
+                worker = subprocess.run(
+                    [sys.executable, str(Path(__file__).resolve()),
+                     '--worker', phase, '--sizes', str(size), '--data', str(data)],
+                    cwd=tmp, env=env, capture_output=True, text=True
+                )
+                if worker.returncode != 0:
+                    print(worker.stderr, file=sys.stderr)
+                    raise SystemExit(f"{phase} at {size} issues failed")
+                result = json.loads(worker.stdout)
+                results.append(result)
+                print(f"{size:>7} {phase:<12} {result['wall_s']:>9.4f}s "
+                      f"{result['us_per_issue']:>9.1f} us/issue "
+                      f"{result['peak_rss_kb'] / 1024:>7.1f} MiB", file=sys.stderr)
+
+    return {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'date': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'seed': seed,
+        'results': results,
+    }
+
+
+def compare(before_path: str, after_path: str, threshold: float = 0.10) -> int:
+    """Print per-phase changes; returns the number of regressions"""
+    before = json.loads(Path(before_path).read_text())
+    after = json.loads(Path(after_path).read_text())
+    baseline = {(r['phase'], r['issues']): r for r in before['results']}
+
+    regressions = 0
+    print(f"{before.get('commit') or before_path} -> {after.get('commit') or after_path}")
+    print(f"{'issues':>7} {'phase':<12} {'wall':>8} {'rss':>8} {'alloc':>8}")
+    for result in after['results']:
+        old = baseline.get((result['phase'], result['issues']))
+        if old is None:
+            continue
+
+        def change(key: str) -> float:
+            return (result[key] - old[key]) / old[key] if old[key] else 0.0
+
+        wall = change('wall_s')
+        flag = '  <-- slower' if wall > threshold else ''
+        regressions += bool(flag)
+        print(f"{result['issues']:>7} {result['phase']:<12} {wall:>+8.1%} "
+              f"{change('peak_rss_kb'):>+8.1%} {change('alloc_peak_bytes_per_issue'):>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Keep benchmark suite')
+    parser.add_argument('--sizes', default='100,1000,10000,100000', help='Comma-separated backlog sizes')
+    parser.add_argument('--phases', default=','.join(PHASES), help='Comma-separated phases to run')
+    parser.add_argument('--seed', type=int, default=1, help='Generator seed')
+    parser.add_argument('--output', help='Write JSON results here (default: stdout)')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='Compare two result files')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--data', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare) else 0)
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, int(args.sizes), Path(args.data))))
+        return
+
+    report = run_suite(
+        [int(size) for size in args.sizes.split(',')],
+        args.phases.split(','),
+        args.seed
+    )
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
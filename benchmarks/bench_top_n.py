@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: full sort vs bounded-heap top-N selection
+
+Compares score_all_issues(...)[:N] (every issue fully scored, rationale
+strings built, then sorted) with score_all_issues(..., top_n=N) (totals
+only, heap selection, rationale for winners). Reports wall time and peak
+traced allocations.
+
+Usage:
+    python benchmarks/bench_top_n.py [--size 50000] [--top 5]
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'skills' / 'keep' / 'scripts'))
+
+from bench_scoring import make_issues  # noqa: E402
+from score_issues import score_all_issues  # noqa: E402
+
+
+def measure(func: Callable[[], Any]) -> Tuple[float, int, Any]:
+    """Return (seconds, peak traced bytes, result) for one call"""
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak, result
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compare full sort with top-N heap selection')
+    parser.add_argument('--size', type=int, default=50000, help='Synthetic backlog size')
+    parser.add_argument('--top', type=int, default=5, help='Recommendations to select')
+    args = parser.parse_args()
+
+    issues = make_issues(args.size)
+    context = {
+        'recent_directories': ['src/module1', 'src/module2'],
+        'recent_labels': ['auth'],
+        'recent_issues': ['1', '2'],
+    }
+
+    full_time, full_peak, full = measure(lambda: score_all_issues(issues, context)[:args.top])
+    heap_time, heap_peak, heap = measure(lambda: score_all_issues(issues, context, args.top))
+
+    if full != heap:
+        print("ERROR: top-N results differ from full sort", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{'mode':<10}  {'seconds':>8}  {'peak MiB':>9}")
+    print(f"{'full sort':<10}  {full_time:>8.3f}  {full_peak / 2**20:>9.1f}")
+    print(f"{'top-N heap':<10}  {heap_time:>8.3f}  {heap_peak / 2**20:>9.1f}")
+    print(f"speedup {full_time / heap_time:.2f}x, peak memory {full_peak / heap_peak:.1f}x lower")
+
+
+if __name__ == '__main__':
+    main()
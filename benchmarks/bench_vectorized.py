@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Differential check and benchmark for the NumPy scoring engine
+
+Scores randomized issue sets (including missing/invalid timestamps,
+unknown and closed blockers, duplicate scores) with both engines and
+fails unless the JSON output is byte-identical. Then times both engines
+on a large backlog.
+
+Usage:
+    python benchmarks/bench_vectorized.py [--rounds 50] [--size 100000]
+"""
+
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'skills' / 'keep' / 'scripts'))
+
+from bench_scoring import make_issues  # noqa: E402
+from score_issues import numpy_available, score_all_issues  # noqa: E402
+
+
+LABELS = ['urgent', 'high', 'High-Priority', 'low', 'low-priority', 'bug', 'auth', 'api']
+DIRECTORIES = ['src/auth', 'src/api', 'lib/db']
+
+
+def random_issues(rng: random.Random, count: int) -> List[Dict[str, Any]]:
+    """Generate an issue set that exercises every scoring branch"""
+    now = datetime.now(timezone.utc)
+    issues = []
+
+    for number in rng.sample(range(1, count * 3), count):
+        words = [rng.choice(['fix', 'the', 'login', 'cache']) for _ in range(rng.randint(0, 20))]
+        if rng.random() < 0.3:
+            words.append(rng.choice(DIRECTORIES).upper())
+        for _ in range(rng.choice([0, 0, 1, 3])):
+            verb = rng.choice(['depends on', 'Blocked by', 'requires', 'needs'])
+            words.append(f"{verb} #{rng.randint(1, count * 3)}")
+        if rng.random() < 0.2:
+            words.append(f"see #{rng.randint(1, 20)}")
+
+        issue = {
+            'number': number,
+            'title': f"Issue {number}",
+            'body': ' '.join(words),
+            'labels': [{'name': name} for name in rng.sample(LABELS, rng.randint(0, 2))],
+            'state': rng.choice(['OPEN', 'OPEN', 'CLOSED']),
+        }
+
+        roll = rng.random()
+        if roll < 0.05:
+            issue['updatedAt'] = 'not-a-date'
+        elif roll < 0.1:
+            issue['updatedAt'] = ''
+        elif roll < 0.9:
+            updated = now - timedelta(seconds=rng.randint(0, 60 * 86400))
+            issue['updatedAt'] = updated.strftime('%Y-%m-%dT%H:%M:%SZ')
+        issues.append(issue)
+
+    return issues
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Verify and benchmark the NumPy engine')
+    parser.add_argument('--rounds', type=int, default=50, help='Randomized differential rounds')
+    parser.add_argument('--size', type=int, default=100000, help='Backlog size for timing')
+    parser.add_argument('--top', type=int, default=5, help='Recommendations to select')
+    args = parser.parse_args()
+
+    if not numpy_available():
+        print("NumPy not installed; nothing to compare", file=sys.stderr)
+        sys.exit(1)
+
+    rng = random.Random(1234)
+    for round_num in range(args.rounds):
+        issues = random_issues(rng, rng.randint(1, 400))
+        context = {
+            'recent_directories': rng.sample(DIRECTORIES, rng.randint(0, 2)),
+            'recent_labels': rng.sample(LABELS, rng.randint(0, 2)),
+            'recent_issues': [str(n) for n in rng.sample(range(1, 20), rng.randint(0, 3))],
+        }
+        top_n = rng.choice([None, 1, 5, 50])
+
+        expected = json.dumps(score_all_issues(issues, context, top_n, engine='python'), indent=2)
+        actual = json.dumps(score_all_issues(issues, context, top_n, engine='numpy'), indent=2)
+        if expected != actual:
+            print(f"ERROR: engines differ in round {round_num}", file=sys.stderr)
+            sys.exit(1)
+
+    print(f"differential: {args.rounds} randomized rounds identical")
+
+    issues = make_issues(args.size)
+    context = {
+        'recent_directories': ['src/module1'],
+        'recent_labels': ['auth'],
+        'recent_issues': ['1'],
+    }
+    for engine in ('python', 'numpy'):
+        start = time.perf_counter()
+        score_all_issues(issues, context, args.top, engine=engine)
+        print(f"{engine:<7} top-{args.top} of {args.size}: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic backlogs for benchmarks
+
+Generates `gh issue list --json`-shaped issues with realistic variety:
+log-normally distributed body sizes (most a few hundred characters, a
+long tail of multi-kilobyte bodies), priority and area labels, blocker
+chains ("Depends on #N" links back along a chain), cross references,
+and a matching .claude/state.md in the documented format.
+
+The same count and seed always produce the same backlog, except that
+`updatedAt` values are relative to the current day.
+
+Usage:
+    python benchmarks/generate.py --count 1000 [--seed 1] --out DIR
+"""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+AREAS = ['auth', 'api', 'billing', 'search', 'ui', 'infra', 'docs', 'cli']
+PRIORITIES = ['urgent', 'high-priority', 'low-priority']
+KINDS = ['bug', 'feature', 'enhancement', 'refactor', 'tech-debt']
+WORDS = (
+    'the a to of and in for with on is that this when should request response cache '
+    'token session retry timeout config handler error user endpoint query page test '
+    'update migrate refactor validate parse render deploy log metric latency'
+).split()
+
+
+def _paragraph(rng: random.Random, length: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(max(1, length // 6)))
+
+
+def make_backlog(count: int, seed: int = 1) -> List[Dict[str, Any]]:
+    """
+    Generate `count` issues
+
+    Roughly 25% are closed, 30% sit on blocker chains of length 2-6, and
+    10% reference an earlier issue without depending on it.
+    """
+    rng = random.Random(seed)
+    today = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+    issues = []
+    chain_prev = None
+
+    for number in range(1, count + 1):
+        area = rng.choice(AREAS)
+        module = f"src/{area}/{rng.choice(['core', 'views', 'models', 'utils'])}{rng.randint(1, 40)}"
+
+        size = int(min(rng.lognormvariate(6.3, 0.9), 40000))
+        parts = [f"## Summary\n{_paragraph(rng, size // 2)}", f"Affects {module}/."]
+
+        # Blocker chains: continue the current chain or start a new one
+        if chain_prev is not None and rng.random() < 0.75:
+            parts.append(f"Depends on #{chain_prev}")
+        if rng.random() < 0.3:
+            chain_prev = number
+        elif rng.random() < 0.3:
+            chain_prev = None
+        if number > 1 and rng.random() < 0.1:
+            parts.append(f"See also #{rng.randint(1, number - 1)}")
+        parts.append(f"## Details\n{_paragraph(rng, size // 2)}")
+
+        labels = [{'name': area}, {'name': rng.choice(KINDS)}]
+        if rng.random() < 0.35:
+            labels.append({'name': rng.choice(PRIORITIES)})
+
+        created = today - timedelta(days=rng.randint(30, 720))
+        updated = today - timedelta(days=rng.randint(0, 90), hours=rng.randint(0, 23))
+        issues.append({
+            'number': number,
+            'title': f"{rng.choice(KINDS).capitalize()}: {_paragraph(rng, 40)}",
+            'body': '\n\n'.join(parts),
+            'labels': labels,
+            'state': 'CLOSED' if rng.random() < 0.25 else 'OPEN',
+            'createdAt': created.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'updatedAt': updated.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'url': f"https://github.com/example/repo/issues/{number}",
+        })
+
+    return issues
+
+
+def make_state(issues: List[Dict[str, Any]], seed: int = 1) -> str:
+    """Generate a state.md (documented format) that refers to the backlog"""
+    rng = random.Random(seed)
+    active = rng.choice(issues)
+    recent = rng.sample(issues, min(3, len(issues)))
+    related = rng.choice(issues)
+    areas = rng.sample(AREAS, 2)
+    now = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    lines = [
+        '# Session State',
+        '',
+        f'**Last Updated:** {now}',
+        '',
+        '## Active Work',
+        '',
+        f"**Current Issue:** #{active['number']} - {active['title']}",
+        '**Branch:** feature/synthetic',
+        f'**Started:** {now}',
+        '',
+        '### Progress',
+        '- ✅ Investigated the problem',
+        '- 🔄 Implementing the fix (60% done)',
+        '- ⏸️ Tests',
+        '',
+        '### Next Steps',
+        '1. Finish implementation',
+        '2. Add tests',
+        '',
+        '## Recent Work',
+        '',
+    ]
+    lines += [
+        f"**Previous Issue:** #{issue['number']} - {issue['title']} (Completed 2024-10-0{i + 1})"
+        for i, issue in enumerate(recent)
+    ]
+    lines += [
+        '',
+        '## Blockers',
+        'None currently',
+        '',
+        '## Context',
+        f"- Working primarily in src/{areas[0]}/ src/{areas[1]}/",
+        f"- Builds on work from #{related['number']}",
+        '',
+    ]
+    return '\n'.join(lines)
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate a synthetic backlog')
+    parser.add_argument('--count', type=int, default=1000, help='Number of issues')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    parser.add_argument('--out', required=True, help='Directory for issues.json and state.md')
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    issues = make_backlog(args.count, args.seed)
+    (out / 'issues.json').write_text(json.dumps(issues))
+    (out / 'state.md').write_text(make_state(issues, args.seed))
+    print(json.dumps({'issues': len(issues), 'out': str(out)}))
+
+
+if __name__ == '__main__':
+    main()
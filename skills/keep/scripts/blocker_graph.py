@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Transitive blocker analysis for Keep
+
+Builds the dependency graph (issue -> the issues it is blocked by) once
+per scoring run and derives, in time linear in issues plus references:
+
+- Cycles: strongly connected components (iterative Tarjan) with more
+  than one issue, or an issue that blocks itself
+- open_depth: open issues on the longest blocker chain below an issue,
+  including chains that pass through closed blockers
+- unblocks: distinct open issues waiting on an issue, directly or
+  further down their chains (an issue reached along several chains is
+  counted once)
+
+Members of a cycle all wait on each other, so each counts the cycle's
+other open members in both numbers. Blockers that are not in the index
+count as open and have no blockers of their own.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping
+
+# int.bit_count is Python 3.10+
+_popcount = getattr(int, 'bit_count', None) or (lambda mask: bin(mask).count('1'))
+
+
+def strongly_connected_components(graph: Mapping[str, Iterable[str]]) -> List[List[str]]:
+    """
+    Tarjan's algorithm without recursion (chains can be long)
+
+    Args:
+        graph: Node -> successors; successors missing from the mapping
+            are treated as nodes without edges
+
+    Returns:
+        Components in reverse topological order: each comes after every
+        component it has an edge to
+    """
+    order: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack = set()
+    components: List[List[str]] = []
+
+    def visit(node: str):
+        order[node] = low[node] = len(order)
+        stack.append(node)
+        on_stack.add(node)
+
+    for root in graph:
+        if root in order:
+            continue
+        visit(root)
+        work = [(root, iter(graph.get(root, ())))]
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in order:
+                    visit(successor)
+                    work.append((successor, iter(graph.get(successor, ()))))
+                    break
+                if successor in on_stack:
+                    low[node] = min(low[node], order[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == order[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    return components
+
+
+def analyze_blocker_graph(issue_index: Dict[str, Dict[str, Any]]) -> List[List[str]]:
+    """
+    Annotate an issue index with transitive blocker signals
+
+    Adds to every entry in `issue_index` (see
+    score_issues.build_issue_index):
+    - open_depth: int
+    - unblocks: int (distinct open issues waiting on the entry)
+    - cycle: issue numbers of the entry's blocker cycle, or None
+
+    Returns:
+        Blocker cycles, each sorted by issue number
+    """
+    graph = {number: entry.get('blockers') or () for number, entry in issue_index.items()}
+    components = strongly_connected_components(graph)
+
+    component_of: Dict[str, int] = {}
+    for i, component in enumerate(components):
+        for number in component:
+            component_of[number] = i
+
+    def is_open(number: str) -> bool:
+        entry = issue_index.get(number)
+        return entry is None or entry.get('state') == 'OPEN'
+
+    open_count = [sum(map(is_open, component)) for component in components]
+    cyclic = [
+        len(component) > 1 or component[0] in graph.get(component[0], ())
+        for component in components
+    ]
+
+    # Distinct blocker components of each component (most have none, so
+    # sets are only made when needed)
+    blocked_by: List[Any] = [()] * len(components)
+    for number, blockers in graph.items():
+        i = component_of[number]
+        for blocker in blockers:
+            j = component_of[blocker]
+            if j != i:
+                if not blocked_by[i]:
+                    blocked_by[i] = set()
+                blocked_by[i].add(j)
+
+    # Blockers come first, so depths below them are final when reached
+    depth_below = [0] * len(components)
+    for i in range(len(components)):
+        depth_below[i] = max(
+            (open_count[j] + depth_below[j] for j in blocked_by[i]),
+            default=0
+        )
+
+    # Dependents come last; walking backwards pushes the set of open
+    # issues waiting on each component down to its blockers. Sets are
+    # bitmasks with one bit per open issue that waits on anything,
+    # numbered from the dependent end so masks stay narrow, and are
+    # dropped once counted.
+    downstream = [0] * len(components)
+    waiting: List[int] = [0] * len(components)
+    bit = 0
+    for i in reversed(range(len(components))):
+        mask = waiting[i]
+        if mask:
+            downstream[i] = _popcount(mask)
+            waiting[i] = 0
+        if blocked_by[i]:
+            mask |= ((1 << open_count[i]) - 1) << bit
+            bit += open_count[i]
+            for j in blocked_by[i]:
+                waiting[j] |= mask
+
+    cycles = []
+    for i, component in enumerate(components):
+        if cyclic[i]:
+            cycles.append(sorted(component, key=int))
+
+    for number, entry in issue_index.items():
+        i = component_of[number]
+        peers = open_count[i] - is_open(number) if cyclic[i] else 0
+        entry['open_depth'] = depth_below[i] + peers
+        entry['unblocks'] = downstream[i] + peers
+        entry['cycle'] = sorted(components[i], key=int) if cyclic[i] else None
+
+    return sorted(cycles, key=lambda cycle: int(cycle[0]))
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Blocker reference parsing shared by Keep scripts
+
+One precompiled pattern covers every dependency phrase, so each body is
+scanned once. Blockers in the same repository are returned as plain
+numbers ('123'), blockers in another one as 'owner/repo#123' (owner and
+repository lowercased, see blocker_ref). After load_blocker_memo,
+results for long bodies are memoized by a hash of the body and
+persisted to .claude/cache/blockers.json by save_blocker_memo, so
+unchanged issues are not re-parsed on the next run.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# "depends on #123", "blocked by #456", "requires #789", "needs #12",
+# each also as "depends on owner/repo#123". Owners and repositories are
+# shaped as GitHub allows (owners: letters, digits and single inner
+# hyphens, up to 39; repositories: not '.' or '..'), and the owner
+# directly follows the phrase, so paths like ./src/x#1, ../x#1 or
+# lib/src/x#1 never match
+BLOCKER_PATTERN = re.compile(
+    r'(?:depends?\s+on|blocked?\s+by|requires?|needs?)\s+'
+    r'([a-z\d](?:[a-z\d]|-(?=[a-z\d])){0,38}/(?!\.\.?#)[\w.-]{1,100})?#(\d+)',
+    re.IGNORECASE
+)
+
+DEFAULT_MEMO_PATH = '.claude/cache/blockers.json'
+
+# Bump when parse results change so persisted ones are discarded
+BLOCKER_MEMO_VERSION = 2
+
+# Shorter bodies are cheaper to scan than to hash
+MEMO_MIN_BODY = 512
+
+_memo: Dict[str, List[str]] = {}
+_memo_used: Dict[str, List[str]] = {}
+_memo_dirty = False
+# Set by load_blocker_memo; a one-off run only pays for the hashing
+_memo_enabled = False
+
+
+def blocker_ref(repo: Optional[str], number: str) -> str:
+    """'123' for a blocker in the same repository, else 'owner/repo#123'"""
+    return f'{repo.lower()}#{number}' if repo else number
+
+
+def split_blocker_ref(ref: str) -> Tuple[Optional[str], str]:
+    """(repository or None, number) of a blocker_ref"""
+    repo, _, number = ref.rpartition('#')
+    return repo or None, number
+
+
+def scan_blockers(body: str) -> List[str]:
+    """
+    Scan a body for blocker references (no memoization)
+
+    Returns:
+        Blocker refs (see blocker_ref), deduplicated, in order of appearance
+    """
+    if not body:
+        return []
+    return list(dict.fromkeys(blocker_ref(repo, number) for repo, number in BLOCKER_PATTERN.findall(body)))
+
+
+def parse_blockers(body: str) -> List[str]:
+    """
+    Parse blocker references from an issue body
+
+    Looks for:
+    - "depends on #123"
+    - "blocked by #456"
+    - "requires #789"
+    - "needs #12"
+    - any of these with owner/repo#N for another repository
+
+    Returns:
+        Blocker refs (see blocker_ref), deduplicated, in order of appearance
+    """
+    global _memo_dirty
+
+    if not _memo_enabled or not body or len(body) < MEMO_MIN_BODY:
+        return scan_blockers(body)
+
+    # Only long bodies are hashed, so hashlib (and OpenSSL) loads when first needed
+    from hashlib import blake2b
+
+    key = blake2b(body.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+    blockers = _memo.get(key)
+    if blockers is None:
+        blockers = scan_blockers(body)
+        _memo[key] = blockers
+        _memo_dirty = True
+    _memo_used[key] = blockers
+    return list(blockers)
+
+
+def memo_path() -> Optional[Path]:
+    """Persisted memo location, or None outside a Keep project"""
+    if Path('.claude').is_dir():
+        return Path(DEFAULT_MEMO_PATH)
+    return None
+
+
+def load_blocker_memo(path: Optional[Path] = None):
+    """
+    Load persisted parse results and start memoizing parse_blockers
+
+    Missing or corrupt files are ignored.
+    """
+    global _memo_enabled
+
+    path = path or memo_path()
+    if path is None:
+        return
+    _memo_enabled = True
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return
+    if isinstance(data, dict) and data.get('version') == BLOCKER_MEMO_VERSION:
+        entries = data.get('entries')
+        if isinstance(entries, dict):
+            _memo.update(entries)
+
+
+def save_blocker_memo(path: Optional[Path] = None):
+    """
+    Persist parse results for bodies seen in this run
+
+    Entries for bodies not seen this run are dropped, so the file tracks
+    the current backlog. Failures are ignored (the memo is only a cache).
+    """
+    global _memo_dirty
+
+    path = path or memo_path()
+    if path is None or not (_memo_dirty or len(_memo_used) != len(_memo)):
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(
+            {'version': BLOCKER_MEMO_VERSION, 'entries': _memo_used},
+            separators=(',', ':')
+        ))
+        tmp.replace(path)
+        _memo_dirty = False
+    except OSError:
+        pass
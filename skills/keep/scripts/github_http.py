@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+In-process GitHub HTTP client for Keep
+
+Talks to the REST and GraphQL APIs directly over one keep-alive
+connection per thread, instead of paying for a `gh` process (startup,
+auth config load, TLS handshake) on every operation. github_sync uses it
+when KEEP_GH_BACKEND=http and falls back to `gh` when no token or
+repository can be determined.
+
+Configuration:
+- Token: GH_TOKEN / GITHUB_TOKEN, else `gh auth token` (once per process)
+- Repository: GH_REPO (owner/repo), else the origin remote in .git/config
+- API URL: KEEP_GITHUB_API_URL (e.g. a local stub server), else
+  https://api.github.com
+"""
+
+import http.client
+import json
+import os
+import re
+import select
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+
+DEFAULT_API_URL = 'https://api.github.com'
+
+# Seconds before a request is abandoned
+REQUEST_TIMEOUT = 30
+
+# Methods that can be sent twice without repeating their effect (RFC 9110)
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+_REMOTE_PATTERN = re.compile(
+    r'github\.com[:/](?P<owner>[^/\s]+)/(?P<repo>[^/\s]+?)(?:\.git)?/?$'
+)
+
+_token: Optional[str] = None
+
+
+class HTTPError(Exception):
+    """
+    Non-2xx response (or transport failure, status 0)
+
+    Attributes:
+        retryable: Whether resending the request can't repeat its effect
+            (it is idempotent, or it never reached the server)
+    """
+
+    def __init__(
+        self,
+        status: int,
+        message: str,
+        headers: Optional[Dict[str, str]] = None,
+        retryable: bool = True
+    ):
+        super().__init__(f"HTTP {status}: {message}" if status else message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+        self.retryable = retryable
+
+
+def resolve_token() -> Optional[str]:
+    """
+    Find an API token
+
+    Returns:
+        Token from GH_TOKEN/GITHUB_TOKEN or `gh auth token`, or None
+    """
+    global _token
+
+    if _token is None:
+        _token = os.environ.get('GH_TOKEN') or os.environ.get('GITHUB_TOKEN') or ''
+        if not _token:
+            try:
+                result = subprocess.run(
+                    ['gh', 'auth', 'token'],
+                    capture_output=True,
+                    text=True,
+                    check=True
+                )
+                _token = result.stdout.strip()
+            except (subprocess.CalledProcessError, FileNotFoundError):
+                _token = ''
+    return _token or None
+
+
+def detect_repo() -> Optional[Tuple[str, str]]:
+    """
+    Determine owner/repo without spawning processes
+
+    Returns:
+        (owner, repo) from GH_REPO or the origin remote in .git/config
+    """
+    override = os.environ.get('GH_REPO')
+    if override and '/' in override:
+        owner, repo = override.split('/')[-2:]
+        return owner, repo
+
+    directory = Path.cwd()
+    for candidate in [directory, *directory.parents]:
+        config = candidate / '.git' / 'config'
+        if not config.is_file():
+            continue
+        in_origin = False
+        for line in config.read_text(errors='replace').splitlines():
+            line = line.strip()
+            if line.startswith('['):
+                in_origin = line == '[remote "origin"]'
+            elif in_origin and line.startswith('url'):
+                match = _REMOTE_PATTERN.search(line.split('=', 1)[-1].strip())
+                if match:
+                    return match.group('owner'), match.group('repo')
+        return None
+    return None
+
+
+class GitHubHTTPClient:
+    """Minimal REST/GraphQL client over persistent connections"""
+
+    def __init__(self, token: str, base_url: Optional[str] = None):
+        parts = urlsplit(base_url or os.environ.get('KEEP_GITHUB_API_URL') or DEFAULT_API_URL)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip('/')
+        self.token = token
+        self._local = threading.local()
+        # Optional hooks: before_request(path) may sleep or raise to pace
+        # requests; after_response(headers) sees every response's headers
+        self.before_request: Optional[Callable[[str], None]] = None
+        self.after_response: Optional[Callable[[Dict[str, str]], None]] = None
+
+    @property
+    def graphql_path(self) -> str:
+        """GraphQL endpoint (GitHub Enterprise serves it beside /api/v3)"""
+        if self.base_path.endswith('/api/v3'):
+            return self.base_path[:-len('/v3')] + '/graphql'
+        return self.base_path + '/graphql'
+
+    def _connection(self, fresh: bool = False) -> http.client.HTTPConnection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or fresh:
+            if conn is not None:
+                conn.close()
+            if self.scheme == 'http':
+                conn = http.client.HTTPConnection(self.host, self.port, timeout=REQUEST_TIMEOUT)
+            else:
+                conn = http.client.HTTPSConnection(self.host, self.port, timeout=REQUEST_TIMEOUT)
+            self._local.conn = conn
+        return conn
+
+    def _dropped(self) -> bool:
+        """Whether the idle keep-alive connection has been closed (or spoken on) by the server"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or conn.sock is None:
+            return False
+        try:
+            readable, _, _ = select.select([conn.sock], [], [], 0)
+        except (OSError, ValueError):
+            return True
+        return bool(readable)
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
+        idempotent: Optional[bool] = None
+    ) -> Tuple[int, Dict[str, str], Any]:
+        """
+        Send one request on the keep-alive connection
+
+        Args:
+            method: HTTP method
+            path: API path (e.g. /repos/o/r/issues/1), or a full URL from a
+                Link header
+            params: Query parameters
+            body: JSON-serializable request body
+            headers: Extra request headers
+            idempotent: Whether the request may be sent twice (default: by
+                method; GraphQL queries are idempotent POSTs)
+
+        Returns:
+            (status, lowercased response headers, parsed JSON or None)
+
+        Raises:
+            HTTPError: On non-2xx/304 responses or transport failure
+        """
+        if path.startswith(('http://', 'https://')):
+            parts = urlsplit(path)
+            target = parts.path + (f'?{parts.query}' if parts.query else '')
+        else:
+            target = path if path.startswith(self.base_path + '/') else self.base_path + path
+            if params:
+                target += '?' + urlencode(params)
+
+        send_headers = {
+            'Authorization': f'Bearer {self.token}',
+            'Accept': 'application/vnd.github+json',
+            'X-GitHub-Api-Version': '2022-11-28',
+            'User-Agent': 'keep-github-sync',
+        }
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode('utf-8')
+            send_headers['Content-Type'] = 'application/json'
+        send_headers.update(headers or {})
+
+        if self.before_request is not None:
+            self.before_request(target.split('?', 1)[0])
+
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        # A reused connection may have been closed by the server. Idempotent
+        # requests are resent once on a fresh one. Others can't be (the
+        # server may have acted on them), so they check the idle
+        # connection first and only go out on one that is still open
+        conn = self._connection(not idempotent and self._dropped())
+        for fresh in (False, True):
+            sent = False
+            try:
+                if conn.sock is None:
+                    conn.connect()
+                sent = True
+                conn.request(method, target, body=payload, headers=send_headers)
+                response = conn.getresponse()
+                raw = response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                if fresh or not idempotent:
+                    self.close()
+                    raise HTTPError(0, f"Connection failed: {e}", retryable=idempotent or not sent)
+                conn = self._connection(True)
+            except (OSError, http.client.HTTPException) as e:
+                self.close()
+                raise HTTPError(0, f"Connection failed: {e}", retryable=idempotent or not sent)
+
+        response_headers = {name.lower(): value for name, value in response.getheaders()}
+        if self.after_response is not None:
+            self.after_response(response_headers)
+        data = None
+        if raw:
+            try:
+                data = json.loads(raw)
+            except ValueError:
+                data = raw.decode('utf-8', 'replace')
+
+        if response.status >= 400:
+            message = data.get('message', '') if isinstance(data, dict) else str(data or '')
+            raise HTTPError(response.status, message, response_headers, retryable=idempotent)
+
+        return response.status, response_headers, data
@@ -0,0 +1,1634 @@
+#!/usr/bin/env python3
+"""
+GitHub sync helper for Keep
+
+Provides functions for GitHub API operations with:
+- Authentication handling
+- Rate limit management
+- Retry logic
+- Error handling
+
+Use when `gh` CLI insufficient or for programmatic access.
+
+github_sync.py is the CLI entry point; it re-exports this module.
+"""
+
+import json
+import os
+import sys
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from json_stream import iter_json_issues, write_json_list
+from keep_trace import configure as configure_trace, get_tracer
+
+if TYPE_CHECKING:
+    # Loaded on demand: http.client is slow to import and only the HTTP
+    # backend needs it. subprocess (with the rate limiter), the caches,
+    # blocker parsing and the write queue are likewise imported where
+    # they're used, so `check` and cached reads don't pay for them
+    from github_http import GitHubHTTPClient
+    from issue_cache import IssueCache
+    from rate_limit import RateLimitScheduler
+
+
+ISSUE_FIELDS = 'number,title,body,labels,state,createdAt,updatedAt,url'
+
+# Closed issues are synced into the issue cache without bodies: scoring
+# and blocker states only need the rest (fetch_issue fetches a closed
+# issue's body on demand)
+CLOSED_ISSUE_FIELDS = 'number,title,labels,state,createdAt,updatedAt,url'
+
+# The cache keeps closed issues updated in the last N days, so the first
+# sync doesn't download a long closed history. Closed issues are
+# therefore never listed from the cache, only looked up in it.
+CLOSED_ISSUE_HISTORY_DAYS = 90
+
+# Seconds between full reconciles of the issue cache, which drop issues
+# GitHub no longer lists (deleted, transferred, or closed before the
+# history window)
+RECONCILE_INTERVAL = 24 * 3600
+
+# Issues per paginated GraphQL request (GitHub's maximum)
+ISSUE_PAGE_SIZE = 100
+
+# GraphQL selection for each `gh issue list --json` field Keep can fetch
+GRAPHQL_ISSUE_FIELDS = {
+    'number': 'number',
+    'title': 'title',
+    'body': 'body',
+    'labels': 'labels(first: 100) { nodes { id name description color } }',
+    'state': 'state',
+    'createdAt': 'createdAt',
+    'updatedAt': 'updatedAt',
+    'url': 'url',
+}
+
+# orderBy for iter_issue_pages
+ISSUE_PAGE_ORDERS = {
+    'created': 'field: CREATED_AT, direction: DESC',
+    'updated': 'field: UPDATED_AT, direction: ASC',
+}
+
+# Parallel `gh` processes used by fetch_issues
+DEFAULT_FETCH_CONCURRENCY = 4
+
+# Aliased issue lookups per GraphQL query in resolve_issue_states
+STATE_QUERY_CHUNK = 100
+
+# Seconds a `gh --version` probe result is reused by `check`
+GH_PROBE_TTL = 3600
+
+
+class GitHubError(Exception):
+    """Base exception for GitHub operations"""
+    pass
+
+
+class RateLimitError(GitHubError):
+    """Raised when GitHub rate limit exceeded"""
+    pass
+
+
+class NotFoundError(GitHubError):
+    """Raised when resource not found"""
+    pass
+
+
+def record_rate_limit(scheduler: 'RateLimitScheduler', headers: Dict[str, str]):
+    """Report X-RateLimit-* response headers (lowercased) to the scheduler"""
+    try:
+        scheduler.record(
+            headers['x-ratelimit-resource'],
+            int(headers['x-ratelimit-limit']),
+            int(headers['x-ratelimit-remaining']),
+            float(headers['x-ratelimit-reset'])
+        )
+    except (KeyError, ValueError):
+        pass
+
+
+def parse_included_response(output: str) -> Tuple[int, Dict[str, str], Any]:
+    """
+    Split `gh api --include` output into its parts
+
+    Returns:
+        (status, lowercased headers, parsed JSON body or None)
+    """
+    end, skip = output.find('\r\n\r\n'), 4
+    if end < 0:
+        end, skip = output.find('\n\n'), 2
+    if end < 0:
+        end, skip = len(output), 0
+    lines = output[:end].splitlines()
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    body = output[end + skip:]
+    return status, headers, json.loads(body) if body.strip() else None
+
+
+def gh_command(
+    args: List[str],
+    retries: int = 3,
+    allow_partial: bool = False,
+    include_headers: bool = False
+) -> Any:
+    """
+    Execute gh CLI command with retry logic
+
+    Requests are paced by the shared rate limit scheduler (see
+    rate_limit.py); when GitHub reports a rate limit, the wait honors the
+    reset time instead of blind backoff.
+
+    Args:
+        args: Command arguments (e.g., ['issue', 'view', '123'])
+        retries: Number of retry attempts
+        allow_partial: For `gh api graphql`, return the response when gh
+            exits non-zero but still printed a JSON body with `data`
+            (GraphQL reports per-field errors alongside partial results)
+        include_headers: For `gh api --include` (the caller passes the
+            flag): return the status and headers too, and accept a 304
+            Not Modified (gh exits non-zero on it)
+
+    Returns:
+        Parsed JSON response, or (status, lowercased headers, parsed JSON
+        or None) with include_headers
+
+    Raises:
+        GitHubError: If command fails after retries
+        RateLimitError: If rate limit exceeded
+        NotFoundError: If resource not found
+    """
+    import subprocess
+
+    from rate_limit import BudgetExhausted, get_scheduler, request_resource
+
+    cmd = ['gh'] + args
+    resource = request_resource(args)
+    scheduler = get_scheduler()
+    tracer = get_tracer()
+    started = time.perf_counter()
+    call = {'attempts': 0, 'paced_s': 0.0, 'backoff_s': 0.0, 'bytes': 0, 'decode_s': 0.0, 'outcome': 'ok'}
+
+    try:
+        for attempt in range(retries):
+            call['attempts'] = attempt + 1
+            if scheduler is not None:
+                try:
+                    paced = time.perf_counter()
+                    scheduler.acquire(resource)
+                    call['paced_s'] += time.perf_counter() - paced
+                except BudgetExhausted as e:
+                    raise RateLimitError(f"GitHub rate limit exceeded: {e}")
+                except OSError:
+                    # Budget file unusable - run unpaced
+                    scheduler = None
+
+            try:
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    text=True,
+                    check=True
+                )
+
+                # Parse JSON if output present
+                call['bytes'] = len(result.stdout)
+                if include_headers:
+                    return _included(result.stdout, scheduler, call)
+                if result.stdout.strip():
+                    decode = time.perf_counter()
+                    parsed = json.loads(result.stdout)
+                    call['decode_s'] = time.perf_counter() - decode
+                    return parsed
+                return {}
+
+            except subprocess.CalledProcessError as e:
+                error_msg = e.stderr.strip()
+
+                if include_headers and e.stdout.startswith('HTTP/') and e.stdout.split(None, 2)[1] == '304':
+                    return _included(e.stdout, scheduler, call)
+
+                if allow_partial and e.stdout.strip():
+                    try:
+                        partial = json.loads(e.stdout)
+                    except json.JSONDecodeError:
+                        partial = None
+                    if isinstance(partial, dict) and partial.get('data'):
+                        return partial
+
+                # Check for rate limit
+                if 'rate limit' in error_msg.lower():
+                    if attempt < retries - 1:
+                        wait_time = None
+                        if scheduler is not None:
+                            wait_time = scheduler.on_rate_limited(resource)
+                            if wait_time is not None and wait_time > scheduler.max_wait:
+                                raise RateLimitError(f"GitHub rate limit exceeded: {error_msg}")
+                        if wait_time is None:
+                            wait_time = 2 ** attempt  # Exponential backoff (secondary limits)
+                        print(f"Rate limit hit, waiting {wait_time:.0f}s...", file=sys.stderr)
+                        call['backoff_s'] += wait_time
+                        time.sleep(wait_time)
+                        continue
+                    raise RateLimitError(f"GitHub rate limit exceeded: {error_msg}")
+
+                # Check for not found
+                if ('404' in error_msg or 'not found' in error_msg.lower()
+                        or 'could not resolve to' in error_msg.lower()):
+                    raise NotFoundError(f"Resource not found: {error_msg}")
+
+                # Check for authentication
+                if 'authentication' in error_msg.lower():
+                    raise GitHubError(f"Authentication failed: {error_msg}")
+
+                # Other errors - retry
+                if attempt < retries - 1:
+                    wait_time = 2 ** attempt
+                    print(f"Command failed, retrying in {wait_time}s...", file=sys.stderr)
+                    call['backoff_s'] += wait_time
+                    time.sleep(wait_time)
+                    continue
+
+                raise GitHubError(f"GitHub command failed: {error_msg}")
+
+            except json.JSONDecodeError as e:
+                raise GitHubError(f"Invalid JSON response: {e}")
+
+        raise GitHubError(f"Command failed after {retries} retries")
+    except GitHubError as e:
+        call['outcome'] = type(e).__name__
+        raise
+    finally:
+        if tracer is not None:
+            tracer.complete('gh ' + ' '.join(args[:2]), started, 'github', argv=args, **call)
+
+
+def _included(
+    output: str,
+    scheduler: Optional['RateLimitScheduler'],
+    call: Dict[str, Any]
+) -> Tuple[int, Dict[str, str], Any]:
+    """gh_command's include_headers result, reporting the rate limit headers seen"""
+    decode = time.perf_counter()
+    status, headers, data = parse_included_response(output)
+    call['decode_s'] = time.perf_counter() - decode
+    call['status'] = status
+    if scheduler is not None:
+        # Corrects the unit acquire() spent when GitHub didn't charge one (304)
+        record_rate_limit(scheduler, headers)
+    return status, headers, data
+
+
+_http_backend: Optional[Tuple['GitHubHTTPClient', str]] = None
+_http_backend_checked = False
+
+
+def http_backend() -> Optional[Tuple['GitHubHTTPClient', str]]:
+    """
+    Return the in-process HTTP client when KEEP_GH_BACKEND=http
+
+    The client keeps one keep-alive connection per thread and reports
+    X-RateLimit-* headers to the shared rate limit scheduler.
+
+    Returns:
+        (client, 'owner/repo'), or None to use the gh CLI (backend not
+        selected, or no token/repository could be found)
+    """
+    global _http_backend, _http_backend_checked
+
+    if os.environ.get('KEEP_GH_BACKEND', 'gh').lower() != 'http':
+        return None
+    if _http_backend_checked:
+        return _http_backend
+    _http_backend_checked = True
+
+    from github_http import GitHubHTTPClient, detect_repo, resolve_token
+    from rate_limit import get_scheduler
+
+    token = resolve_token()
+    repo = detect_repo()
+    if not token or not repo:
+        print("HTTP backend unavailable (no token or repository), using gh", file=sys.stderr)
+        return None
+
+    client = GitHubHTTPClient(token)
+    scheduler = get_scheduler()
+    if scheduler is not None:
+        def before_request(path: str):
+            scheduler.acquire('graphql' if path.endswith('/graphql') else 'core')
+
+        client.before_request = before_request
+        client.after_response = lambda headers: record_rate_limit(scheduler, headers)
+
+    _http_backend = (client, '/'.join(repo))
+    return _http_backend
+
+
+def http_call(call: Callable[[], Any], retries: int = 3) -> Any:
+    """
+    Run an HTTP backend call with gh_command's error handling
+
+    Args:
+        call: Zero-argument function performing the request(s)
+        retries: Number of attempts for transient failures
+
+    Raises:
+        GitHubError: If the call fails after retries
+        RateLimitError: If rate limit exceeded
+        NotFoundError: If resource not found
+    """
+    from github_http import HTTPError
+    from rate_limit import DEFAULT_MAX_WAIT, BudgetExhausted, get_scheduler
+
+    tracer = get_tracer()
+    started = time.perf_counter()
+    stats = {'attempts': 0, 'backoff_s': 0.0, 'outcome': 'ok'}
+
+    try:
+        for attempt in range(retries):
+            stats['attempts'] = attempt + 1
+            try:
+                return call()
+            except BudgetExhausted as e:
+                raise RateLimitError(f"GitHub rate limit exceeded: {e}")
+            except HTTPError as e:
+                if e.status in (403, 429) and (
+                    e.headers.get('x-ratelimit-remaining') == '0'
+                    or 'rate limit' in e.message.lower()
+                ):
+                    if attempt < retries - 1:
+                        wait_time = 2 ** attempt
+                        if e.headers.get('x-ratelimit-remaining') == '0':
+                            wait_time = float(e.headers.get('x-ratelimit-reset', 0)) - time.time() + 1
+                        scheduler = get_scheduler()
+                        max_wait = scheduler.max_wait if scheduler is not None else DEFAULT_MAX_WAIT
+                        if 0 < wait_time <= max_wait:
+                            print(f"Rate limit hit, waiting {wait_time:.0f}s...", file=sys.stderr)
+                            stats['backoff_s'] += wait_time
+                            time.sleep(wait_time)
+                            continue
+                    raise RateLimitError(f"GitHub rate limit exceeded: {e.message}")
+
+                if e.status in (404, 410):
+                    raise NotFoundError(f"Resource not found: {e.message}")
+
+                if e.status == 401:
+                    raise GitHubError(f"Authentication failed: {e.message}")
+
+                # Transport errors and server errors - retry, unless that
+                # could repeat a write the server may have acted on
+                if (e.status == 0 or e.status >= 500) and e.retryable and attempt < retries - 1:
+                    wait_time = 2 ** attempt
+                    print(f"Request failed, retrying in {wait_time}s...", file=sys.stderr)
+                    stats['backoff_s'] += wait_time
+                    time.sleep(wait_time)
+                    continue
+
+                raise GitHubError(f"GitHub request failed: {e}")
+
+        raise GitHubError(f"Request failed after {retries} retries")
+    except GitHubError as e:
+        stats['outcome'] = type(e).__name__
+        raise
+    finally:
+        if tracer is not None:
+            tracer.complete('http', started, 'github', **stats)
+
+
+def normalize_rest_issue(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a REST issue to the shape `gh issue view --json` returns"""
+    return {
+        'number': data['number'],
+        'title': data.get('title', ''),
+        'body': data.get('body') or '',
+        'labels': [
+            {
+                'id': label.get('node_id', ''),
+                'name': label.get('name', ''),
+                'description': label.get('description') or '',
+                'color': label.get('color', ''),
+            }
+            for label in data.get('labels', [])
+        ],
+        'state': (data.get('state') or '').upper(),
+        'createdAt': data.get('created_at'),
+        'updatedAt': data.get('updated_at'),
+        'url': data.get('html_url'),
+    }
+
+
+def conditional_get(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    GET a repository REST endpoint, revalidating any cached response
+
+    The ETag / Last-Modified stored in the response cache (see
+    response_cache.py) are sent as If-None-Match / If-Modified-Since; a
+    304 Not Modified is answered from the cache and costs no rate limit
+    budget. Works with both backends (`gh api --include` for gh).
+
+    Args:
+        path: Path below repos/{owner}/{repo} ('' for the repository)
+        params: Query parameters
+
+    Returns:
+        Parsed JSON response
+
+    Raises:
+        GitHubError: If the request fails (see gh_command / http_call)
+    """
+    from urllib.parse import urlencode
+
+    from response_cache import open_response_cache, response_key
+
+    backend = http_backend()
+    if backend is None:
+        # gh fills in the placeholders from the checkout, or from GH_REPO
+        endpoint = 'repos/{owner}/{repo}' + path
+        key = response_key(os.environ.get('GH_REPO', '') + ':' + endpoint, params)
+    else:
+        client, repo = backend
+        endpoint = f'repos/{repo}{path}'
+        key = response_key(endpoint, params)
+
+    cache = open_response_cache()
+    try:
+        # A second pass covers an entry evicted between validators() and hit()
+        for _ in range(2):
+            headers = cache.validators(key) if cache is not None else {}
+            if backend is None:
+                args = ['api', endpoint + ('?' + urlencode(params) if params else ''), '--include']
+                for name, value in headers.items():
+                    args += ['-H', f'{name}: {value}']
+                status, response_headers, data = gh_command(args, include_headers=True)
+            else:
+                status, response_headers, data = http_call(
+                    lambda: client.request('GET', '/' + endpoint, params, headers=headers)
+                )
+
+            if status != 304:
+                if cache is not None:
+                    cache.store(key, response_headers, data)
+                return data
+            if cache is not None:
+                served, data = cache.hit(key)
+                if served:
+                    return data
+        raise GitHubError(f"Unexpected 304 Not Modified for {endpoint}")
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def _view_issue(issue_number: str) -> Dict[str, Any]:
+    """Fetch one issue from GitHub with the selected backend"""
+    return normalize_rest_issue(conditional_get(f'/issues/{issue_number}'))
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """
+    Validate a comma-separated `--json`-style field list
+
+    Args:
+        fields: e.g. 'number,title,labels'; None or '' means ISSUE_FIELDS
+
+    Returns:
+        Field names in the given order, without duplicates
+
+    Raises:
+        GitHubError: If a field is not one Keep can fetch
+    """
+    names = list(dict.fromkeys(name.strip() for name in (fields or ISSUE_FIELDS).split(',') if name.strip()))
+    unknown = [name for name in names if name not in GRAPHQL_ISSUE_FIELDS]
+    if unknown:
+        raise GitHubError(
+            f"Unknown issue field(s): {', '.join(unknown)} (choose from {ISSUE_FIELDS})"
+        )
+    return names
+
+
+def _issue_page_query(fields: List[str], state: str, order: str, page_size: int) -> str:
+    """Build the paginated issues query selecting only `fields`"""
+    selection = ' '.join(GRAPHQL_ISSUE_FIELDS[name] for name in fields)
+    states = {'open': 'states: [OPEN], ', 'closed': 'states: [CLOSED], '}.get(state, '')
+    return (
+        'query($owner: String!, $repo: String!, $cursor: String, $since: DateTime) '
+        '{ repository(owner: $owner, name: $repo) { '
+        f'issues(first: {page_size}, after: $cursor, {states}'
+        f'filterBy: {{since: $since}}, orderBy: {{{ISSUE_PAGE_ORDERS[order]}}}) '
+        f'{{ pageInfo {{ hasNextPage endCursor }} nodes {{ {selection} }} }} }} }}'
+    )
+
+
+def normalize_graphql_issue(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a GraphQL issue node to the shape `gh issue list --json` returns"""
+    if 'labels' in node:
+        node['labels'] = (node['labels'] or {}).get('nodes') or []
+    if 'body' in node and node['body'] is None:
+        node['body'] = ''
+    return node
+
+
+def iter_issue_pages(
+    state: str = 'open',
+    fields: Optional[str] = None,
+    since: Optional[str] = None,
+    order: str = 'created',
+    page_size: int = ISSUE_PAGE_SIZE,
+    repo: Optional[str] = None
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Page through the repository's issues with cursor-paginated GraphQL
+
+    One request per page of ISSUE_PAGE_SIZE, with the selected backend
+    (`gh api graphql` or the HTTP client). Only the requested fields are
+    fetched, so listings without `body` don't download bodies.
+
+    Args:
+        state: 'open', 'closed' or 'all'
+        fields: Comma-separated fields (see parse_fields)
+        since: Only issues updated at or after this ISO timestamp
+        order: 'created' (newest first, as `gh issue list`) or
+            'updated' (least recently updated first)
+        page_size: Issues per request (at most ISSUE_PAGE_SIZE)
+        repo: 'owner/repo' to list instead of the current repository
+
+    Yields:
+        Pages of issues in `gh issue list --json` shape
+
+    Raises:
+        GitHubError: If a page can't be fetched (earlier pages have
+            already been yielded)
+    """
+    query = _issue_page_query(parse_fields(fields), state, order, max(1, min(page_size, ISSUE_PAGE_SIZE)))
+    cursor = None
+
+    while True:
+        backend = http_backend()
+        if backend is not None:
+            client, current = backend
+            owner, name = (repo or current).split('/')
+            variables = {'owner': owner, 'repo': name, 'cursor': cursor, 'since': since}
+            result = http_call(lambda: client.request('POST', client.graphql_path, body={
+                'query': query,
+                'variables': variables,
+            }, idempotent=True)[2]) or {}
+        else:
+            args = ['api', 'graphql'] + _repo_variables(repo)
+            if cursor:
+                args.extend(['-f', f'cursor={cursor}'])
+            if since:
+                args.extend(['-f', f'since={since}'])
+            result = gh_command(args + ['-f', f'query={query}'])
+
+        connection = ((result.get('data') or {}).get('repository') or {}).get('issues')
+        if connection is None:
+            raise GitHubError(f"Could not list issues: {result.get('errors') or 'no issues in response'}")
+
+        yield [normalize_graphql_issue(node) for node in connection['nodes'] if node]
+
+        page_info = connection['pageInfo']
+        if not page_info['hasNextPage'] or not page_info['endCursor']:
+            return
+        cursor = page_info['endCursor']
+
+
+def _repo_variables(repo: Optional[str]) -> List[str]:
+    """`gh api graphql` owner/repo variables: the given 'owner/repo', else the current one"""
+    if repo is None:
+        return ['-F', 'owner={owner}', '-F', 'repo={repo}']
+    owner, name = repo.split('/')
+    return ['-f', f'owner={owner}', '-f', f'repo={name}']
+
+
+def project_issue(issue: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Keep only `fields` of an issue (all of them when fields is None)"""
+    if fields is None:
+        return issue
+    return {name: issue[name] for name in fields if name in issue}
+
+
+def sync_issue_cache(cache: 'IssueCache', now: Optional[float] = None) -> int:
+    """
+    Pull issues updated since the cache watermark into the cache
+
+    The first sync downloads every open issue and the closed ones updated
+    in the last CLOSED_ISSUE_HISTORY_DAYS; later syncs only ask GitHub
+    for issues whose `updatedAt` is at or after the watermark. Open
+    issues are fetched with ISSUE_FIELDS, closed ones with
+    CLOSED_ISSUE_FIELDS (no bodies). Pages are stored as they arrive, but
+    the watermark only moves once both passes are done, so an interrupted
+    sync is redone from the old watermark rather than skipping issues.
+
+    Incremental syncs never see deletions, so every RECONCILE_INTERVAL
+    the numbers of the issues in the same range are listed as well, and
+    cached issues that aren't among them are dropped.
+
+    Args:
+        cache: Open issue cache
+        now: Current epoch seconds (default: time.time())
+
+    Returns:
+        Number of issues downloaded
+    """
+    now = time.time() if now is None else now
+    history = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(now - CLOSED_ISSUE_HISTORY_DAYS * 86400))
+    since = cache.watermark
+    newest = since or ''
+    total = 0
+    for state, fields, bound in (
+        ('open', ISSUE_FIELDS, since),
+        ('closed', CLOSED_ISSUE_FIELDS, max(since or '', history)),
+    ):
+        for page in iter_issue_pages(state, fields, since=bound, order='updated'):
+            cache.upsert(page, advance_watermark=False)
+            newest = max([newest] + [issue.get('updatedAt') or '' for issue in page])
+            total += len(page)
+
+    # The first sync listed everything itself
+    reconcile = since is None or now - cache.last_reconcile >= RECONCILE_INTERVAL
+    if since is not None and reconcile:
+        listed = set()
+        for state, bound in (('open', None), ('closed', history)):
+            for page in iter_issue_pages(state, 'number', since=bound):
+                listed.update(issue['number'] for issue in page)
+        cache.retain(listed)
+
+    cache.mark_synced(newest or None, reconciled_at=now if reconcile else None)
+    return total
+
+
+def fetch_issue(issue_number: str, use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Fetch issue details from GitHub
+
+    Served from the local issue cache when it is fresh (and holds the
+    body, which closed issues are synced without).
+
+    Args:
+        issue_number: Issue number (without #)
+        use_cache: Set False to always ask GitHub
+
+    Returns:
+        Issue data with keys: title, body, labels, state, etc.
+    """
+    from issue_cache import open_cache
+
+    cache = open_cache() if use_cache else None
+    if cache is None:
+        return _view_issue(issue_number)
+
+    with cache:
+        if cache.is_fresh():
+            cached = cache.get(issue_number)
+            if cached is not None and 'body' in cached:
+                return cached
+
+        issue = _view_issue(issue_number)
+        # Don't advance the watermark: other issues may be older than this one
+        cache.upsert([issue], advance_watermark=False)
+        return issue
+
+
+def fetch_issues(
+    issue_numbers: List[str],
+    concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+    use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Fetch several issues, running up to `concurrency` gh calls at once
+
+    Fresh cache hits are served without spawning gh. Each gh call keeps
+    gh_command's retry and rate-limit handling; if one ends in an error
+    other than not-found, pending fetches are cancelled and it is raised.
+
+    Args:
+        issue_numbers: Issue numbers (without #); duplicates are ignored
+        concurrency: Maximum parallel gh processes
+        use_cache: Set False to always ask GitHub
+
+    Returns:
+        Issue data in input order; issues that don't exist are skipped
+
+    Raises:
+        RateLimitError: If the rate limit is still exceeded after retries
+        GitHubError: If any other fetch fails
+    """
+    numbers = list(dict.fromkeys(str(n) for n in issue_numbers))
+    found: Dict[str, Dict[str, Any]] = {}
+
+    from issue_cache import open_cache
+
+    cache = open_cache() if use_cache else None
+    try:
+        if cache is not None and cache.is_fresh():
+            for number in numbers:
+                cached = cache.get(number)
+                if cached is not None and 'body' in cached:
+                    found[number] = cached
+
+        missing = [number for number in numbers if number not in found]
+        fetched = []
+        if missing:
+            from concurrent.futures import ThreadPoolExecutor, as_completed
+
+            workers = max(1, min(concurrency, len(missing)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(_view_issue, number): number for number in missing}
+                try:
+                    for future in as_completed(futures):
+                        number = futures[future]
+                        try:
+                            found[number] = future.result()
+                            fetched.append(found[number])
+                        except NotFoundError:
+                            print(f"Issue #{number} not found, skipping", file=sys.stderr)
+                except GitHubError:
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+        if cache is not None and fetched:
+            cache.upsert(fetched, advance_watermark=False)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    return [found[number] for number in numbers if number in found]
+
+
+def list_issues(
+    state: str = 'open',
+    limit: Optional[int] = None,
+    use_cache: bool = True,
+    fields: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    List issues from repository, one at a time
+
+    Uses the local issue cache when available, syncing it incrementally
+    first if it is stale. If GitHub is unreachable, stale cached data is
+    returned rather than failing. Otherwise issues are fetched page by
+    page as the caller consumes them, so the whole backlog can be
+    processed in bounded memory. That is also how a projection (`fields`)
+    is served when the cache is stale, instead of a full sync, and how
+    closed issues are listed, as the cache only holds recent ones.
+
+    Args:
+        state: Issue state ('open', 'closed', 'all')
+        limit: Maximum number of issues to return (None for all)
+        use_cache: Set False to always ask GitHub
+        fields: Comma-separated fields to return (see parse_fields);
+            leave out `body` when it isn't needed
+
+    Yields:
+        Issue data, newest first
+
+    Raises:
+        GitHubError: If a page can't be fetched (earlier issues have
+            already been yielded)
+    """
+    projection = parse_fields(fields) if fields else None
+
+    from issue_cache import open_cache
+
+    # Closed issues are only cached for CLOSED_ISSUE_HISTORY_DAYS
+    cache = open_cache() if use_cache and state == 'open' else None
+    if cache is not None:
+        with cache:
+            fresh = cache.is_fresh()
+            if not fresh and projection is None:
+                try:
+                    sync_issue_cache(cache)
+                    fresh = True
+                except GitHubError as e:
+                    if not cache.watermark:
+                        raise
+                    print(f"Sync failed, using cached issues: {e}", file=sys.stderr)
+                    fresh = True
+            if fresh:
+                for issue in cache.iter(state, limit):
+                    yield project_issue(issue, projection)
+                return
+
+    count = 0
+    for page in iter_issue_pages(state, fields, page_size=limit or ISSUE_PAGE_SIZE):
+        for issue in page:
+            yield issue
+            count += 1
+            if limit and count >= limit:
+                return
+
+
+def post_comment(issue_number: str, body: str) -> Dict[str, Any]:
+    """
+    Post comment to issue
+
+    Args:
+        issue_number: Issue number (without #)
+        body: Comment body (markdown)
+
+    Returns:
+        Comment data (REST shape, including html_url)
+    """
+    backend = http_backend()
+    if backend is not None:
+        client, repo = backend
+        return http_call(lambda: client.request(
+            'POST', f'/repos/{repo}/issues/{issue_number}/comments', body={'body': body}
+        )[2])
+
+    # `gh issue comment` prints a URL, not JSON; the API returns the comment
+    return gh_command([
+        'api', f'repos/{{owner}}/{{repo}}/issues/{issue_number}/comments',
+        '-f', f'body={body}'
+    ])
+
+
+def close_issue(issue_number: str, reason: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Close an issue
+
+    Args:
+        issue_number: Issue number (without #)
+        reason: Optional closing reason
+
+    Returns:
+        Updated issue data
+    """
+    if reason:
+        post_comment(issue_number, reason)
+
+    backend = http_backend()
+    if backend is not None:
+        client, repo = backend
+        # Closing twice is harmless, so a lost response can be retried
+        result = http_call(lambda: client.request(
+            'PATCH', f'/repos/{repo}/issues/{issue_number}', body={'state': 'closed'}, idempotent=True
+        )[2])
+    else:
+        # `gh issue close` prints text, not JSON; the API returns the issue
+        result = gh_command([
+            'api', '-X', 'PATCH', f'repos/{{owner}}/{{repo}}/issues/{issue_number}',
+            '-f', 'state=closed'
+        ])
+    result = normalize_rest_issue(result)
+
+    from issue_cache import open_cache
+
+    cache = open_cache()
+    if cache is not None:
+        with cache:
+            cache.invalidate(issue_number)
+
+    return result
+
+
+def flush_write_queue() -> Dict[str, Any]:
+    """
+    Replay writes queued while GitHub was unreachable
+
+    Pending operations are coalesced (see write_queue.plan_flush), so
+    each issue costs at most one comment and one close. Each call is
+    recorded in the journal as soon as it succeeds, close reasons
+    included, so a retried close doesn't repost its reason; writes to
+    issues that no longer exist are dropped. Stops at the first other
+    failure, leaving the rest queued.
+
+    Returns:
+        Dict with operations flushed, API calls made, issues dropped,
+        operations still pending, and the error that stopped the flush
+    """
+    from write_queue import open_write_queue, plan_flush
+
+    summary: Dict[str, Any] = {'flushed': 0, 'api_calls': 0, 'dropped': [], 'pending': 0}
+    queue = open_write_queue()
+    if queue is None:
+        return summary
+
+    with queue.locked():
+        for step in plan_flush(queue.pending()):
+            try:
+                if step['comment'] is not None:
+                    post_comment(step['issue'], step['comment'])
+                    summary['api_calls'] += 1
+                    queue.ack(step['comment_seqs'])
+                    # If the close fails, a retry mustn't repost its reason
+                    queue.posted(step['reason_seqs'])
+                    summary['flushed'] += len(step['comment_seqs'])
+                if step['close']:
+                    close_issue(step['issue'])
+                    summary['api_calls'] += 1
+                    queue.ack(step['close_seqs'])
+                    summary['flushed'] += len(step['close_seqs'])
+            except NotFoundError:
+                print(f"Issue #{step['issue']} not found, dropping its queued writes", file=sys.stderr)
+                queue.ack(step['comment_seqs'] + step['close_seqs'])
+                summary['dropped'].append(step['issue'])
+            except GitHubError as e:
+                summary['error'] = str(e)
+                break
+
+        summary['pending'] = len(queue.pending())
+        queue.compact()
+
+    return summary
+
+
+def submit_write(op: str, issue_number: str, force_queue: bool = False, **fields: Any) -> Dict[str, Any]:
+    """
+    Perform a comment or close, queueing it if GitHub can't be reached
+
+    If writes are already queued, this one is queued behind them and the
+    queue is flushed, so writes land in order.
+
+    Args:
+        op: 'comment' (fields: body) or 'close' (fields: reason)
+        issue_number: Issue number (without #)
+        force_queue: Queue without trying GitHub (offline mode)
+
+    Returns:
+        The API result, or a status dict with mode 'offline_queued'
+
+    Raises:
+        NotFoundError: If the issue doesn't exist
+        GitHubError: On authentication failures, or any failure outside
+            a Keep project (nowhere to queue)
+    """
+    from write_queue import open_write_queue
+
+    queue = open_write_queue()
+
+    def write() -> Dict[str, Any]:
+        if op == 'comment':
+            return post_comment(issue_number, fields['body'])
+        if fields.get('reason'):
+            post_comment(issue_number, fields['reason'])
+            # Posted: if the close fails, only the close is queued
+            del fields['reason']
+        return close_issue(issue_number)
+
+    def queued(message: str) -> Dict[str, Any]:
+        return {
+            'success': True,
+            'mode': 'offline_queued',
+            'issue_number': int(issue_number),
+            'queued_until': 'next flush',
+            'message': message,
+            'local_reference': str(queue.path),
+        }
+
+    if queue is not None and (force_queue or queue.pending()):
+        queue.append(op, issue_number, **fields)
+        if force_queue:
+            return queued(f"{op.capitalize()} queued locally. Run `github_sync.py flush` to post it.")
+        summary = flush_write_queue()
+        if summary['pending']:
+            return queued(f"{op.capitalize()} queued behind earlier writes: {summary.get('error', '')}")
+        return {'success': True, 'mode': 'github', 'issue_number': int(issue_number), **summary}
+
+    try:
+        return write()
+    except NotFoundError:
+        raise
+    except GitHubError as e:
+        if queue is None or str(e).startswith('Authentication failed'):
+            raise
+        queue.append(op, issue_number, **fields)
+        return queued(f"GitHub unavailable ({e}). {op.capitalize()} queued locally.")
+
+
+def create_issue(
+    title: str,
+    body: str,
+    labels: Optional[List[str]] = None,
+    milestone: Optional[str] = None,
+    assignees: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Create a new GitHub issue
+
+    Args:
+        title: Issue title
+        body: Issue body (markdown)
+        labels: List of label names
+        milestone: Milestone name or number
+        assignees: List of GitHub usernames
+
+    Returns:
+        Created issue data
+
+    Raises:
+        GitHubError: If creation fails
+    """
+    args = ['issue', 'create', '--title', title, '--body', body]
+
+    if labels:
+        for label in labels:
+            args.extend(['--label', label])
+
+    if milestone:
+        args.extend(['--milestone', milestone])
+
+    if assignees:
+        for assignee in assignees:
+            args.extend(['--assignee', assignee])
+
+    return gh_command(args)
+
+
+def list_labels() -> List[Dict[str, Any]]:
+    """
+    List repository labels
+
+    Returns:
+        List of label data with name, description, color (first 100)
+    """
+    return [
+        {
+            'name': label.get('name', ''),
+            'description': label.get('description') or '',
+            'color': label.get('color', ''),
+        }
+        for label in conditional_get('/labels', {'per_page': 100})
+    ]
+
+
+def list_milestones(state: str = 'open') -> List[Dict[str, Any]]:
+    """
+    List repository milestones
+
+    Args:
+        state: Milestone state ('open', 'closed', 'all')
+
+    Returns:
+        List of milestone data (first 100)
+    """
+    return conditional_get('/milestones', {'state': state, 'per_page': 100})
+
+
+def parse_dependencies(issue_body: str) -> List[str]:
+    """
+    Parse dependency references from issue body
+
+    Looks for patterns like:
+    - "depends on #123"
+    - "blocked by #456"
+    - "requires #789"
+
+    Args:
+        issue_body: Issue body text
+
+    Returns:
+        List of issue numbers (as strings)
+    """
+    from blockers import parse_blockers
+
+    return sorted(parse_blockers(issue_body))
+
+
+def referenced_blockers(issues: List[Dict[str, Any]]) -> List[str]:
+    """
+    Collect blocker numbers referenced by issues but not among them
+
+    Args:
+        issues: Issue list (with bodies)
+
+    Returns:
+        Blocker refs (numbers, or owner/repo#N for other repositories),
+        same-repository numbers first, ascending
+    """
+    from blockers import parse_blockers
+
+    present = {str(issue['number']) for issue in issues}
+    referenced = set()
+    for issue in issues:
+        referenced.update(parse_blockers(issue.get('body') or ''))
+    return sorted(referenced - present, key=ref_sort_key)
+
+
+def ref_sort_key(ref: str) -> Tuple[str, int]:
+    """Order blocker refs by repository (current one first), then number"""
+    from blockers import split_blocker_ref
+
+    repo, number = split_blocker_ref(ref)
+    return repo or '', int(number)
+
+
+def _issue_states_query(numbers: List[str]) -> str:
+    """Build one GraphQL query with an aliased lookup per number"""
+    fields = ' '.join(
+        f'i{number}: issueOrPullRequest(number: {number}) '
+        '{ ... on Issue { state } ... on PullRequest { state } }'
+        for number in numbers
+    )
+    return (
+        'query($owner: String!, $repo: String!) '
+        f'{{ repository(owner: $owner, name: $repo) {{ {fields} }} }}'
+    )
+
+
+def _resolve_state_chunk(numbers: List[str], states: Dict[str, str], repo: Optional[str] = None):
+    """Resolve one chunk (of `repo`, default current), splitting it if a number doesn't exist"""
+    from blockers import blocker_ref
+
+    try:
+        backend = http_backend()
+        if backend is not None:
+            # GraphQL reports missing issues as errors beside partial data
+            client, current = backend
+            owner, name = (repo or current).split('/')
+            result = http_call(lambda: client.request('POST', client.graphql_path, body={
+                'query': _issue_states_query(numbers),
+                'variables': {'owner': owner, 'repo': name},
+            }, idempotent=True)[2]) or {}
+            if not result.get('data') and result.get('errors'):
+                raise NotFoundError(f"Could not resolve issues: {result['errors']}")
+        else:
+            result = gh_command(
+                ['api', 'graphql'] + _repo_variables(repo) + ['-f', f'query={_issue_states_query(numbers)}'],
+                allow_partial=True
+            )
+    except NotFoundError:
+        # No partial data came back; bisect to isolate the bad reference
+        if len(numbers) > 1:
+            middle = len(numbers) // 2
+            _resolve_state_chunk(numbers[:middle], states, repo)
+            _resolve_state_chunk(numbers[middle:], states, repo)
+        return
+
+    repository = (result.get('data') or {}).get('repository') or {}
+    for number in numbers:
+        node = repository.get(f'i{number}')
+        if node and node.get('state'):
+            states[blocker_ref(repo, number)] = node['state']
+
+
+def resolve_issue_states(
+    issue_numbers: List[str],
+    chunk_size: int = STATE_QUERY_CHUNK,
+    use_cache: bool = True
+) -> Dict[str, str]:
+    """
+    Resolve issue states with batched GraphQL queries
+
+    Looks up many issues (or PRs) per `gh api graphql` call instead of one
+    `gh issue view` each, and without downloading bodies. Fresh cache
+    entries are used first.
+
+    Args:
+        issue_numbers: Issue numbers (without #), or owner/repo#N refs
+            for issues in other repositories (see blockers.blocker_ref)
+        chunk_size: Lookups per query
+        use_cache: Set False to always ask GitHub
+
+    Returns:
+        Dict of number (or ref) -> state ('OPEN', 'CLOSED', 'MERGED');
+        numbers that don't exist are omitted
+    """
+    from blockers import split_blocker_ref
+    from issue_cache import open_cache
+
+    by_repo: Dict[Optional[str], set] = {}
+    for ref in issue_numbers:
+        repo, number = split_blocker_ref(str(ref))
+        if number.isdigit():
+            by_repo.setdefault(repo, set()).add(number)
+    numbers = sorted(by_repo.pop(None, ()), key=int)
+    states: Dict[str, str] = {}
+
+    cache = open_cache() if use_cache else None
+    if cache is not None:
+        with cache:
+            if cache.is_fresh():
+                for number in numbers:
+                    cached = cache.get(number)
+                    if cached is not None and cached.get('state'):
+                        states[number] = cached['state']
+
+    missing = [number for number in numbers if number not in states]
+    for start in range(0, len(missing), chunk_size):
+        _resolve_state_chunk(missing[start:start + chunk_size], states)
+
+    # Other repositories: no local cache, one query per chunk per repository
+    for repo in sorted(by_repo):
+        others = sorted(by_repo[repo], key=int)
+        for start in range(0, len(others), chunk_size):
+            _resolve_state_chunk(others[start:start + chunk_size], states, repo)
+
+    return states
+
+
+def via_daemon(method: str, params: Dict[str, Any], local: Callable[[], Any]) -> Any:
+    """
+    Run a read through the Keep daemon when one is running
+
+    Args:
+        method: Daemon method name
+        params: Method parameters
+        local: In-process fallback
+
+    Raises:
+        GitHubError: Re-raised from the daemon with its original type
+    """
+    if get_tracer() is not None:
+        # Profile the in-process path, not a socket round trip
+        return local()
+    from keep_daemon import DaemonError, DaemonUnavailable, request as daemon_request
+
+    try:
+        return daemon_request(method, params)
+    except DaemonUnavailable:
+        return local()
+    except DaemonError as e:
+        error_class = {
+            'GitHubError': GitHubError,
+            'RateLimitError': RateLimitError,
+            'NotFoundError': NotFoundError,
+        }.get(e.kind)
+        if error_class is None:
+            return local()
+        raise error_class(e.message)
+
+
+def check_gh_available() -> bool:
+    """
+    Check if gh CLI is available
+
+    With KEEP_GH_BACKEND=http, a usable token and repository count as
+    available even without gh installed.
+
+    Returns:
+        True if gh CLI available, False otherwise
+    """
+    if http_backend() is not None:
+        return True
+
+    import subprocess
+
+    try:
+        subprocess.run(
+            ['gh', '--version'],
+            capture_output=True,
+            check=True
+        )
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+
+
+def find_gh() -> Optional[str]:
+    """Locate the gh executable on PATH (without importing shutil)"""
+    names = ['gh.exe', 'gh'] if os.name == 'nt' else ['gh']
+    for directory in os.environ.get('PATH', '').split(os.pathsep):
+        for name in names:
+            candidate = os.path.join(directory or '.', name)
+            if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                return candidate
+    return None
+
+
+def gh_probe_path() -> str:
+    """Per-user cache of the last `gh --version` probe (KEEP_GH_PROBE_CACHE overrides)"""
+    override = os.environ.get('KEEP_GH_PROBE_CACHE')
+    if override:
+        return override
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'keep', 'gh_probe.json')
+
+
+def check_gh_available_cached(ttl: float = GH_PROBE_TTL) -> bool:
+    """
+    check_gh_available, reusing a recent probe of the same gh binary
+
+    The probe result is keyed by the executable's path, size and mtime,
+    so installing, upgrading or removing gh invalidates it. Without gh on
+    PATH no process is started at all.
+
+    Args:
+        ttl: Seconds a probe stays valid
+
+    Returns:
+        True if gh CLI (or the HTTP backend) is available
+    """
+    if os.environ.get('KEEP_GH_BACKEND', 'gh').lower() == 'http':
+        return check_gh_available()
+
+    gh = find_gh()
+    if gh is None:
+        return False
+    stat = os.stat(gh)
+    key = [os.path.realpath(gh), stat.st_size, stat.st_mtime_ns]
+
+    path = gh_probe_path()
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+        if cached['key'] == key and 0 <= time.time() - cached['checked_at'] < ttl:
+            return bool(cached['available'])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    available = check_gh_available()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'key': key, 'available': available, 'checked_at': time.time()}, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return available
+
+
+def get_repo_info() -> Dict[str, Any]:
+    """
+    Get current repository information
+
+    Returns:
+        Repository data with keys: owner, name, url, etc. (the shape of
+        `gh repo view --json owner,name,url,description`)
+    """
+    data = conditional_get('')
+    owner = data.get('owner') or {}
+    return {
+        'description': data.get('description') or '',
+        'name': data.get('name'),
+        'owner': {'id': owner.get('node_id', ''), 'login': owner.get('login')},
+        'url': data.get('html_url'),
+    }
+
+
+def main():
+    """CLI interface for testing"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='GitHub sync helper')
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Trace gh calls (see keep_trace.py) and print a timing report'
+    )
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+
+    # fetch-issue command
+    fetch_parser = subparsers.add_parser('fetch-issue', help='Fetch issue details')
+    fetch_parser.add_argument('number', help='Issue number')
+    fetch_parser.add_argument('--no-cache', action='store_true', help='Bypass local issue cache')
+
+    # fetch-issues command
+    fetch_many_parser = subparsers.add_parser('fetch-issues', help='Fetch several issues concurrently')
+    fetch_many_parser.add_argument('numbers', nargs='+', help='Issue numbers')
+    fetch_many_parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_FETCH_CONCURRENCY,
+        help='Max parallel requests'
+    )
+    fetch_many_parser.add_argument('--no-cache', action='store_true', help='Bypass local issue cache')
+
+    # list-issues command
+    list_parser = subparsers.add_parser('list-issues', help='List issues')
+    list_parser.add_argument('--state', default='open', choices=['open', 'closed', 'all'])
+    list_parser.add_argument('--limit', type=int, help='Max issues to return (default: all)')
+    list_parser.add_argument(
+        '--fields',
+        help=f'Comma-separated fields to fetch (default: {ISSUE_FIELDS}); omit body when not needed'
+    )
+    list_parser.add_argument('--no-cache', action='store_true', help='Bypass local issue cache')
+
+    # sync command
+    subparsers.add_parser('sync', help='Sync local issue cache with GitHub')
+
+    # post-comment command
+    comment_parser = subparsers.add_parser('post-comment', help='Post comment')
+    comment_parser.add_argument('number', help='Issue number')
+    comment_parser.add_argument('body', help='Comment body')
+    comment_parser.add_argument('--queue', action='store_true', help='Queue for the next flush (offline)')
+
+    # close-issue command
+    close_parser = subparsers.add_parser('close-issue', help='Close issue')
+    close_parser.add_argument('number', help='Issue number')
+    close_parser.add_argument('--reason', help='Closing reason')
+    close_parser.add_argument('--queue', action='store_true', help='Queue for the next flush (offline)')
+
+    # flush command
+    subparsers.add_parser('flush', help='Post queued offline comments and closes')
+
+    # queue command
+    subparsers.add_parser('queue', help='List queued offline writes')
+
+    # create-issue command
+    create_parser = subparsers.add_parser('create-issue', help='Create issue')
+    create_parser.add_argument('title', help='Issue title')
+    create_parser.add_argument('body', help='Issue body')
+    create_parser.add_argument('--label', action='append', help='Label to add (can be repeated)')
+    create_parser.add_argument('--milestone', help='Milestone')
+    create_parser.add_argument('--assignee', action='append', help='Assignee (can be repeated)')
+
+    # list-labels command
+    subparsers.add_parser('list-labels', help='List repository labels')
+
+    # list-milestones command
+    milestones_parser = subparsers.add_parser('list-milestones', help='List milestones')
+    milestones_parser.add_argument('--state', default='open', choices=['open', 'closed', 'all'])
+
+    # blocker-states command
+    states_parser = subparsers.add_parser(
+        'blocker-states',
+        help='Resolve states of blockers referenced by an issue list'
+    )
+    states_parser.add_argument('--issues', help='Path to JSON file with issues (or use stdin)')
+
+    # snapshot command
+    snapshot_parser = subparsers.add_parser(
+        'snapshot',
+        help='Write issues to a columnar snapshot (for score_issues.py --snapshot)'
+    )
+    snapshot_parser.add_argument('path', help='Snapshot file to write')
+    snapshot_parser.add_argument('--state', default='open', choices=['open', 'closed', 'all'])
+    snapshot_parser.add_argument('--issues', help='Convert a saved JSON export instead of fetching')
+    snapshot_parser.add_argument('--no-cache', action='store_true', help='Bypass local issue cache')
+
+    # repo-info command
+    subparsers.add_parser('repo-info', help='Show repository owner, name, url and description')
+
+    # rate-limit command
+    subparsers.add_parser('rate-limit', help='Show shared rate limit budget (refreshed)')
+
+    # response-cache command
+    response_cache_parser = subparsers.add_parser(
+        'response-cache',
+        help='Show conditional-request cache size and hit/miss counters'
+    )
+    response_cache_parser.add_argument('--clear', action='store_true', help='Drop cached responses and counters')
+
+    # check command
+    check_parser = subparsers.add_parser('check', help='Check gh CLI availability')
+    check_parser.add_argument('--no-cache', action='store_true', help='Always run `gh --version`')
+
+    args = parser.parse_args()
+    tracer = configure_trace('github_sync', args.profile)
+    started = time.perf_counter()
+
+    try:
+        if args.command == 'fetch-issue':
+            result = via_daemon(
+                'fetch-issue',
+                {'number': args.number, 'use_cache': not args.no_cache},
+                lambda: fetch_issue(args.number, use_cache=not args.no_cache)
+            )
+            print(json.dumps(result, indent=2))
+
+        elif args.command == 'fetch-issues':
+            result = fetch_issues(args.numbers, args.concurrency, use_cache=not args.no_cache)
+            print(json.dumps(result, indent=2))
+
+        elif args.command == 'list-issues':
+            # Streamed as pages arrive unless the daemon has them warm
+            result = via_daemon(
+                'list-issues',
+                {'state': args.state, 'limit': args.limit, 'use_cache': not args.no_cache, 'fields': args.fields},
+                lambda: list_issues(args.state, args.limit, use_cache=not args.no_cache, fields=args.fields)
+            )
+            failed: List[GitHubError] = []
+
+            def until_error(issues: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+                try:
+                    yield from issues
+                except GitHubError as e:
+                    failed.append(e)
+
+            # A failure mid-stream still closes the array; the exit status says it's incomplete
+            write_json_list(until_error(result), sys.stdout)
+            sys.stdout.write('\n')
+            if failed:
+                print(f"Error: {failed[0]} (listing incomplete)", file=sys.stderr)
+                sys.exit(1)
+
+        elif args.command == 'sync':
+            from issue_cache import open_cache
+
+            cache = open_cache()
+            if cache is None:
+                print("Error: no .claude/ directory (or KEEP_ISSUE_CACHE) for issue cache", file=sys.stderr)
+                sys.exit(1)
+            with cache:
+                synced = sync_issue_cache(cache)
+                print(json.dumps({'synced': synced, 'watermark': cache.watermark}))
+
+        elif args.command == 'post-comment':
+            result = submit_write('comment', args.number, args.queue, body=args.body)
+            print(json.dumps(result, indent=2))
+
+        elif args.command == 'close-issue':
+            result = submit_write('close', args.number, args.queue, reason=args.reason)
+            print(json.dumps(result, indent=2))
+
+        elif args.command == 'flush':
+            result = flush_write_queue()
+            print(json.dumps(result, indent=2))
+            sys.exit(1 if result.get('error') else 0)
+
+        elif args.command == 'queue':
+            from write_queue import open_write_queue, plan_flush
+
+            queue = open_write_queue()
+            pending = queue.pending() if queue is not None else []
+            print(json.dumps({'pending': pending, 'planned_calls': sum(
+                (step['comment'] is not None) + step['close'] for step in plan_flush(pending)
+            )}, indent=2))
+
+        elif args.command == 'create-issue':
+            result = create_issue(
+                title=args.title,
+                body=args.body,
+                labels=args.label,
+                milestone=args.milestone,
+                assignees=args.assignee
+            )
+            print(json.dumps(result, indent=2))
+
+        elif args.command == 'list-labels':
+            result = list_labels()
+            print(json.dumps(result, indent=2))
+
+        elif args.command == 'list-milestones':
+            result = list_milestones(args.state)
+            print(json.dumps(result, indent=2))
+
+        elif args.command == 'blocker-states':
+            if args.issues:
+                with open(args.issues) as f:
+                    issues = json.load(f)
+            else:
+                issues = json.load(sys.stdin)
+            result = resolve_issue_states(referenced_blockers(issues))
+            print(json.dumps(result, indent=2))
+
+        elif args.command == 'snapshot':
+            from blockers import load_blocker_memo, save_blocker_memo
+            from snapshot import SNAPSHOT_FIELDS, SnapshotError, write_snapshot
+
+            # Blocker parsing dominates writing; reuse the scorer's memo
+            load_blocker_memo()
+            try:
+                if args.issues:
+                    with open(args.issues) as f:
+                        result = write_snapshot(iter_json_issues(f), args.path)
+                else:
+                    issues = list_issues(args.state, use_cache=not args.no_cache, fields=SNAPSHOT_FIELDS)
+                    result = write_snapshot(issues, args.path)
+            except SnapshotError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+            save_blocker_memo()
+            print(json.dumps(result, indent=2))
+
+        elif args.command == 'repo-info':
+            result = get_repo_info()
+            print(json.dumps(result, indent=2))
+
+        elif args.command == 'rate-limit':
+            from rate_limit import get_scheduler
+
+            scheduler = get_scheduler()
+            if scheduler is None:
+                print(json.dumps({'enabled': False}))
+            else:
+                print(json.dumps(scheduler.snapshot(refresh=True), indent=2))
+
+        elif args.command == 'response-cache':
+            from response_cache import open_response_cache
+
+            response_cache = open_response_cache()
+            if response_cache is None:
+                print(json.dumps({'enabled': False}))
+            else:
+                with response_cache:
+                    if args.clear:
+                        response_cache.clear()
+                    print(json.dumps({'enabled': True, **response_cache.stats()}, indent=2))
+
+        elif args.command == 'check':
+            available = check_gh_available() if args.no_cache else check_gh_available_cached()
+            print(json.dumps({'available': available}))
+            sys.exit(0 if available else 1)
+
+        else:
+            parser.print_help()
+            sys.exit(1)
+
+    except GitHubError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if tracer is not None:
+            tracer.complete(f'command {args.command}', started, 'command')
+
+
+if __name__ == '__main__':
+    main()
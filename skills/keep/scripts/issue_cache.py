@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Local issue cache for Keep
+
+SQLite store under .claude/cache/ holding issues keyed by number, plus a
+sync watermark (newest `updatedAt` seen). github_sync uses it to serve
+fetch_issue/list_issues without spawning `gh` when the cache is fresh,
+and to pull only issues updated since the watermark when it isn't
+(periodically reconciling against a full listing, see retain).
+
+The cache is only used inside Keep projects (where `.claude/` exists).
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Any
+
+
+DEFAULT_CACHE_PATH = '.claude/cache/issues.db'
+
+# Seconds a sync stays fresh before the next read triggers an incremental pull
+DEFAULT_TTL = 300
+
+
+def cache_path() -> Optional[Path]:
+    """
+    Resolve the cache file location
+
+    Returns:
+        Path from KEEP_ISSUE_CACHE, else .claude/cache/issues.db when
+        .claude/ exists, else None (caching disabled)
+    """
+    override = os.environ.get('KEEP_ISSUE_CACHE')
+    if override:
+        return Path(override)
+    if Path('.claude').is_dir():
+        return Path(DEFAULT_CACHE_PATH)
+    return None
+
+
+def cache_ttl() -> float:
+    """Freshness window in seconds (KEEP_CACHE_TTL overrides the default)"""
+    try:
+        return float(os.environ.get('KEEP_CACHE_TTL', DEFAULT_TTL))
+    except ValueError:
+        return DEFAULT_TTL
+
+
+class IssueCache:
+    """SQLite-backed issue store with an `updatedAt` sync watermark"""
+
+    def __init__(self, path: Path):
+        # Imported on open: scripts that only check for a cache stay light
+        import sqlite3
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS issues (
+                number INTEGER PRIMARY KEY,
+                state TEXT,
+                updated_at TEXT,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+            (key, value)
+        )
+
+    @property
+    def watermark(self) -> Optional[str]:
+        """Newest `updatedAt` stored, or None if never synced"""
+        return self._get_meta('watermark')
+
+    @property
+    def last_sync(self) -> float:
+        """Epoch seconds of the last completed sync (0 if never)"""
+        value = self._get_meta('last_sync')
+        return float(value) if value else 0.0
+
+    @property
+    def last_reconcile(self) -> float:
+        """Epoch seconds of the last sync that listed every issue (0 if never)"""
+        value = self._get_meta('last_reconcile')
+        return float(value) if value else 0.0
+
+    def is_fresh(self, ttl: Optional[float] = None) -> bool:
+        """True if the last sync is within the freshness window"""
+        if ttl is None:
+            ttl = cache_ttl()
+        return time.time() - self.last_sync < ttl
+
+    def get(self, number: str) -> Optional[Dict[str, Any]]:
+        """Return cached issue data, or None"""
+        row = self.conn.execute(
+            'SELECT data FROM issues WHERE number = ?', (int(number),)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter(self, state: str = 'open', limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate cached issues, decoding one at a time
+
+        Newest first, matching `gh issue list` order.
+
+        Args:
+            state: 'open', 'closed' or 'all'
+            limit: Maximum number of issues to return
+        """
+        query = 'SELECT data FROM issues'
+        params: List[Any] = []
+        if state != 'all':
+            query += ' WHERE state = ?'
+            params.append(state.upper())
+        query += ' ORDER BY number DESC'
+        if limit:
+            query += ' LIMIT ?'
+            params.append(limit)
+        for row in self.conn.execute(query, params):
+            yield json.loads(row[0])
+
+    def upsert(self, issues: List[Dict[str, Any]], advance_watermark: bool = True):
+        """
+        Store issues
+
+        Args:
+            issues: Issue data from gh
+            advance_watermark: Move the watermark to the newest `updatedAt`
+                seen. Only sync results should do this; a single fetched
+                issue says nothing about others updated before it.
+        """
+        watermark = self.watermark or ''
+        rows = []
+        for issue in issues:
+            updated_at = issue.get('updatedAt') or ''
+            if advance_watermark:
+                watermark = max(watermark, updated_at)
+            rows.append((issue['number'], issue.get('state'), updated_at, json.dumps(issue)))
+
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO issues (number, state, updated_at, data) '
+                'VALUES (?, ?, ?, ?)',
+                rows
+            )
+            if watermark:
+                self._set_meta('watermark', watermark)
+
+    def mark_synced(self, watermark: Optional[str] = None, reconciled_at: Optional[float] = None):
+        """
+        Record that a sync just completed, advancing the watermark to `watermark`
+
+        Args:
+            watermark: Newest `updatedAt` the sync saw
+            reconciled_at: Epoch seconds the sync listed every issue the
+                cache should hold at, if it did
+        """
+        with self.conn:
+            if watermark:
+                self._set_meta('watermark', watermark)
+            self._set_meta('last_sync', str(time.time()))
+            if reconciled_at is not None:
+                self._set_meta('last_reconcile', str(reconciled_at))
+
+    def retain(self, numbers: Iterable[int]):
+        """Drop every cached issue whose number isn't in `numbers`"""
+        with self.conn:
+            self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS listed (number INTEGER PRIMARY KEY)')
+            self.conn.execute('DELETE FROM listed')
+            self.conn.executemany('INSERT OR IGNORE INTO listed (number) VALUES (?)', ((n,) for n in numbers))
+            self.conn.execute('DELETE FROM issues WHERE number NOT IN (SELECT number FROM listed)')
+            self.conn.execute('DELETE FROM listed')
+
+    def invalidate(self, number: str):
+        """Drop one issue (e.g. after a local write) so it is re-fetched"""
+        with self.conn:
+            self.conn.execute('DELETE FROM issues WHERE number = ?', (int(number),))
+            self._set_meta('last_sync', '0')
+
+
+def open_cache() -> Optional[IssueCache]:
+    """
+    Open the project issue cache
+
+    Returns:
+        IssueCache, or None when caching is disabled or the file is unusable
+    """
+    path = cache_path()
+    if path is None:
+        return None
+    import sqlite3
+
+    try:
+        return IssueCache(path)
+    except (sqlite3.Error, OSError):
+        return None
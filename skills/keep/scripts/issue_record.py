@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Compact issue records for scoring
+
+`gh issue list --json` dicts carry full bodies, label objects and ISO
+timestamps. Scoring only needs a few fields, so each issue is reduced to
+an IssueRecord as soon as it is decoded: the body is scanned once (for
+blocker references and the continuity match) and then dropped, labels
+become interned tuples of lowercased names, the state and priority
+become small codes and `updatedAt` becomes epoch microseconds.
+
+Records hold no body text, so large exports can be scored without
+keeping every issue's body in memory.
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from blockers import parse_blockers
+
+
+# State codes (only OPEN matters for scoring; other states count as closed)
+STATE_OPEN = 0
+STATE_CLOSED = 1
+STATE_UNKNOWN = 2
+
+# Index states by code, as build_issue_index stores them
+STATE_NAMES = ('OPEN', 'CLOSED', None)
+
+# Priority codes: (score, reason) by code
+PRIORITY_URGENT = 0
+PRIORITY_HIGH = 1
+PRIORITY_MEDIUM = 2
+PRIORITY_LOW = 3
+
+PRIORITY_LEVELS = (
+    (100, 'urgent'),
+    (75, 'high-priority'),
+    (50, 'medium (default)'),
+    (25, 'low-priority'),
+)
+
+# updated_us values for issues without a usable `updatedAt`
+UPDATED_MISSING = -2 ** 63
+UPDATED_INVALID = -2 ** 63 + 1
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_US = timedelta(microseconds=1)
+ONE_DAY_US = 86_400_000_000
+
+# Label tuples and continuity matches repeat across a backlog; share one copy of each
+_label_sets: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+_matches: Dict[Tuple[Optional[str], Optional[str]], Tuple[Optional[str], Optional[str]]] = {}
+
+
+class IssueRecord:
+    """
+    The fields of one issue that scoring reads
+
+    Attributes:
+        number: Issue number as given by gh (kept as-is for output)
+        title: Issue title
+        state: STATE_* code
+        priority: PRIORITY_* code
+        updated_us: `updatedAt` in epoch microseconds, or UPDATED_MISSING
+            / UPDATED_INVALID
+        labels: Lowercased label names (interned, first-seen order)
+        blockers: Blocker issue numbers (as strings) parsed from the body
+        match: ContinuityMatcher.match result for title and body
+    """
+
+    __slots__ = ('number', 'title', 'state', 'priority', 'updated_us', 'labels', 'blockers', 'match')
+
+    def __init__(
+        self,
+        number: Any,
+        title: str,
+        state: int,
+        priority: int,
+        updated_us: int,
+        labels: Tuple[str, ...],
+        blockers: Tuple[str, ...],
+        match: Tuple[Optional[str], Optional[str]]
+    ):
+        self.number = number
+        self.title = title
+        self.state = state
+        self.priority = priority
+        self.updated_us = updated_us
+        self.labels = labels
+        self.blockers = blockers
+        self.match = match
+
+    def __repr__(self) -> str:
+        return f'IssueRecord(#{self.number}, {self.title!r})'
+
+
+def state_code(state: Optional[str]) -> int:
+    """STATE_* code for a gh state string"""
+    if state == 'OPEN':
+        return STATE_OPEN
+    if state is None:
+        return STATE_UNKNOWN
+    return STATE_CLOSED
+
+
+def priority_code(labels: Tuple[str, ...]) -> int:
+    """PRIORITY_* code from lowercased label names"""
+    if 'urgent' in labels:
+        return PRIORITY_URGENT
+    elif 'high-priority' in labels or 'high' in labels:
+        return PRIORITY_HIGH
+    elif 'low-priority' in labels or 'low' in labels:
+        return PRIORITY_LOW
+    else:
+        return PRIORITY_MEDIUM
+
+
+def parse_updated(updated_at: Optional[str]) -> int:
+    """`updatedAt` as epoch microseconds (or an UPDATED_* sentinel)"""
+    if not updated_at:
+        return UPDATED_MISSING
+    try:
+        updated = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return UPDATED_INVALID
+    return (updated - EPOCH) // ONE_US
+
+
+def intern_labels(labels: Any) -> Tuple[str, ...]:
+    """Lowercased, deduplicated label names from gh label objects, shared across records"""
+    names = tuple(dict.fromkeys(sys.intern(label['name'].lower()) for label in labels or ()))
+    return _label_sets.setdefault(names, names)
+
+
+def compact_issue(issue: Dict[str, Any], match: Tuple[Optional[str], Optional[str]]) -> IssueRecord:
+    """
+    Reduce a gh issue dict to an IssueRecord
+
+    Args:
+        issue: Issue as returned by `gh issue list --json ...`
+        match: ContinuityMatcher.match(title, body) for the issue, taken
+            by the caller while the body is at hand
+
+    Returns:
+        The record; nothing in it refers back to `issue`
+    """
+    labels = intern_labels(issue.get('labels'))
+    return IssueRecord(
+        issue['number'],
+        issue.get('title', ''),
+        state_code(issue.get('state')),
+        priority_code(labels),
+        parse_updated(issue.get('updatedAt')),
+        labels,
+        tuple(sys.intern(number) for number in parse_blockers(issue.get('body', ''))),
+        _matches.setdefault(match, match),
+    )
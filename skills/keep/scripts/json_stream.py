@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON array reading and writing for Keep scripts
+
+Issue lists can be larger than is comfortable to hold as one string or
+one decoded list. iter_json_issues decodes a stream one item at a time
+and write_json_list encodes one item at a time, with output identical
+to json.dumps(items, indent=2).
+"""
+
+import json
+from typing import Any, Dict, Iterable, Iterator, TextIO
+
+
+# Read size for streaming input
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def write_json_list(items: Iterable[Any], stream: TextIO):
+    """
+    Write items as json.dumps(list(items), indent=2) would, one at a time
+
+    Keeps only one encoded item in memory.
+    """
+    first = True
+    for item in items:
+        stream.write('[\n  ' if first else ',\n  ')
+        stream.write(json.dumps(item, indent=2).replace('\n', '\n  '))
+        first = False
+    stream.write('[]' if first else '\n]')
+
+
+def iter_json_issues(stream: TextIO, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally decode issues from a text stream
+
+    Accepts a JSON array, JSON Lines, or a single JSON object. Only one
+    issue is held in memory at a time (plus the read buffer).
+
+    Args:
+        stream: Text stream positioned at the start of the data
+        chunk_size: Bytes to read per refill
+
+    Yields:
+        Issue dicts in input order
+
+    Raises:
+        json.JSONDecodeError: If the input is malformed
+    """
+    decoder = json.JSONDecoder()
+    buf = stream.read(chunk_size)
+    pos = 0
+    eof = not buf
+    in_array = None
+
+    while True:
+        # Skip whitespace, refilling the buffer as needed
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            buf = stream.read(chunk_size)
+            pos = 0
+            eof = not buf
+
+        if pos >= len(buf):
+            return
+
+        char = buf[pos]
+        if in_array is None:
+            in_array = char == '['
+            if in_array:
+                pos += 1
+                continue
+        if in_array and char == ',':
+            pos += 1
+            continue
+        if in_array and char == ']':
+            return
+
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Value spans the buffer boundary - grow the buffer and retry
+            more = stream.read(max(chunk_size, len(buf) - pos))
+            buf = buf[pos:] + more
+            pos = 0
+            eof = not more
+            continue
+
+        yield value
+        pos = end
+        if pos >= chunk_size:
+            buf = buf[pos:]
+            pos = 0
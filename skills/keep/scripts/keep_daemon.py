@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+Optional background daemon for Keep
+
+Keeps parsed state.md contexts, compact issue records, scores and issue
+lookups warm in memory, so repeated `/keep:*` invocations don't pay for
+cold Python processes re-parsing and re-scoring everything. The
+score_issues.py and github_sync.py CLIs use the daemon when it is
+running and fall back to in-process execution otherwise.
+
+Protocol: one JSON object per line over a Unix socket
+(.claude/cache/keep.sock, or KEEP_DAEMON_SOCKET):
+
+    -> {"id": 1, "method": "score", "params": {...}}
+    <- {"id": 1, "result": ...}
+    <- {"id": 1, "error": {"type": "NotFoundError", "message": "..."}}
+
+Methods: ping, score, fetch-issue, list-issues, shutdown.
+
+Warm entries are keyed by the (mtime, size) of the files they came from,
+so edits to state.md, the work files it pulls in (.claude/work/*.md),
+issue files and the issue cache database (e.g. a `github_sync.py sync`)
+invalidate them. The daemon exits after
+KEEP_DAEMON_IDLE seconds without requests, or when its own scripts
+change on disk.
+
+Usage:
+    python keep_daemon.py start|stop|status
+    python keep_daemon.py serve   # foreground
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+DEFAULT_SOCKET_PATH = '.claude/cache/keep.sock'
+DEFAULT_LOG_PATH = '.claude/cache/keep-daemon.log'
+
+# Seconds without requests before the daemon exits
+DEFAULT_IDLE_TIMEOUT = 1800
+
+# Seconds a client waits for a response before falling back
+REQUEST_TIMEOUT = 120
+
+# Seconds memoized scores stay valid (freshness depends on the clock)
+SCORE_TTL = 60
+
+# Entries kept per memo table
+MEMO_SIZE = 32
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is reachable; the caller should run in-process"""
+
+
+class DaemonError(Exception):
+    """The daemon ran the request and it failed"""
+
+    def __init__(self, kind: str, message: str):
+        super().__init__(f"{kind}: {message}")
+        self.kind = kind
+        self.message = message
+
+
+def socket_path() -> Optional[Path]:
+    """Daemon socket (KEEP_DAEMON_SOCKET overrides), or None outside a Keep project"""
+    override = os.environ.get('KEEP_DAEMON_SOCKET')
+    if override:
+        return Path(override)
+    if Path('.claude').is_dir():
+        return Path(DEFAULT_SOCKET_PATH)
+    return None
+
+
+def daemon_running() -> bool:
+    """Whether a daemon socket exists for this project (and the daemon isn't disabled)"""
+    if os.environ.get('KEEP_DAEMON', '').lower() in ('off', '0', 'false'):
+        return False
+    path = socket_path()
+    return path is not None and path.exists()
+
+
+def request(method: str, params: Optional[Dict[str, Any]] = None, timeout: float = REQUEST_TIMEOUT) -> Any:
+    """
+    Send one request to the running daemon
+
+    Args:
+        method: Daemon method name
+        params: JSON-serializable parameters
+        timeout: Seconds to wait for the response
+
+    Returns:
+        The method's result
+
+    Raises:
+        DaemonUnavailable: If no daemon is running (or KEEP_DAEMON=off),
+            or the connection fails
+        DaemonError: If the daemon reports an error
+    """
+    if os.environ.get('KEEP_DAEMON', '').lower() in ('off', '0', 'false'):
+        raise DaemonUnavailable('disabled')
+    path = socket_path()
+    if path is None or not path.exists():
+        raise DaemonUnavailable('not running')
+
+    # Clients import this module on every run; keep socket off that path
+    import socket
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            sock.sendall(json.dumps({'id': 1, 'method': method, 'params': params or {}}).encode() + b'\n')
+            with sock.makefile('rb') as stream:
+                line = stream.readline()
+        response = json.loads(line)
+    except (OSError, ValueError) as e:
+        raise DaemonUnavailable(str(e))
+
+    error = response.get('error')
+    if error:
+        if error.get('type') == 'DaemonStale':
+            raise DaemonUnavailable(error.get('message', 'stale'))
+        raise DaemonError(error.get('type', 'Error'), error.get('message', ''))
+    return response.get('result')
+
+
+def file_stamp(path: Optional[str]) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it doesn't exist"""
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def dir_stamp(path: Path) -> Tuple:
+    """(name, mtime_ns, size) of each file in a directory, empty if it doesn't exist"""
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return ()
+    stamps = []
+    for entry in entries:
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        stamps.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(stamps))
+
+
+def code_stamp() -> Tuple:
+    """Stamps of the Keep scripts, to notice upgrades under a running daemon"""
+    return tuple(file_stamp(str(path)) for path in sorted(SCRIPTS_DIR.glob('*.py')))
+
+
+class Memo:
+    """Small bounded map of key -> (validity stamp, value)"""
+
+    def __init__(self, size: int = MEMO_SIZE):
+        self.size = size
+        self.entries: Dict[Any, Tuple[Any, Any]] = {}
+
+    def get(self, key: Any, stamp: Any, compute: Callable[[], Any]) -> Any:
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        value = compute()
+        if len(self.entries) >= self.size and key not in self.entries:
+            self.entries.pop(next(iter(self.entries)))
+        self.entries[key] = (stamp, value)
+        return value
+
+
+class KeepDaemon:
+    """Request handlers and warm state"""
+
+    def __init__(self):
+        # Imported here so CLI clients never load the scoring/sync modules twice
+        import threading
+
+        import github_sync
+        import score_issues
+        from blockers import load_blocker_memo
+        from issue_cache import cache_path, cache_ttl
+
+        self.github_sync = github_sync
+        self.score_issues = score_issues
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+
+        # Scoring and GitHub reads use separate locks, so a slow sync
+        # doesn't hold up scoring
+        self.score_lock = threading.Lock()
+        self.github_lock = threading.Lock()
+        self.started = time.time()
+        self.last_request = time.time()
+        self.requests = 0
+        self.code_stamp = code_stamp()
+
+        self.contexts = Memo()
+        self.records = Memo()
+        self.scores = Memo()
+        self.lookups = Memo(1024)
+
+        load_blocker_memo()
+        memo_path = score_issues.score_memo_path()
+        self.score_memo = score_issues.ScoreMemo.load(memo_path) if memo_path is not None else None
+
+    def _issues_stamp(self) -> Any:
+        """Validity stamp for issue lookups: cache file + TTL window"""
+        path = self.cache_path()
+        window = int(time.time() // max(self.cache_ttl(), 1))
+        return file_stamp(str(path) if path else None), window
+
+    def _context_stamp(self, path: str) -> Any:
+        """Validity stamp for a parsed state file: it, the issue cache (labels) and the work files"""
+        cache = self.cache_path()
+        return (
+            file_stamp(path),
+            file_stamp(str(cache) if cache else None),
+            dir_stamp(Path(path).parent / 'work')
+        )
+
+    def _context(self, path: str) -> Dict[str, Any]:
+        return self.contexts.get(path, self._context_stamp(path), lambda: self.score_issues.parse_state_file(path))
+
+    def _issues_key(self, params: Dict[str, Any]) -> Any:
+        """Identity of the issues in a request: (path, stamp) of issues_path, or a digest of issues_text"""
+        path = params.get('issues_path')
+        if path:
+            return path, file_stamp(path)
+
+        import hashlib
+
+        text = params.get('issues_text') or ''
+        return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+    def _records(
+        self,
+        params: Dict[str, Any],
+        issues_key: Any,
+        context: Dict[str, Any],
+        text_index: Any
+    ) -> Any:
+        """
+        Compact records for the request's issues
+
+        Bodies are only held while the issues are decoded and compacted
+        (updating the text index as they go). Records carry the continuity
+        match, so they are kept per context scan key.
+        """
+        def compute():
+            path = params.get('issues_path')
+            if path:
+                with open(path) as f:
+                    issues = json.load(f)
+            else:
+                issues = json.loads(params.get('issues_text') or '[]')
+            if isinstance(issues, dict):
+                issues = [issues]
+            return list(self.score_issues.compact_issues(issues, context, self.score_memo, text_index))
+
+        key = (issues_key, self.score_issues.ScoreMemo.scan_key(context))
+        return self.records.get(key, None, compute)
+
+    def score(self, params: Dict[str, Any]) -> Any:
+        from blockers import save_blocker_memo
+        from text_index import open_text_index
+
+        recent_work = params.get('recent_work') or '.claude/state.md'
+        blocker_states = params.get('blocker_states')
+        top = params.get('top')
+        engine = params.get('engine', 'auto')
+
+        context = self._context(recent_work)
+        issues_key = self._issues_key(params)
+
+        def compute():
+            known_states = None
+            if blocker_states:
+                with open(blocker_states) as f:
+                    known_states = json.load(f)
+            text_index = open_text_index()
+            try:
+                records = self._records(params, issues_key, context, text_index)
+                scored = self.score_issues.score_all_issues(
+                    records, context, top, engine=engine, known_states=known_states, text_index=text_index
+                )
+            finally:
+                self.score_issues.close_text_index(text_index)
+            save_blocker_memo()
+            if self.score_memo is not None:
+                self.score_memo.save()
+            return scored
+
+        key = (recent_work, issues_key, blocker_states, top, engine)
+        stamp = (
+            self._context_stamp(recent_work),
+            file_stamp(blocker_states),
+            int(time.time() // SCORE_TTL)
+        )
+        return self.scores.get(key, stamp, compute)
+
+    def fetch_issue(self, params: Dict[str, Any]) -> Any:
+        number = str(params['number'])
+        use_cache = params.get('use_cache', True)
+        if not use_cache:
+            return self.github_sync.fetch_issue(number, use_cache=False)
+        return self.lookups.get(
+            ('issue', number), self._issues_stamp(),
+            lambda: self.github_sync.fetch_issue(number)
+        )
+
+    def list_issues(self, params: Dict[str, Any]) -> Any:
+        state = params.get('state', 'open')
+        limit = params.get('limit')
+        use_cache = params.get('use_cache', True)
+        fields = params.get('fields')
+        if not use_cache:
+            return list(self.github_sync.list_issues(state, limit, use_cache=False, fields=fields))
+        return self.lookups.get(
+            ('list', state, limit, fields), self._issues_stamp(),
+            lambda: list(self.github_sync.list_issues(state, limit, fields=fields))
+        )
+
+    def status(self, params: Dict[str, Any]) -> Any:
+        return {
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started, 1),
+            'requests': self.requests,
+            'warm': {
+                'contexts': len(self.contexts.entries),
+                'records': len(self.records.entries),
+                'scores': len(self.scores.entries),
+                'lookups': len(self.lookups.entries),
+            },
+        }
+
+    def dispatch(self, method: str, params: Dict[str, Any]) -> Any:
+        handlers = {
+            'score': (self.score, self.score_lock),
+            'fetch-issue': (self.fetch_issue, self.github_lock),
+            'list-issues': (self.list_issues, self.github_lock),
+        }
+        self.requests += 1
+        self.last_request = time.time()
+        if method == 'ping':
+            return self.status(params)
+        if method not in handlers:
+            raise ValueError(f"Unknown method: {method}")
+        handler, lock = handlers[method]
+        with lock:
+            return handler(params)
+
+
+def serve(idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+    """Run the daemon in the foreground until idle, stale or shut down"""
+    import socketserver
+    import threading
+
+    path = socket_path()
+    if path is None:
+        print("Error: not a Keep project (no .claude/ directory)", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        request('ping', timeout=1)
+        print("Daemon already running", file=sys.stderr)
+        sys.exit(1)
+    except DaemonUnavailable:
+        pass
+    # Left over from a daemon that didn't exit cleanly
+    if path.exists():
+        path.unlink()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    daemon = KeepDaemon()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                message: Dict[str, Any] = {}
+                try:
+                    message = json.loads(line)
+                    method = message.get('method', '')
+                    if method == 'shutdown':
+                        response = {'result': {'stopping': True}}
+                        threading.Thread(target=server.shutdown, daemon=True).start()
+                    elif code_stamp() != daemon.code_stamp:
+                        response = {'error': {'type': 'DaemonStale', 'message': 'scripts changed'}}
+                        threading.Thread(target=server.shutdown, daemon=True).start()
+                    else:
+                        response = {'result': daemon.dispatch(method, message.get('params') or {})}
+                except Exception as e:
+                    response = {'error': {'type': type(e).__name__, 'message': str(e)}}
+                response['id'] = message.get('id') if isinstance(message, dict) else None
+                self.wfile.write(json.dumps(response).encode() + b'\n')
+                self.wfile.flush()
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    def watch_idle():
+        while True:
+            time.sleep(min(idle_timeout, 30))
+            if time.time() - daemon.last_request > idle_timeout:
+                server.shutdown()
+                return
+
+    server = Server(str(path), Handler)
+    threading.Thread(target=watch_idle, daemon=True).start()
+    print(f"Keep daemon {os.getpid()} listening on {path}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def start() -> Dict[str, Any]:
+    """Start the daemon in the background and wait until it answers"""
+    import subprocess
+
+    try:
+        return request('ping', timeout=1)
+    except DaemonUnavailable:
+        pass
+
+    if socket_path() is None:
+        raise DaemonUnavailable('not a Keep project (no .claude/ directory)')
+
+    log_path = Path(DEFAULT_LOG_PATH)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, 'a') as log:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), 'serve'],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True
+        )
+
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        try:
+            return request('ping', timeout=1)
+        except DaemonUnavailable:
+            time.sleep(0.05)
+    raise DaemonUnavailable(f"daemon did not start (see {log_path})")
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Keep background daemon')
+    parser.add_argument('command', choices=['start', 'stop', 'status', 'serve'])
+    parser.add_argument(
+        '--idle-timeout',
+        type=float,
+        default=float(os.environ.get('KEEP_DAEMON_IDLE', DEFAULT_IDLE_TIMEOUT)),
+        help='Exit after this many seconds without requests'
+    )
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'serve':
+            serve(args.idle_timeout)
+
+        elif args.command == 'start':
+            print(json.dumps(start()))
+
+        elif args.command == 'stop':
+            try:
+                result = request('shutdown', timeout=5)
+            except DaemonUnavailable:
+                result = {'running': False}
+            # Wait for the socket to go away so a following start succeeds
+            path = socket_path()
+            deadline = time.time() + 5
+            while path is not None and path.exists() and time.time() < deadline:
+                time.sleep(0.05)
+            print(json.dumps(result))
+
+        elif args.command == 'status':
+            try:
+                print(json.dumps(dict(request('ping', timeout=5), running=True)))
+            except DaemonUnavailable:
+                print(json.dumps({'running': False}))
+                sys.exit(1)
+
+    except (DaemonUnavailable, DaemonError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Opt-in timing traces for Keep scripts
+
+Enabled with `--profile` on score_issues.py / github_sync.py, or by
+setting KEEP_TRACE=<path> (any process, e.g. under /keep:done). Events
+are appended to the trace file when the process exits:
+
+- Path ending in .json: Chrome trace (JSON array format), viewable in
+  chrome://tracing or https://ui.perfetto.dev
+- Anything else: JSON lines, one event per line
+
+Both formats carry the same records: complete events with name, cat,
+ts/dur (microseconds, wall-clock ts so runs from several processes line
+up), pid, tid and args. Hot functions are aggregated (one event with a
+call count) instead of logged per call.
+
+When tracing is off, get_tracer() returns None and span() returns a
+shared no-op context, so instrumented code pays one check per phase.
+
+Usage:
+    KEEP_TRACE=/tmp/keep.json python score_issues.py ...
+    python score_issues.py --profile ...      (also prints a report)
+    python keep_trace.py report /tmp/keep.jsonl
+"""
+
+import atexit
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    # Every Keep CLI imports this module; pathlib is only needed once
+    # tracing is on
+    from pathlib import Path
+
+DEFAULT_TRACE_NAME = 'trace.jsonl'
+
+_NULL_SPAN = nullcontext()
+
+
+def default_trace_path() -> 'Path':
+    """.claude/cache/trace.jsonl in a Keep project, else in the temp dir"""
+    from pathlib import Path
+
+    if Path('.claude').is_dir():
+        return Path('.claude') / 'cache' / DEFAULT_TRACE_NAME
+    import tempfile
+
+    return Path(tempfile.gettempdir()) / f'keep-{DEFAULT_TRACE_NAME}'
+
+
+class Tracer:
+    """Collects timing events for one process and writes them at exit"""
+
+    def __init__(self, path: 'Path', process_name: str, report: bool = False):
+        import threading
+
+        self._thread_id = threading.get_ident
+        self.path = path
+        self.process_name = process_name
+        self.report = report
+        self.pid = os.getpid()
+        self.events: List[Dict[str, Any]] = []
+        # name -> [calls, total seconds, first start]
+        self.aggregates: Dict[str, List[Any]] = {}
+        self._perf0 = time.perf_counter()
+        self._epoch_us = time.time() * 1e6
+
+    def _ts(self, perf: float) -> float:
+        return round(self._epoch_us + (perf - self._perf0) * 1e6, 1)
+
+    def complete(self, name: str, start: float, cat: str = 'keep', **args: Any):
+        """
+        Record an event that began at `start` (time.perf_counter()) and ends now
+
+        Safe to call from worker threads.
+        """
+        end = time.perf_counter()
+        self.events.append({
+            'name': name,
+            'cat': cat,
+            'ph': 'X',
+            'ts': self._ts(start),
+            'dur': round((end - start) * 1e6, 1),
+            'pid': self.pid,
+            'tid': self._thread_id(),
+            'args': args,
+        })
+
+    @contextmanager
+    def span(self, name: str, cat: str = 'keep', **args: Any) -> Iterator[Dict[str, Any]]:
+        """Time a block; the yielded dict can be filled with extra args"""
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.complete(name, start, cat, **args)
+
+    def timed(self, func: Callable[..., Any], name: str) -> Callable[..., Any]:
+        """
+        Wrap a hot function so its calls are counted and timed in aggregate
+
+        Not thread-safe; use for single-threaded loops such as scoring.
+        """
+        stats = self.aggregates.setdefault(name, [0, 0.0, None])
+        clock = time.perf_counter
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats[0] += 1
+                stats[1] += clock() - start
+                if stats[2] is None:
+                    stats[2] = start
+
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def records(self) -> List[Dict[str, Any]]:
+        """All events, aggregates last (tid 0)"""
+        records = list(self.events)
+        for name, (calls, total, first) in self.aggregates.items():
+            if calls:
+                records.append({
+                    'name': name,
+                    'cat': 'aggregate',
+                    'ph': 'X',
+                    'ts': self._ts(first),
+                    'dur': round(total * 1e6, 1),
+                    'pid': self.pid,
+                    'tid': 0,
+                    'args': {'calls': calls},
+                })
+        return records
+
+    def flush(self):
+        """Append events to the trace file (and print the report if asked)"""
+        records = self.records()
+        self.events = []
+        self.aggregates = {}
+        if not records:
+            return
+
+        chrome = self.path.suffix == '.json'
+        if chrome:
+            records.insert(0, {
+                'name': 'process_name', 'ph': 'M', 'pid': self.pid,
+                'args': {'name': self.process_name},
+            })
+        else:
+            for record in records:
+                record['process'] = self.process_name
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                # Chrome's array format allows a missing ']' and a trailing
+                # comma, so events can be appended by several processes
+                if chrome and f.tell() == 0:
+                    f.write('[\n')
+                suffix = ',\n' if chrome else '\n'
+                f.write(''.join(json.dumps(record) + suffix for record in records))
+        except OSError as e:
+            print(f"Warning: could not write trace {self.path}: {e}", file=sys.stderr)
+            return
+
+        if self.report:
+            wall = time.perf_counter() - self._perf0
+            print(format_report(records, wall), file=sys.stderr)
+            print(f"Trace written to {self.path}", file=sys.stderr)
+
+
+def format_report(records: List[Dict[str, Any]], wall: Optional[float] = None) -> str:
+    """Summarize events by name: calls, total and mean time"""
+    totals: Dict[str, List[float]] = {}
+    for record in records:
+        if record.get('ph') != 'X':
+            continue
+        entry = totals.setdefault(record['name'], [0, 0.0])
+        entry[0] += record['args'].get('calls', 1)
+        entry[1] += record['dur'] / 1000
+
+    lines = [f"{'phase':<32} {'calls':>7} {'total ms':>10} {'mean ms':>9}"]
+    for name, (calls, total) in sorted(totals.items(), key=lambda item: -item[1][1]):
+        lines.append(f"{name:<32} {calls:>7} {total:>10.2f} {total / calls:>9.3f}")
+    if wall is not None:
+        lines.append(f"{'wall':<32} {'':>7} {wall * 1000:>10.2f}")
+    return '\n'.join(lines)
+
+
+_tracer: Optional[Tracer] = None
+_configured = False
+
+
+def configure(process_name: str, profile: bool = False) -> Optional[Tracer]:
+    """
+    Set up tracing for this process
+
+    Args:
+        process_name: Label for events (usually the script name)
+        profile: Enable even without KEEP_TRACE (writes to the default
+            path) and print a report to stderr at exit
+
+    Returns:
+        The tracer, or None when tracing is off
+    """
+    global _tracer, _configured
+    _configured = True
+    path = os.environ.get('KEEP_TRACE')
+    if not path and not profile:
+        return _tracer
+
+    if _tracer is None:
+        from pathlib import Path
+
+        _tracer = Tracer(Path(path) if path else default_trace_path(), process_name, profile)
+        atexit.register(_tracer.flush)
+    else:
+        _tracer.process_name = process_name
+        _tracer.report = _tracer.report or profile
+    return _tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    """The active tracer, or None (KEEP_TRACE is checked on first use)"""
+    if not _configured:
+        configure(os.path.splitext(os.path.basename(sys.argv[0]))[0] or 'python')
+    return _tracer
+
+
+def span(name: str, cat: str = 'keep', **args: Any) -> ContextManager[Any]:
+    """Time a block when tracing is on; a shared no-op otherwise"""
+    tracer = get_tracer()
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, cat, **args)
+
+
+def read_trace(path: str) -> List[Dict[str, Any]]:
+    """Load events from either trace format"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    if path.endswith('.json'):
+        text = text.strip().rstrip(',').rstrip(']')
+        return json.loads(text + ']') if text else []
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Keep timing traces')
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+    report_parser = subparsers.add_parser('report', help='Summarize a trace file')
+    report_parser.add_argument('path', nargs='?', help='Trace file (default: KEEP_TRACE or default path)')
+    args = parser.parse_args()
+
+    if args.command == 'report':
+        path = args.path or os.environ.get('KEEP_TRACE') or str(default_trace_path())
+        try:
+            records = read_trace(path)
+        except (OSError, ValueError) as e:
+            print(f"Error: could not read trace {path}: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(format_report(records))
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Multi-repository recommendations for Keep
+
+`score_issues.py --repos owner/a,owner/b` ranks the open backlogs of
+several repositories against one state.md:
+
+1. Fetch: every repository's open issues are paged in concurrently
+   (github_ops.iter_issue_pages, one thread per repository) and spooled
+   to a temporary file, so bodies don't accumulate in this process.
+   Blocker references are collected on the way.
+2. Resolve: blockers that aren't among the fetched open issues, in the
+   same repository or written owner/repo#N, are looked up with batched
+   GraphQL (github_ops.resolve_issue_states).
+3. Score: each repository is a shard, scored in a process pool sized to
+   the available cores. A shard returns its results in ranking order,
+   only the top N when a limit is given.
+4. Merge: the shard rankings are merged into one (score, then issue
+   number, then repository) and cut to the top N.
+
+Results carry a `repo` key. A bare #N in state.md names an issue of the
+first repository; the others' issues are written owner/repo#N there
+(see shard_recent_issues). The score memo and text index are keyed by
+issue number alone, so shards don't use them.
+"""
+
+import heapq
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from blockers import blocker_ref, parse_blockers, split_blocker_ref
+from json_stream import iter_json_issues, write_json_list
+from scoring import (
+    blocker_cycles, build_issue_index, compact_issues, parse_state_file, rank_all_issues, score_issue,
+)
+
+# Fields a shard needs (no createdAt/url)
+SHARD_FIELDS = 'number,title,body,labels,state,updatedAt'
+
+# Repositories fetched at once
+FETCH_CONCURRENCY = 4
+
+
+def available_cores() -> int:
+    """CPUs this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:  # macOS, Windows
+        return os.cpu_count() or 1
+
+
+def parse_repos(value: str) -> List[str]:
+    """
+    Split a comma-separated 'owner/repo' list
+
+    Returns:
+        Lowercased repositories without duplicates, in the given order
+
+    Raises:
+        ValueError: If an entry isn't of the form owner/repo
+    """
+    repos = []
+    for repo in value.split(','):
+        repo = repo.strip().lower()
+        if not repo:
+            continue
+        owner, _, name = repo.partition('/')
+        if not owner or not name or '/' in name or '#' in repo:
+            raise ValueError(f"expected owner/repo, got {repo!r}")
+        repos.append(repo)
+    return list(dict.fromkeys(repos))
+
+
+def qualify(repo: str, ref: str) -> str:
+    """A blocker ref written in `repo`, as owner/repo#N"""
+    target, number = split_blocker_ref(ref)
+    return blocker_ref(target or repo, number)
+
+
+def fetch_backlog(repo: str, path: Path) -> Tuple[Set[str], Set[str]]:
+    """
+    Spool a repository's open issues to `path` as a JSON array
+
+    Returns:
+        (open issue numbers, qualified refs of the blockers they name)
+    """
+    from github_ops import iter_issue_pages
+
+    present: Set[str] = set()
+    refs: Set[str] = set()
+
+    def issues():
+        for page in iter_issue_pages('open', SHARD_FIELDS, repo=repo):
+            for issue in page:
+                present.add(str(issue['number']))
+                refs.update(qualify(repo, ref) for ref in parse_blockers(issue.get('body') or ''))
+                yield issue
+
+    with open(path, 'w') as f:
+        write_json_list(issues(), f)
+    return present, refs
+
+
+def resolve_blocker_states(backlogs: Dict[str, Tuple[Set[str], Set[str]]]) -> Dict[str, str]:
+    """
+    States of every blocker the backlogs reference
+
+    Blockers among the fetched open issues are OPEN; the rest are asked
+    of GitHub in batches.
+
+    Returns:
+        Qualified ref -> state (refs GitHub doesn't know are omitted)
+    """
+    from github_ops import resolve_issue_states
+
+    states: Dict[str, str] = {}
+    unresolved = []
+    for present, refs in backlogs.values():
+        for ref in refs:
+            target, number = split_blocker_ref(ref)
+            if target in backlogs and number in backlogs[target][0]:
+                states[ref] = 'OPEN'
+            else:
+                unresolved.append(ref)
+    states.update(resolve_issue_states(unresolved))
+    return states
+
+
+def shard_states(repo: str, states: Dict[str, str]) -> Dict[str, str]:
+    """Blocker states as a shard's index keys them: bare numbers for its own issues"""
+    prefix = f'{repo}#'
+    return {
+        ref[len(prefix):] if ref.startswith(prefix) else ref: state
+        for ref, state in states.items()
+    }
+
+
+def shard_recent_issues(recent_work: str, repo: str, primary: str) -> List[str]:
+    """
+    The recent issues of state.md that belong to `repo`, as bare numbers
+
+    A bare #N names an issue of the primary repository, so it doesn't
+    boost issue N of every other one; owner/repo#N names an issue of
+    that repository.
+    """
+    from state_file import load_state
+
+    state = load_state(recent_work)
+    numbers: Dict[str, None] = {}
+    for ref in (state or {}).get('repo_issue_refs', []):
+        target, number = split_blocker_ref(ref)
+        if (target or primary) == repo:
+            numbers[number] = None
+    return list(numbers)
+
+
+def score_shard(
+    repo: str,
+    path: str,
+    recent_work: str,
+    top_n: Optional[int],
+    known_states: Dict[str, str],
+    engine: str,
+    primary: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], List[List[str]]]:
+    """
+    Score one repository's spooled backlog (runs in a worker process)
+
+    Args:
+        primary: Repository bare #N in state.md refers to (default: `repo`)
+
+    Returns:
+        (results in ranking order with `repo` set, blocker cycles)
+    """
+    context = parse_state_file(recent_work)
+    context['recent_issues'] = shard_recent_issues(recent_work, repo, primary or repo)
+    prefix = f'{repo}#'
+    with open(path) as f:
+        records = list(compact_issues(iter_json_issues(f), context))
+    for record in records:
+        # owner/repo#N naming this repository is the same as #N
+        if any(prefix in ref for ref in record.blockers):
+            record.blockers = tuple(dict.fromkeys(
+                ref[len(prefix):] if ref.startswith(prefix) else ref for ref in record.blockers
+            ))
+
+    issue_index = build_issue_index(records, known_states)
+    ranked = rank_all_issues(records, context, issue_index, top_n, engine)
+    results = [score_issue(issue, context, records, issue_index) for issue in ranked]
+    for result in results:
+        result['repo'] = repo
+    return results, blocker_cycles(issue_index)
+
+
+def merge_rankings(rankings: List[List[Dict[str, Any]]], top_n: Optional[int]) -> List[Dict[str, Any]]:
+    """Merge per-repository rankings into one (score, issue number, repository)"""
+    merged = heapq.merge(
+        *rankings,
+        key=lambda result: (-result['total_score'], int(result['number']), result['repo'])
+    )
+    return list(islice(merged, top_n) if top_n is not None else merged)
+
+
+def score_repos(
+    repos: List[str],
+    recent_work: str,
+    top_n: Optional[int] = None,
+    engine: str = 'auto',
+    workers: Optional[int] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, List[List[str]]]]:
+    """
+    Fetch, score and merge the open backlogs of several repositories
+
+    Args:
+        repos: 'owner/repo' names (see parse_repos); bare #N in state.md
+            refers to the first
+        recent_work: Path to state.md, shared by every repository
+        top_n: Only return the best N overall (None for all)
+        engine: Scoring engine for each shard (see rank_all_issues)
+        workers: Scoring processes (default: available cores, at most
+            one per repository)
+
+    Returns:
+        (merged results, blocker cycles by repository)
+
+    Raises:
+        GitHubError: If a backlog can't be fetched
+    """
+    from keep_trace import span
+
+    with tempfile.TemporaryDirectory(prefix='keep-repos-') as tmp:
+        paths = {repo: str(Path(tmp) / f'{i}.json') for i, repo in enumerate(repos)}
+
+        with span('repos.fetch', repos=len(repos)):
+            with ThreadPoolExecutor(max_workers=max(1, min(FETCH_CONCURRENCY, len(repos)))) as pool:
+                futures = {repo: pool.submit(fetch_backlog, repo, Path(paths[repo])) for repo in repos}
+                backlogs = {repo: future.result() for repo, future in futures.items()}
+
+        with span('repos.resolve'):
+            states = resolve_blocker_states(backlogs)
+
+        workers = max(1, min(workers or available_cores(), len(repos)))
+        jobs = [
+            (repo, paths[repo], recent_work, top_n, shard_states(repo, states), engine, repos[0])
+            for repo in repos
+        ]
+        with span('repos.score', workers=workers):
+            if workers == 1:
+                shards = [score_shard(*job) for job in jobs]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    shards = list(pool.map(score_shard, *zip(*jobs)))
+
+    with span('repos.merge'):
+        merged = merge_rankings([results for results, _ in shards], top_n)
+    return merged, {repo: cycles for repo, (_, cycles) in zip(repos, shards) if cycles}
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Rate-limit-aware request scheduling for Keep
+
+Keeps an estimate of the remaining GitHub API budget per resource
+(graphql, core, search) in a small state file shared by every Keep
+process for the user, since the limit belongs to the token, not the
+project. Before each request the scheduler spends one unit of budget:
+
+- Plenty left: no delay
+- Below PACE_THRESHOLD of the limit: requests are spaced so the rest of
+  the budget lasts until the reset time (a shared token bucket)
+- Exhausted: wait until the reset time, or fail fast if that is further
+  away than the allowed wait
+
+The estimate is refreshed from `gh api rate_limit` (which is free) when
+it is unknown, running low, or after GitHub reports a rate limit.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+
+# Start pacing once this fraction of the budget is left
+PACE_THRESHOLD = 0.1
+
+# Longest proactive wait before giving up with a rate limit error (seconds)
+DEFAULT_MAX_WAIT = 60
+
+# Minimum seconds between `gh api rate_limit` refreshes
+REFRESH_INTERVAL = 30
+
+# Assumed window length when a reset time has passed without a refresh
+WINDOW_SECONDS = 3600
+
+
+class BudgetExhausted(Exception):
+    """Raised when waiting for the budget would exceed the allowed wait"""
+
+    def __init__(self, resource: str, reset: float):
+        self.resource = resource
+        self.reset = reset
+        reset_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(reset))
+        super().__init__(f"{resource} budget exhausted until {reset_at}")
+
+
+def state_path() -> Path:
+    """Shared budget file (KEEP_RATE_LIMIT_STATE overrides)"""
+    override = os.environ.get('KEEP_RATE_LIMIT_STATE')
+    if override:
+        return Path(override)
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(cache_home) / 'keep' / 'rate_limit.json'
+
+
+def request_resource(args: List[str]) -> str:
+    """
+    Guess which rate limit bucket a gh invocation draws from
+
+    `gh api <path>` uses REST (core); `gh api graphql` and the issue,
+    label and repo commands use GraphQL.
+    """
+    if args[:1] == ['api'] and args[1:2] != ['graphql']:
+        return 'search' if args[1:2] and args[1].startswith('search/') else 'core'
+    return 'graphql'
+
+
+def fetch_rate_limits() -> Optional[Dict[str, Dict[str, float]]]:
+    """
+    Query `gh api rate_limit`
+
+    Returns:
+        Dict of resource -> {limit, remaining, reset}, or None on failure
+    """
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            ['gh', 'api', 'rate_limit'],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=10
+        )
+        resources = json.loads(result.stdout)['resources']
+    except (subprocess.SubprocessError, OSError, ValueError, KeyError, TypeError):
+        return None
+
+    return {
+        name: {
+            'limit': data['limit'],
+            'remaining': data['remaining'],
+            'reset': data['reset'],
+        }
+        for name, data in resources.items()
+        if isinstance(data, dict) and {'limit', 'remaining', 'reset'} <= data.keys()
+    }
+
+
+class RateLimitScheduler:
+    """Token-bucket pacing over a budget shared through a state file"""
+
+    def __init__(self, path: Path, max_wait: float = DEFAULT_MAX_WAIT):
+        self.path = path
+        self.max_wait = max_wait
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def _state(self) -> Iterator[Dict[str, Any]]:
+        """Load the state under an exclusive lock and save it afterwards"""
+        with self._thread_lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path.with_suffix('.lock'), 'w') as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    state = json.loads(self.path.read_text())
+                    if not isinstance(state, dict):
+                        state = {}
+                except (OSError, ValueError):
+                    state = {}
+
+                yield state
+
+                tmp = self.path.with_suffix('.tmp')
+                tmp.write_text(json.dumps(state))
+                tmp.replace(self.path)
+
+    def _refresh(self, state: Dict[str, Any], now: float, force: bool = False) -> bool:
+        """Update budgets from GitHub (throttled unless forced)"""
+        if not force and now - state.get('refreshed', 0) < REFRESH_INTERVAL:
+            return False
+        state['refreshed'] = now
+        limits = fetch_rate_limits()
+        if limits is None:
+            return False
+        buckets = state.setdefault('buckets', {})
+        for name, data in limits.items():
+            bucket = buckets.setdefault(name, {})
+            bucket.update(data)
+        return True
+
+    def acquire(self, resource: str = 'graphql', cost: int = 1) -> float:
+        """
+        Reserve budget for one request, sleeping if pacing requires it
+
+        Args:
+            resource: Rate limit bucket (see request_resource)
+            cost: Units of budget the request consumes
+
+        Returns:
+            Seconds slept
+
+        Raises:
+            BudgetExhausted: If the required wait exceeds max_wait
+        """
+        with self._state() as state:
+            now = time.time()
+            bucket = state.get('buckets', {}).get(resource)
+
+            if bucket is not None and now >= bucket['reset']:
+                # Window rolled over since we last looked
+                bucket['remaining'] = bucket['limit']
+                bucket['reset'] = now + WINDOW_SECONDS
+                bucket.pop('next_at', None)
+
+            if bucket is None or bucket['remaining'] < bucket['limit'] * PACE_THRESHOLD:
+                self._refresh(state, now)
+                bucket = state.get('buckets', {}).get(resource)
+            if bucket is None:
+                return 0.0
+
+            wait = 0.0
+            if bucket['remaining'] < cost:
+                wait = bucket['reset'] - now
+                if wait > self.max_wait:
+                    raise BudgetExhausted(resource, bucket['reset'])
+                bucket['remaining'] = bucket['limit']
+                bucket['reset'] = bucket['reset'] + WINDOW_SECONDS
+            elif bucket['remaining'] < bucket['limit'] * PACE_THRESHOLD:
+                # Spread what's left evenly over the rest of the window
+                interval = max(0.0, bucket['reset'] - now) / bucket['remaining']
+                start = max(now, bucket.get('next_at', 0))
+                wait = start - now
+                if wait > self.max_wait:
+                    raise BudgetExhausted(resource, bucket['reset'])
+                bucket['next_at'] = start + interval
+
+            bucket['remaining'] -= cost
+
+        if wait > 0:
+            print(f"Rate limit budget low, waiting {wait:.1f}s...", file=sys.stderr)
+            time.sleep(wait)
+        return wait
+
+    def record(self, resource: str, limit: int, remaining: int, reset: float):
+        """
+        Update a budget from observed response headers
+
+        Used by the in-process HTTP backend, which sees X-RateLimit-*
+        headers on every response.
+        """
+        with self._state() as state:
+            bucket = state.setdefault('buckets', {}).setdefault(resource, {})
+            if bucket.get('reset') != reset:
+                bucket.pop('next_at', None)
+            bucket.update({'limit': limit, 'remaining': remaining, 'reset': reset})
+
+    def on_rate_limited(self, resource: str = 'graphql') -> Optional[float]:
+        """
+        Record a rate limit response from GitHub
+
+        Returns:
+            Seconds until the budget resets, or None if GitHub still
+            reports budget left (a secondary limit - caller should back off)
+        """
+        with self._state() as state:
+            now = time.time()
+            self._refresh(state, now, force=True)
+            bucket = state.get('buckets', {}).get(resource)
+            if bucket is None or bucket['remaining'] > 0:
+                return None
+            return max(0.0, bucket['reset'] - now) + 1
+
+    def snapshot(self, refresh: bool = False) -> Dict[str, Any]:
+        """Return the current budget state (optionally refreshed first)"""
+        with self._state() as state:
+            if refresh:
+                self._refresh(state, time.time(), force=True)
+            return json.loads(json.dumps(state))
+
+
+_scheduler: Optional[RateLimitScheduler] = None
+
+
+def get_scheduler() -> Optional[RateLimitScheduler]:
+    """
+    Return the process-wide scheduler
+
+    Returns:
+        RateLimitScheduler, or None when KEEP_RATE_LIMIT=off
+    """
+    global _scheduler
+
+    if os.environ.get('KEEP_RATE_LIMIT', '').lower() in ('off', '0', 'false'):
+        return None
+    if _scheduler is None:
+        try:
+            max_wait = float(os.environ.get('KEEP_RATE_LIMIT_MAX_WAIT', DEFAULT_MAX_WAIT))
+        except ValueError:
+            max_wait = DEFAULT_MAX_WAIT
+        _scheduler = RateLimitScheduler(state_path(), max_wait)
+    return _scheduler
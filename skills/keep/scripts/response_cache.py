@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Conditional-request cache for GitHub REST reads
+
+SQLite store under .claude/cache/ holding the last response body for
+each read endpoint together with its validators (ETag, Last-Modified).
+github_sync sends them back as If-None-Match / If-Modified-Since, and
+when GitHub answers 304 Not Modified the stored body is served instead.
+304 responses don't count against the primary rate limit, so repeated
+lookups of unchanged issues, labels, milestones and repository details
+cost a round trip but no budget and no download.
+
+Entries are evicted least recently used once their bodies exceed the
+size bound (KEEP_RESPONSE_CACHE_MAX bytes). Hits (304s served from the
+cache), misses (full responses) and evictions are counted; see
+`github_sync.py response-cache`.
+
+The cache is only used inside Keep projects (where `.claude/` exists).
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+
+DEFAULT_RESPONSE_CACHE_PATH = '.claude/cache/responses.db'
+
+# Total body bytes kept before least recently used entries are evicted
+DEFAULT_MAX_BYTES = 8 * 2 ** 20
+
+COUNTERS = ('hits', 'misses', 'evictions')
+
+
+def response_cache_path() -> Optional[Path]:
+    """
+    Resolve the cache file location
+
+    Returns:
+        Path from KEEP_RESPONSE_CACHE (`off` disables), else
+        .claude/cache/responses.db when .claude/ exists, else None
+    """
+    override = os.environ.get('KEEP_RESPONSE_CACHE')
+    if override:
+        if override.lower() in ('off', '0', 'false'):
+            return None
+        return Path(override)
+    if Path('.claude').is_dir():
+        return Path(DEFAULT_RESPONSE_CACHE_PATH)
+    return None
+
+
+def max_cache_bytes() -> int:
+    """Size bound in bytes (KEEP_RESPONSE_CACHE_MAX overrides the default)"""
+    try:
+        return int(os.environ.get('KEEP_RESPONSE_CACHE_MAX', DEFAULT_MAX_BYTES))
+    except ValueError:
+        return DEFAULT_MAX_BYTES
+
+
+def response_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Cache key for a GET of `endpoint` with query `params` (order-insensitive)"""
+    if not params:
+        return endpoint
+    return f'{endpoint}?{urlencode(sorted(params.items()))}'
+
+
+class ResponseCache:
+    """SQLite-backed LRU store of REST response bodies and their validators"""
+
+    def __init__(self, path: Path, max_bytes: Optional[int] = None):
+        # Imported on open: scripts that only check for a cache stay light
+        import sqlite3
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_cache_bytes() if max_bytes is None else max_bytes
+        # Concurrent fetches (fetch_issues) write from several processes or threads
+        self.conn = sqlite3.connect(str(path), timeout=10)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                used_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at);
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _count(self, name: str, n: int = 1):
+        self.conn.execute(
+            'INSERT INTO counters (name, value) VALUES (?, ?) '
+            'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+            (name, n)
+        )
+
+    def validators(self, key: str) -> Dict[str, str]:
+        """
+        Conditional request headers for a cached response
+
+        Returns:
+            If-None-Match / If-Modified-Since headers, or {} when nothing
+            usable is cached
+        """
+        row = self.conn.execute(
+            'SELECT etag, last_modified FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return {}
+        headers = {}
+        if row[0]:
+            headers['If-None-Match'] = row[0]
+        if row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def hit(self, key: str) -> Tuple[bool, Any]:
+        """
+        Serve the cached body after a 304 Not Modified
+
+        Returns:
+            (True, parsed body), or (False, None) if the entry was evicted
+            since validators() was read (the caller must refetch)
+        """
+        with self.conn:
+            row = self.conn.execute('SELECT body FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return False, None
+            self.conn.execute('UPDATE responses SET used_at = ? WHERE key = ?', (time.time(), key))
+            self._count('hits')
+        return True, json.loads(row[0])
+
+    def store(self, key: str, headers: Dict[str, str], data: Any):
+        """
+        Record a full (200) response and evict down to the size bound
+
+        Args:
+            key: response_key() of the request
+            headers: Lowercased response headers
+            data: Parsed response body
+        """
+        etag = headers.get('etag')
+        last_modified = headers.get('last-modified')
+        with self.conn:
+            self._count('misses')
+            if not etag and not last_modified:
+                # Nothing to revalidate with; keeping the body would never pay off
+                self.conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                return
+            body = json.dumps(data)
+            self.conn.execute(
+                'INSERT OR REPLACE INTO responses (key, etag, last_modified, body, size, used_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, etag, last_modified, body, len(body), time.time())
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in self.conn.execute('SELECT key, size FROM responses ORDER BY used_at'):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self.conn.executemany('DELETE FROM responses WHERE key = ?', evicted)
+        self._count('evictions', len(evicted))
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count, stored bytes, size bound and hit/miss/eviction counters"""
+        entries, stored = self.conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+        ).fetchone()
+        counters = dict.fromkeys(COUNTERS, 0)
+        counters.update(self.conn.execute('SELECT name, value FROM counters'))
+        lookups = counters['hits'] + counters['misses']
+        return {
+            'entries': entries,
+            'bytes': stored,
+            'max_bytes': self.max_bytes,
+            **counters,
+            'hit_rate': round(counters['hits'] / lookups, 3) if lookups else None,
+        }
+
+    def clear(self, counters: bool = True):
+        """Drop every entry (and, by default, reset the counters)"""
+        with self.conn:
+            self.conn.execute('DELETE FROM responses')
+            if counters:
+                self.conn.execute('DELETE FROM counters')
+
+
+def open_response_cache() -> Optional[ResponseCache]:
+    """
+    Open the project response cache
+
+    Returns:
+        ResponseCache, or None when caching is disabled or the file is unusable
+    """
+    path = response_cache_path()
+    if path is None:
+        return None
+    import sqlite3
+
+    try:
+        return ResponseCache(path)
+    except (sqlite3.Error, OSError):
+        return None
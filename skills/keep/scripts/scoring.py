@@ -0,0 +1,1741 @@
+#!/usr/bin/env python3
+"""
+Issue scoring algorithm for Keep
+
+Scores open issues based on:
+- Continuity (30%): Same area as recent work
+- Priority (30%): Labels indicating urgency
+- Freshness (20%): Recent activity
+- Dependencies (20%): Blockers cleared
+
+Usage:
+    python score_issues.py --recent-work .claude/state.md [--issues issues.json]
+    python score_issues.py --stream --top 5 < issues.jsonl
+    python score_issues.py --engine numpy --issues issues.json  (NumPy optional)
+    python score_issues.py --repos owner/a,owner/b  (see multi_repo.py)
+    python score_issues.py --snapshot issues.snap  (see snapshot.py)
+    python score_issues.py --profile ...  (timing report, see keep_trace.py)
+
+score_issues.py is the CLI entry point; it re-exports this module.
+"""
+
+import heapq
+import io
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Mapping, Optional, TextIO, Tuple, Any
+
+from blocker_graph import analyze_blocker_graph
+from blockers import load_blocker_memo, parse_blockers, save_blocker_memo
+from issue_record import (
+    EPOCH, ONE_DAY_US, ONE_US, PRIORITY_LEVELS, STATE_NAMES, STATE_OPEN, UPDATED_INVALID, UPDATED_MISSING,
+    IssueRecord, compact_issue,
+)
+from json_stream import iter_json_issues, write_json_list
+
+if TYPE_CHECKING:
+    # Loaded where they're used: the state file, issue cache, daemon,
+    # tracer and text index are each off some runs' paths
+    from keep_trace import Tracer
+    from snapshot import Snapshot
+    from text_index import TextIndex
+
+
+# Smallest backlog where the NumPy engine is picked automatically
+VECTORIZE_MIN_ISSUES = 1000
+
+DEFAULT_SCORE_MEMO_PATH = '.claude/cache/scores.json'
+
+# Smaller inputs are scored without the persisted memos: loading them
+# (and hashing every issue) costs more than rescanning a few hundred
+MEMO_MIN_INPUT_BYTES = 128 * 1024
+
+# Bump when scoring rules change so persisted components are discarded
+SCORE_MEMO_VERSION = 2
+
+# Weight distribution for scoring
+WEIGHT_CONTINUITY = 0.30
+WEIGHT_PRIORITY = 0.30
+WEIGHT_FRESHNESS = 0.20
+WEIGHT_DEPENDENCY = 0.20
+
+# Dependency penalties: per open direct blocker, per further open level
+DIRECT_BLOCKER_PENALTY = 25
+TRANSITIVE_BLOCKER_PENALTY = 15
+
+# Added to the total per open issue waiting on this one (capped)
+UNBLOCK_BONUS = 2.0
+UNBLOCK_BONUS_MAX = 10.0
+
+# Issues most similar to recent work (see similar_issues) that earn the
+# continuity "similar tech" points, and how close to the best match they
+# must score
+SIMILAR_ISSUES = 10
+SIMILARITY_MIN_RATIO = 0.5
+
+
+def parse_state_file(state_path: str) -> Dict[str, Any]:
+    """
+    Parse .claude/state.md to extract recent work context
+
+    Returns dict with:
+    - recent_directories: Directories from "Working primarily in" lines
+    - recent_labels: Explicit **Labels:** plus labels of the active,
+      recent and related issues found in the local issue cache
+    - recent_issues: Issue numbers referenced anywhere in the file
+    - recent_text: Text of the active and recent work (see
+      recent_work_text), matched against issues by similar_issues
+    - work_issues: Active, recent and related issue numbers
+
+    Lists keep the order of first appearance.
+    """
+    from state_file import load_state, work_issue_numbers
+
+    state = load_state(state_path)
+    if state is None:
+        return {
+            'recent_directories': [],
+            'recent_labels': [],
+            'recent_issues': [],
+            'recent_text': '',
+            'work_issues': []
+        }
+
+    labels = dict.fromkeys(state['labels'])
+    numbers = work_issue_numbers(state)
+    if numbers:
+        from issue_cache import IssueCache, cache_path
+
+        path = cache_path()
+        # Only read an existing cache; never create one (or hit GitHub) here
+        if path is not None and path.exists():
+            with IssueCache(path) as cache:
+                for number in numbers:
+                    issue = cache.get(number)
+                    for label in (issue or {}).get('labels', []):
+                        labels[label['name']] = None
+
+    return {
+        'recent_directories': state['directories'],
+        'recent_labels': list(labels),
+        'recent_issues': state['issue_refs'],
+        'recent_text': recent_work_text(state, Path(state_path).parent),
+        'work_issues': numbers
+    }
+
+
+def recent_work_text(state: Dict[str, Any], claude_dir: Path) -> str:
+    """
+    Free text describing the active and recent work
+
+    The active issue's title, progress, next steps and open questions,
+    recent issue titles, blockers and context notes from state.md, plus
+    the active issue's work file (.claude/work/{issue}.md) if present.
+    """
+    parts = []
+    active = state.get('active_work') or {}
+    parts.append(active.get('issue_title') or '')
+    parts.extend(item['text'] for item in active.get('progress_items', []))
+    parts.extend(active.get('next_steps', []))
+    parts.extend(question['question'] for question in active.get('open_questions', []))
+    parts.extend(recent.get('title') or '' for recent in state.get('recent_work', []))
+    parts.extend(state.get('blockers', []))
+    parts.extend(state.get('context', {}).get('notes', []))
+
+    if active.get('issue_number') is not None:
+        try:
+            parts.append((claude_dir / 'work' / f"{active['issue_number']}.md").read_text(encoding='utf-8'))
+        except (OSError, UnicodeDecodeError):
+            pass
+    return '\n'.join(part for part in parts if part)
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Build a regex matching any of `words`, longest first, as a trie
+
+    Shared prefixes are factored out (e.g. src/(?:api|auth)), so each text
+    position costs a single branch check instead of one per word.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if terminal else group
+
+    return build(trie)
+
+
+class ContinuityMatcher:
+    """
+    Matches recent directories and issue references against issue text
+
+    Built once per context. All patterns are compiled into one trie regex,
+    so each issue's text is scanned once regardless of how many recent
+    directories and issues there are. Semantics match plain substring
+    checks: the first directory (in context order) contained in the
+    lowercased title + body, and the first recent issue whose `#N`
+    appears in the body.
+    """
+
+    _DIRECTORY = 0
+    _ISSUE = 1
+
+    def __init__(self, directories: Tuple[str, ...], recent_issues: Tuple[str, ...]):
+        self.directories = directories
+        self.recent_issues = recent_issues
+
+        hits: Dict[str, List[Tuple[int, int]]] = {}
+        for i, directory in enumerate(directories):
+            hits.setdefault(directory.lower(), []).append((self._DIRECTORY, i))
+        # Non-numeric refs are case-sensitive, so they can't be matched
+        # against lowercased text; check those with a plain substring test
+        self.literal_refs: List[Tuple[int, str]] = []
+        for i, recent_issue in enumerate(recent_issues):
+            if recent_issue.isdigit() and recent_issue.isascii():
+                hits.setdefault(f'#{recent_issue}', []).append((self._ISSUE, i))
+            else:
+                self.literal_refs.append((i, f'#{recent_issue}'))
+
+        # The empty string is contained in any text
+        self.always = hits.pop('', [])
+
+        # A regex match yields the longest pattern at a position; every
+        # pattern that is a prefix of it matches there too
+        self.prefix_hits: Dict[str, List[Tuple[int, int]]] = {}
+        for pattern in hits:
+            self.prefix_hits[pattern] = [
+                hit
+                for end in range(1, len(pattern) + 1)
+                for hit in hits.get(pattern[:end], [])
+            ]
+
+        self.regex = re.compile(_trie_pattern(hits)) if hits else None
+
+    def match(self, title: str, body: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Scan an issue once
+
+        Returns:
+            (first matching directory, first referenced recent issue),
+            either None if absent
+        """
+        best = [len(self.directories), len(self.recent_issues)]
+        for kind, i in self.always:
+            best[kind] = min(best[kind], i)
+        for i, ref in self.literal_refs:
+            if i < best[1] and ref in body:
+                best[1] = i
+
+        if self.regex is not None:
+            text = f"{title} {body}".lower()
+            body_start = len(f"{title} ".lower())
+            pos = 0
+            while best[0] or best[1]:
+                m = self.regex.search(text, pos)
+                if m is None:
+                    break
+                start = m.start()
+                for kind, i in self.prefix_hits[m.group()]:
+                    # Issue references only count in the body
+                    if kind == self._DIRECTORY or start >= body_start:
+                        best[kind] = min(best[kind], i)
+                # Next search may start inside this match (overlaps)
+                pos = start + 1
+
+        directory = self.directories[best[0]] if best[0] < len(self.directories) else None
+        recent_issue = self.recent_issues[best[1]] if best[1] < len(self.recent_issues) else None
+        return directory, recent_issue
+
+
+@lru_cache(maxsize=8)
+def continuity_matcher(
+    directories: Tuple[str, ...],
+    recent_issues: Tuple[str, ...]
+) -> ContinuityMatcher:
+    """Build (or reuse) the matcher for a context's directories and issues"""
+    return ContinuityMatcher(directories, recent_issues)
+
+
+class ScoreMemo:
+    """
+    Persisted continuity scan results for incremental re-scoring
+
+    For each issue the memo keeps the continuity scan result (matched
+    directory and recent issue), valid while a hash of title + body and
+    of the context's directories and recent issues are unchanged. It is
+    consulted while issues are compacted (see compact_issues), the only
+    time bodies are available.
+
+    Everything else is cheap to recompute from the compact records.
+    Label overlap with recent work is applied on top of the stored scan,
+    so label-only context changes don't trigger rescans.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.used: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> 'ScoreMemo':
+        """Load the memo (missing, corrupt or outdated files start empty)"""
+        memo = cls(path)
+        if path is not None:
+            try:
+                data = json.loads(path.read_text())
+                if data.get('version') == SCORE_MEMO_VERSION:
+                    memo.entries = data['entries']
+            except (OSError, ValueError, AttributeError, KeyError):
+                pass
+        return memo
+
+    def save(self):
+        """Persist entries for issues seen this run (failures are ignored)"""
+        if self.path is None or not (self.dirty or len(self.used) != len(self.entries)):
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(
+                {'version': SCORE_MEMO_VERSION, 'entries': self.used},
+                separators=(',', ':')
+            ))
+            tmp.replace(self.path)
+        except OSError:
+            return
+        self.entries = self.used
+        self.used = {}
+        self.dirty = False
+
+    @staticmethod
+    def scan_key(context: Dict[str, Any]) -> str:
+        """Fingerprint of the context slice the continuity scan depends on"""
+        from hashlib import blake2b
+
+        slice_ = json.dumps([context['recent_directories'], context['recent_issues']])
+        return blake2b(slice_.encode('utf-8', 'surrogatepass'), digest_size=8).hexdigest()
+
+    def _entry(self, number: Any) -> Dict[str, Any]:
+        number = str(number)
+        entry = self.used.get(number)
+        if entry is None:
+            entry = self.entries.get(number)
+            if not isinstance(entry, dict):
+                entry = {}
+            self.used[number] = entry
+        return entry
+
+    def match(
+        self,
+        number: Any,
+        title: str,
+        body: str,
+        matcher: ContinuityMatcher,
+        scan_key: str
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """ContinuityMatcher.match, reusing the stored result if inputs are unchanged"""
+        from hashlib import blake2b
+
+        entry = self._entry(number)
+        content = blake2b(
+            f'{title}\0{body}'.encode('utf-8', 'surrogatepass'), digest_size=12
+        ).hexdigest()
+        if entry.get('content') == content and entry.get('scan') == scan_key:
+            directory, recent_issue = entry['match']
+            return directory, recent_issue
+
+        result = matcher.match(title, body)
+        entry.clear()
+        entry.update(content=content, scan=scan_key, match=list(result))
+        self.dirty = True
+        return result
+
+
+def score_memo_path() -> Optional[Path]:
+    """Persisted score memo location, or None outside a Keep project"""
+    if Path('.claude').is_dir():
+        return Path(DEFAULT_SCORE_MEMO_PATH)
+    return None
+
+
+def input_size(path: Optional[str]) -> Optional[int]:
+    """Byte size of the issues file (or of stdin redirected from one), None for pipes"""
+    import stat
+
+    try:
+        info = os.stat(path) if path else os.fstat(sys.stdin.fileno())
+    except (OSError, ValueError):
+        return None
+    return info.st_size if stat.S_ISREG(info.st_mode) else None
+
+
+def compact_issues(
+    issues: Iterable[Any],
+    context: Dict[str, Any],
+    memo: Optional[ScoreMemo] = None,
+    text_index: Optional['TextIndex'] = None
+) -> Iterator[IssueRecord]:
+    """
+    Reduce issue dicts to IssueRecords, one at a time
+
+    Each body is scanned here (continuity match and blocker references)
+    and not kept, so feeding this from iter_json_issues never holds more
+    than one full issue. Records in `issues` are passed through.
+
+    Args:
+        issues: Issue dicts (any iterable, consumed once) or records
+        context: Context dict from parse_state_file
+        memo: Stored continuity scans to reuse (see ScoreMemo)
+        text_index: Index to bring up to date (issues whose `updatedAt`
+            changed are re-indexed while their bodies are at hand)
+
+    Yields:
+        One record per issue, in input order
+    """
+    matcher = continuity_matcher(
+        tuple(context['recent_directories']),
+        tuple(context['recent_issues'])
+    )
+    scan_key = memo.scan_key(context) if memo is not None else None
+    if text_index is not None:
+        import sqlite3
+    for issue in issues:
+        if isinstance(issue, IssueRecord):
+            yield issue
+            continue
+        title = issue.get('title', '')
+        body = issue.get('body', '')
+        if memo is None:
+            match = matcher.match(title, body)
+        else:
+            match = memo.match(issue['number'], title, body, matcher, scan_key)
+        if text_index is not None and not text_index.failed:
+            try:
+                text_index.add(issue['number'], issue.get('updatedAt'), title, body)
+            except sqlite3.Error as e:
+                text_index_failed(text_index, e)
+        yield compact_issue(issue, match)
+    if text_index is not None and not text_index.failed:
+        try:
+            text_index.flush()
+        except sqlite3.Error as e:
+            text_index_failed(text_index, e)
+
+
+def text_index_failed(text_index: 'TextIndex', error: Exception):
+    """
+    Stop using a text index after a database error
+
+    Warns once. Scoring goes on without the similarity signal, and the
+    issues queued for indexing are dropped.
+    """
+    if not text_index.failed:
+        print(f"Warning: text index unavailable, scoring without similarity: {error}", file=sys.stderr)
+    text_index.failed = True
+
+
+def close_text_index(text_index: Optional['TextIndex']):
+    """Close a text index (if any), writing queued issues unless it has failed"""
+    if text_index is None:
+        return
+    import sqlite3
+
+    try:
+        text_index.close()
+    except sqlite3.Error as e:
+        text_index_failed(text_index, e)
+
+
+def similar_issues(
+    context: Dict[str, Any],
+    text_index: 'TextIndex',
+    candidates: Iterable[Any]
+) -> Dict[int, Tuple[str, ...]]:
+    """
+    Issues whose text is most like the recent work
+
+    Ranks `candidates` against context['recent_text'] with the index's
+    BM25 search, skipping the active, recent and related issues
+    themselves. Up to SIMILAR_ISSUES are kept, and only those scoring at
+    least SIMILARITY_MIN_RATIO of the best match.
+
+    Returns:
+        {issue number: shared terms, most telling first}
+    """
+    if not context.get('recent_text'):
+        return {}
+    hits = text_index.search(
+        context['recent_text'],
+        SIMILAR_ISSUES,
+        candidates=candidates,
+        exclude=context.get('work_issues', ())
+    )
+    if not hits:
+        return {}
+    threshold = hits[0][1] * SIMILARITY_MIN_RATIO
+    return {number: tuple(terms) for number, score, terms in hits if score >= threshold}
+
+
+def open_similarity_index(context: Dict[str, Any]) -> Optional['TextIndex']:
+    """
+    Open the text index if the context has recent work to match
+
+    Without recent work similar_issues never queries it, so the SQLite
+    file is left alone (issues changed meanwhile are indexed on a later
+    run, by `updatedAt`).
+    """
+    if not context.get('recent_text'):
+        return None
+    from text_index import open_text_index
+
+    return open_text_index()
+
+
+def with_similar_issues(
+    context: Dict[str, Any],
+    text_index: Optional['TextIndex'],
+    candidates: Iterable[Any]
+) -> Dict[str, Any]:
+    """Copy of `context` with `similar_issues` filled in (unchanged without a working index)"""
+    if text_index is None or text_index.failed:
+        return context
+    import sqlite3
+
+    from keep_trace import span
+
+    with span('score.similar'):
+        try:
+            return {**context, 'similar_issues': similar_issues(context, text_index, candidates)}
+        except sqlite3.Error as e:
+            text_index_failed(text_index, e)
+            return context
+
+
+def calculate_continuity_score(
+    issue: IssueRecord,
+    context: Dict[str, Any],
+    explain: bool = True
+) -> Tuple[float, str]:
+    """
+    Calculate continuity score (0-100)
+
+    Higher score for issues in same area as recent work. With
+    explain=False the rationale is skipped (returned as ''). The text
+    scan itself was done when the record was built (see compact_issues);
+    text similarity comes from context['similar_issues'] when set (see
+    with_similar_issues).
+    """
+    score = 0
+    reasons = []
+
+    directory, recent_issue = issue.match
+
+    # Check if issue mentions directories from recent work
+    if directory is not None:
+        score += 50
+        if explain:
+            reasons.append(f"mentions {directory}")
+
+    # Check for overlapping labels
+    issue_labels = set(issue.labels)
+    recent_labels = {label.lower() for label in context['recent_labels']}
+    overlap = issue_labels & recent_labels
+
+    if overlap:
+        score += 30
+        if explain:
+            reasons.append(f"related: {', '.join(overlap)}")
+
+    # Check if references recent issues, or reads like recent work
+    similar = context.get('similar_issues')
+    if recent_issue is not None:
+        score += 20
+        if explain:
+            reasons.append(f"references #{recent_issue}")
+    elif similar and int(issue.number) in similar:
+        score += 20
+        if explain:
+            reasons.append(f"similar to recent work: {', '.join(similar[int(issue.number)][:3])}")
+
+    if not explain:
+        return min(score, 100), ''
+
+    rationale = '; '.join(reasons) if reasons else 'no continuity'
+    return min(score, 100), rationale
+
+
+def calculate_priority_score(issue: IssueRecord) -> Tuple[float, str]:
+    """
+    Calculate priority score (0-100) from labels
+
+    The label rules live in issue_record.priority_code.
+    """
+    return PRIORITY_LEVELS[issue.priority]
+
+
+def calculate_freshness_score(
+    issue: IssueRecord,
+    explain: bool = True,
+    now: Optional[datetime] = None
+) -> Tuple[float, str]:
+    """
+    Calculate freshness score (0-100) based on last update
+
+    With explain=False the rationale is skipped (returned as '').
+    """
+    updated_us = issue.updated_us
+    if updated_us == UPDATED_MISSING:
+        return 50, 'unknown update time'
+    if updated_us == UPDATED_INVALID:
+        return 50, 'invalid update time'
+
+    now = now or datetime.now(timezone.utc)
+    days_ago = ((now - EPOCH) // ONE_US - updated_us) // ONE_DAY_US
+    reason = f'updated {days_ago}d ago' if explain else ''
+
+    if days_ago <= 7:
+        return 100, reason
+    elif days_ago <= 14:
+        return 75, reason
+    elif days_ago <= 30:
+        return 50, reason
+    else:
+        return 25, reason
+
+
+def build_issue_index(
+    issues: Iterable[IssueRecord],
+    known_states: Optional[Dict[str, str]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Build a lookup index over all issues for one scoring run
+
+    Built once so dependency scoring doesn't rescan the full issue list
+    for every issue.
+
+    Args:
+        issues: Records from compact_issues
+        known_states: Extra number -> state map for issues outside the
+            list (e.g. closed blockers from `github_sync.py blocker-states`)
+
+    Returns:
+        Dict keyed by issue number (as string), each entry with:
+        - state: Issue state ('OPEN', 'CLOSED', ...)
+        - blockers: Blocker numbers parsed from the body
+        - open_depth, unblocks, cycle: Transitive blocker signals (see
+          blocker_graph.analyze_blocker_graph)
+    """
+    index = {
+        str(number): {'state': state}
+        for number, state in (known_states or {}).items()
+    }
+    for issue in issues:
+        index[str(issue.number)] = {
+            'state': STATE_NAMES[issue.state],
+            'blockers': issue.blockers,
+        }
+    analyze_blocker_graph(index)
+    return index
+
+
+def blocker_cycles(issue_index: Dict[str, Dict[str, Any]]) -> List[List[str]]:
+    """Distinct blocker cycles recorded in an index, by lowest issue number"""
+    cycles = {tuple(entry['cycle']) for entry in issue_index.values() if entry.get('cycle')}
+    return [list(cycle) for cycle in sorted(cycles, key=lambda cycle: int(cycle[0]))]
+
+
+def unblock_bonus(entry: Optional[Dict[str, Any]]) -> float:
+    """Total score bonus for issues other open issues are waiting on"""
+    unblocks = entry.get('unblocks', 0) if entry is not None else 0
+    return min(UNBLOCK_BONUS_MAX, unblocks * UNBLOCK_BONUS)
+
+
+def format_refs(refs: Iterable[str]) -> str:
+    """'#12, owner/repo#34' for blocker refs (see blockers.blocker_ref)"""
+    return ', '.join(ref if '#' in ref else f'#{ref}' for ref in refs)
+
+
+def calculate_dependency_score(
+    issue: IssueRecord,
+    all_issues: List[IssueRecord],
+    issue_index: Optional[Dict[str, Dict[str, Any]]] = None,
+    explain: bool = True
+) -> Tuple[float, str]:
+    """
+    Calculate dependency score (0-100)
+
+    Lower score for each open blocker, and for open issues further down
+    the blocker chain (even behind closed blockers). Pass a prebuilt
+    `issue_index` (see build_issue_index) when scoring many issues.
+    Without the index's graph signals only direct blockers count. With
+    explain=False the rationale is skipped (returned as '').
+    """
+    if issue_index is None:
+        issue_index = build_issue_index(all_issues)
+
+    entry = issue_index.get(str(issue.number))
+    blockers = issue.blockers
+
+    unblocks = entry.get('unblocks', 0) if entry is not None else 0
+    unblocks_note = f"; unblocks {unblocks} issue{'s' if unblocks != 1 else ''}" if unblocks else ''
+
+    if not blockers:
+        if not explain:
+            return 100, ''
+        return 100, 'no dependencies' + unblocks_note
+
+    # Check status of blockers
+    open_blockers = []
+    closed_blockers = []
+
+    for blocker_num in blockers:
+        blocker = issue_index.get(blocker_num)
+        if blocker:
+            if blocker['state'] == 'OPEN':
+                open_blockers.append(blocker_num)
+            else:
+                closed_blockers.append(blocker_num)
+        else:
+            # Unknown blocker - assume open (conservative)
+            open_blockers.append(blocker_num)
+
+    # Open levels below the direct blockers (longest chain)
+    depth = entry.get('open_depth', 0) if entry is not None else 0
+    indirect = max(0, depth - (1 if open_blockers else 0))
+
+    if not open_blockers and not indirect:
+        if not explain:
+            return 90, ''
+        return 90, f"dependencies resolved: {format_refs(closed_blockers)}" + unblocks_note
+
+    # Penalty for each open blocker and each open level further down
+    penalty = len(open_blockers) * DIRECT_BLOCKER_PENALTY + indirect * TRANSITIVE_BLOCKER_PENALTY
+    score = max(0, 100 - penalty)
+
+    if not explain:
+        return score, ''
+
+    if open_blockers:
+        reason = f"blocked by {format_refs(open_blockers)}"
+        if closed_blockers:
+            reason += f" ({format_refs(closed_blockers)} done)"
+    else:
+        reason = f"{format_refs(closed_blockers)} done"
+    if indirect:
+        reason += f", {indirect} more open level{'s' if indirect != 1 else ''} down the chain"
+    if entry is not None and entry.get('cycle'):
+        reason += f"; blocker cycle #{', #'.join(entry['cycle'])}"
+
+    return score, reason + unblocks_note
+
+
+def weighted_total(
+    continuity_score: float,
+    priority_score: float,
+    freshness_score: float,
+    dependency_score: float,
+    bonus: float = 0.0
+) -> float:
+    """
+    Combine component scores into the rounded total used for ranking
+
+    `bonus` (see unblock_bonus) is added after weighting; the total is
+    capped at 100.
+    """
+    total_score = (
+        continuity_score * WEIGHT_CONTINUITY +
+        priority_score * WEIGHT_PRIORITY +
+        freshness_score * WEIGHT_FRESHNESS +
+        dependency_score * WEIGHT_DEPENDENCY +
+        bonus
+    )
+    return round(min(100.0, total_score), 1)
+
+
+def score_issue_total(
+    issue: IssueRecord,
+    context: Dict[str, Any],
+    issue_index: Dict[str, Dict[str, Any]],
+    now: Optional[datetime] = None
+) -> float:
+    """
+    Compute only the total score for an issue (no rationale strings)
+
+    Used to rank candidates cheaply; see rank_issues.
+    """
+    continuity_score, _ = calculate_continuity_score(issue, context, explain=False)
+    priority_score, _ = calculate_priority_score(issue)
+    freshness_score, _ = calculate_freshness_score(issue, explain=False, now=now)
+    dependency_score, _ = calculate_dependency_score(issue, [], issue_index, explain=False)
+    return weighted_total(
+        continuity_score, priority_score, freshness_score, dependency_score,
+        unblock_bonus(issue_index.get(str(issue.number)))
+    )
+
+
+def score_issue(
+    issue: IssueRecord,
+    context: Dict[str, Any],
+    all_issues: List[IssueRecord],
+    issue_index: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Score a single issue
+
+    Returns dict with:
+    - total_score: Weighted total (0-100)
+    - continuity_score, continuity_reason
+    - priority_score, priority_reason
+    - freshness_score, freshness_reason
+    - dependency_score, dependency_reason
+    - blocker_depth, unblocks: Transitive blocker signals
+    """
+    if issue_index is None:
+        issue_index = build_issue_index(all_issues)
+
+    return build_result(
+        issue,
+        calculate_continuity_score(issue, context),
+        calculate_priority_score(issue),
+        calculate_freshness_score(issue),
+        calculate_dependency_score(issue, all_issues, issue_index),
+        issue_index.get(str(issue.number))
+    )
+
+
+def build_result(
+    issue: IssueRecord,
+    continuity: Tuple[float, str],
+    priority: Tuple[float, str],
+    freshness: Tuple[float, str],
+    dependency: Tuple[float, str],
+    entry: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Assemble the score_issue result dict from (score, reason) components
+
+    `entry` is the issue's build_issue_index entry (graph signals).
+    """
+    continuity_score, continuity_reason = continuity
+    priority_score, priority_reason = priority
+    freshness_score, freshness_reason = freshness
+    dependency_score, dependency_reason = dependency
+    entry = entry or {}
+
+    total_score = weighted_total(
+        continuity_score, priority_score, freshness_score, dependency_score,
+        unblock_bonus(entry)
+    )
+
+    return {
+        'number': issue.number,
+        'title': issue.title,
+        'total_score': total_score,
+        'continuity_score': round(continuity_score, 1),
+        'continuity_reason': continuity_reason,
+        'priority_score': round(priority_score, 1),
+        'priority_reason': priority_reason,
+        'freshness_score': round(freshness_score, 1),
+        'freshness_reason': freshness_reason,
+        'dependency_score': round(dependency_score, 1),
+        'dependency_reason': dependency_reason,
+        'blocker_depth': entry.get('open_depth', 0),
+        'unblocks': entry.get('unblocks', 0),
+    }
+
+
+def rank_key(total_score: float, number: Any) -> Tuple[float, int]:
+    """
+    Sort key for ranking: higher score first, ties to the lower issue number
+    """
+    return (-total_score, int(number))
+
+
+def rank_issues(
+    issues: Iterable[IssueRecord],
+    context: Dict[str, Any],
+    issue_index: Dict[str, Dict[str, Any]],
+    top_n: Optional[int] = None
+) -> List[IssueRecord]:
+    """
+    Order records by total score, without building results
+
+    With `top_n`, keeps a bounded heap of the best N instead of sorting
+    everything.
+
+    Args:
+        issues: Records to rank (any iterable, consumed once)
+        context: Context dict from parse_state_file
+        issue_index: Index from build_issue_index (or a state-only index)
+        top_n: Only return the best N
+
+    Returns:
+        Records in ranking order
+    """
+    now = datetime.now(timezone.utc)
+
+    if top_n is None:
+        from keep_trace import span
+
+        with span('sort', 'score'):
+            return sorted(
+                issues,
+                key=lambda issue: rank_key(score_issue_total(issue, context, issue_index, now), issue.number)
+            )
+
+    if top_n <= 0:
+        return []
+
+    # Min-heap on the negated rank key keeps the N best seen so far
+    heap: List[Tuple[Tuple[float, int], int, IssueRecord]] = []
+    for seq, issue in enumerate(issues):
+        key = rank_key(score_issue_total(issue, context, issue_index, now), issue.number)
+        item = ((-key[0], -key[1]), seq, issue)
+        if len(heap) < top_n:
+            heapq.heappush(heap, item)
+        elif item[0] > heap[0][0]:
+            heapq.heapreplace(heap, item)
+
+    return [issue for _, _, issue in sorted(heap, key=lambda item: item[0], reverse=True)]
+
+
+def select_top_issues(
+    issues: Iterable[IssueRecord],
+    context: Dict[str, Any],
+    top_n: int,
+    issue_index: Dict[str, Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Select and fully score the top N issues
+
+    Ranks every issue by total score only (see rank_issues). Rationale
+    strings and result dicts are built just for the winners.
+
+    Args:
+        issues: Records to rank (any iterable, consumed once)
+        context: Context dict from parse_state_file
+        top_n: Number of results to return
+        issue_index: Index from build_issue_index (or a state-only index)
+
+    Returns:
+        Top N scored issues in ranking order
+    """
+    winners = rank_issues(issues, context, issue_index, top_n)
+    return [score_issue(issue, context, [], issue_index) for issue in winners]
+
+
+def numpy_available() -> bool:
+    """Check whether the optional NumPy engine can be used"""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def vectorized_totals(
+    issues: List[IssueRecord],
+    context: Dict[str, Any],
+    issue_index: Dict[str, Dict[str, Any]]
+) -> Any:
+    """
+    Compute rounded total scores for all issues with NumPy
+
+    Per-issue inputs (continuity and priority scores, update timestamps,
+    blocker counts and graph signals) are extracted into columns in one
+    Python pass; freshness buckets, dependency penalties and the weighted
+    totals are then computed array-wide. Results equal score_issue_total
+    exactly.
+
+    Args:
+        issues: Records to score
+        context: Context dict from parse_state_file
+        issue_index: Index from build_issue_index
+
+    Returns:
+        numpy float64 array of totals, aligned with `issues`
+    """
+    import numpy as np
+
+    count = len(issues)
+
+    continuity = np.empty(count, dtype=np.float64)
+    priority = np.empty(count, dtype=np.float64)
+    updated_us = np.zeros(count, dtype=np.int64)
+    freshness_known = np.zeros(count, dtype=bool)
+    blocker_count = np.zeros(count, dtype=np.int64)
+    open_count = np.zeros(count, dtype=np.int64)
+    open_depth = np.zeros(count, dtype=np.int64)
+    bonus = np.zeros(count, dtype=np.float64)
+
+    for i, issue in enumerate(issues):
+        continuity[i] = calculate_continuity_score(issue, context, explain=False)[0]
+        priority[i] = calculate_priority_score(issue)[0]
+
+        if issue.updated_us not in (UPDATED_MISSING, UPDATED_INVALID):
+            updated_us[i] = issue.updated_us
+            freshness_known[i] = True
+
+        blocker_count[i] = len(issue.blockers)
+        for blocker_num in issue.blockers:
+            blocker = issue_index.get(blocker_num)
+            # Unknown blockers count as open, as in calculate_dependency_score
+            if not blocker or blocker['state'] == 'OPEN':
+                open_count[i] += 1
+        entry = issue_index.get(str(issue.number))
+        if entry is not None:
+            open_depth[i] = entry.get('open_depth', 0)
+            bonus[i] = unblock_bonus(entry)
+
+    return column_totals(
+        continuity, priority, updated_us, freshness_known, blocker_count, open_count, open_depth, bonus
+    )
+
+
+def column_totals(
+    continuity: Any,
+    priority: Any,
+    updated_us: Any,
+    freshness_known: Any,
+    blocker_count: Any,
+    open_count: Any,
+    open_depth: Any,
+    bonus: Any
+) -> Any:
+    """
+    Rounded total scores from per-issue columns, array-wide
+
+    The NumPy half of vectorized_totals, shared with rank_snapshot.
+
+    Args:
+        continuity, priority: Component scores (float64)
+        updated_us: `updatedAt` epoch microseconds (int64, any value
+            where freshness_known is False)
+        freshness_known: Whether the issue has a usable `updatedAt`
+        blocker_count, open_count: Direct blockers, and how many are open
+        open_depth: Graph signal from the issue index (int64)
+        bonus: unblock_bonus of each issue (float64)
+
+    Returns:
+        numpy float64 array of totals, equal to score_issue_total
+    """
+    import numpy as np
+
+    now_us = (datetime.now(timezone.utc) - EPOCH) // ONE_US
+    days_ago = (now_us - updated_us) // ONE_DAY_US
+    freshness = np.select(
+        [~freshness_known, days_ago <= 7, days_ago <= 14, days_ago <= 30],
+        [50.0, 100.0, 75.0, 50.0],
+        25.0
+    )
+
+    indirect = np.maximum(0, open_depth - (open_count > 0))
+    penalty = open_count * DIRECT_BLOCKER_PENALTY + indirect * TRANSITIVE_BLOCKER_PENALTY
+    dependency = np.where(
+        blocker_count == 0,
+        100.0,
+        np.where(penalty == 0, 90.0, np.maximum(0, 100 - penalty))
+    ).astype(np.float64)
+
+    totals = np.minimum(100.0, (
+        continuity * WEIGHT_CONTINUITY +
+        priority * WEIGHT_PRIORITY +
+        freshness * WEIGHT_FRESHNESS +
+        dependency * WEIGHT_DEPENDENCY +
+        bonus
+    ))
+
+    # np.round differs from round() on some halves; totals take few
+    # distinct values, so round those in Python and scatter back
+    distinct, inverse = np.unique(totals, return_inverse=True)
+    rounded = np.array([round(float(value), 1) for value in distinct], dtype=np.float64)
+    return rounded[inverse.reshape(-1)]
+
+
+def rank_issues_vectorized(
+    issues: List[IssueRecord],
+    context: Dict[str, Any],
+    issue_index: Dict[str, Dict[str, Any]],
+    top_n: Optional[int] = None
+) -> List[IssueRecord]:
+    """
+    NumPy variant of rank_issues
+
+    Ranks by vectorized totals; the order is identical to rank_issues.
+    """
+    import numpy as np
+
+    if not issues:
+        return []
+
+    totals = vectorized_totals(issues, context, issue_index)
+    numbers = np.array([int(issue.number) for issue in issues], dtype=np.int64)
+
+    # Primary key: score descending; secondary: issue number ascending
+    order = np.lexsort((numbers, -totals))
+    if top_n is not None:
+        order = order[:max(top_n, 0)]
+
+    return [issues[i] for i in order.tolist()]
+
+
+def rank_all_issues(
+    issues: List[IssueRecord],
+    context: Dict[str, Any],
+    issue_index: Dict[str, Dict[str, Any]],
+    top_n: Optional[int] = None,
+    engine: str = 'python'
+) -> List[IssueRecord]:
+    """
+    Rank records with the chosen engine
+
+    Args:
+        issues: Records from compact_issues
+        context: Context dict from parse_state_file
+        issue_index: Index from build_issue_index
+        top_n: Only return the best N
+        engine: 'python', 'numpy', or 'auto' (NumPy for large top-N
+            runs). NumPy falls back to Python when not installed.
+    """
+    if use_vectorized(engine, len(issues), top_n):
+        return rank_issues_vectorized(issues, context, issue_index, top_n)
+    return rank_issues(issues, context, issue_index, top_n)
+
+
+def use_vectorized(engine: str, count: int, top_n: Optional[int]) -> bool:
+    """Whether `engine` means NumPy for `count` issues (and NumPy is installed)"""
+    if engine == 'auto':
+        use_numpy = top_n is not None and count >= VECTORIZE_MIN_ISSUES
+    else:
+        use_numpy = engine == 'numpy'
+    return use_numpy and numpy_available()
+
+
+def score_all_issues(
+    issues: Iterable[Any],
+    context: Dict[str, Any],
+    top_n: Optional[int] = None,
+    engine: str = 'python',
+    known_states: Optional[Dict[str, str]] = None,
+    memo: Optional[ScoreMemo] = None,
+    issue_index: Optional[Dict[str, Dict[str, Any]]] = None,
+    text_index: Optional['TextIndex'] = None
+) -> List[Dict[str, Any]]:
+    """
+    Score all issues and return sorted by score descending
+
+    Ties are ordered by issue number. With `top_n`, only the best N are
+    returned and rationale is computed just for them.
+
+    Args:
+        issues: Issue dicts or records (dicts are compacted first)
+        context: Context dict from parse_state_file
+        top_n: Only return the best N
+        engine: 'python', 'numpy', or 'auto' (see rank_all_issues)
+        known_states: States of blockers not in `issues` (see
+            build_issue_index)
+        memo: Stored continuity scans to reuse (see ScoreMemo)
+        issue_index: Prebuilt build_issue_index(records, known_states)
+        text_index: Index for the similarity signal (see similar_issues),
+            updated from the issue dicts
+    """
+    records = list(compact_issues(issues, context, memo, text_index))
+    context = with_similar_issues(context, text_index, (record.number for record in records))
+    if issue_index is None:
+        issue_index = build_issue_index(records, known_states)
+
+    ranked = rank_all_issues(records, context, issue_index, top_n, engine)
+    return [score_issue(issue, context, records, issue_index) for issue in ranked]
+
+
+def score_issues_streaming(
+    source: TextIO,
+    context: Dict[str, Any],
+    top_n: int = 5,
+    known_states: Optional[Dict[str, str]] = None,
+    text_index: Optional['TextIndex'] = None
+) -> List[Dict[str, Any]]:
+    """
+    Score issues from a stream, keeping only the top N results
+
+    Makes two passes over `source`: a lightweight one that records each
+    issue's state (for blocker lookups) and updates the text index, then
+    a scoring pass that keeps a bounded heap of records. Non-seekable
+    input (stdin) is spooled to a temporary file first.
+
+    Args:
+        source: Text stream with a JSON array, JSON Lines, or single object
+        context: Context dict from parse_state_file
+        top_n: Number of results to keep
+        known_states: States of blockers not in the stream
+        text_index: Index for the similarity signal (see similar_issues)
+
+    Returns:
+        Top N scored issues, same order score_all_issues would give
+    """
+    if not source.seekable():
+        import shutil
+        import tempfile
+
+        spool = tempfile.TemporaryFile('w+')
+        shutil.copyfileobj(source, spool)
+        source = spool
+        source.seek(0)
+
+    start = source.tell()
+    if text_index is not None:
+        import sqlite3
+
+    # Pass 1: states and blocker references only, bodies are dropped immediately
+    issue_index = {
+        str(number): {'state': state}
+        for number, state in (known_states or {}).items()
+    }
+    numbers = []
+    for issue in iter_json_issues(source):
+        issue_index[str(issue['number'])] = {
+            'state': issue.get('state'),
+            'blockers': parse_blockers(issue.get('body', '')),
+        }
+        if text_index is not None and not text_index.failed:
+            numbers.append(issue['number'])
+            try:
+                text_index.add(issue['number'], issue.get('updatedAt'), issue.get('title', ''), issue.get('body'))
+            except sqlite3.Error as e:
+                text_index_failed(text_index, e)
+    analyze_blocker_graph(issue_index)
+    context = with_similar_issues(context, text_index, numbers)
+
+    # Pass 2: rank and keep the best N
+    source.seek(start)
+    return select_top_issues(compact_issues(iter_json_issues(source), context), context, top_n, issue_index)
+
+
+def snapshot_issue_index(
+    snapshot: 'Snapshot',
+    known_states: Optional[Dict[str, str]] = None
+) -> Mapping[str, Dict[str, Any]]:
+    """
+    build_issue_index for a snapshot
+
+    Without `known_states` this is the graph analysis stored in the
+    snapshot (a SnapshotIndex). Otherwise the graph is analyzed again
+    from the number, state and blocker columns.
+
+    Either way only issues that name blockers or are named as one get an
+    entry. The others would get zero signals and no cycle, which is what
+    a missing entry already means to the scorers.
+
+    Args:
+        snapshot: Open snapshot (see snapshot.py)
+        known_states: States of blockers not in the snapshot
+    """
+    from snapshot import SnapshotIndex
+
+    if not known_states:
+        return SnapshotIndex(snapshot)
+
+    index = {
+        str(number): {'state': state}
+        for number, state in (known_states or {}).items()
+    }
+    referenced = set(snapshot.table('blocker_refs'))
+    offsets = snapshot.column('blocker_offsets')
+    states = snapshot.column('state')
+    for i, number in enumerate(snapshot.column('number')):
+        key = str(number)
+        if offsets[i + 1] != offsets[i] or key in referenced:
+            index[key] = {
+                'state': STATE_NAMES[states[i]],
+                'blockers': snapshot.blockers(i),
+            }
+    analyze_blocker_graph(index)
+    return index
+
+
+def _segment_sums(np: Any, values: Any, offsets: Any) -> Any:
+    """Sum of values[offsets[i]:offsets[i + 1]] for each i"""
+    sums = np.concatenate(([0], np.cumsum(values, dtype=np.int64)))
+    return sums[offsets[1:]] - sums[offsets[:-1]]
+
+
+def snapshot_totals(
+    snapshot: 'Snapshot',
+    context: Dict[str, Any],
+    issue_index: Mapping[str, Dict[str, Any]],
+    matches: Dict[int, Tuple[Optional[str], Optional[str]]]
+) -> Any:
+    """
+    vectorized_totals over a snapshot's columns, without records
+
+    Label overlap and open blocker counts are computed from the label and
+    blocker id columns. With the snapshot's stored index the graph
+    signals are columns too; other indexes are looked up per issue.
+
+    Args:
+        snapshot: Open snapshot
+        context: Context dict from parse_state_file
+        issue_index: Index from snapshot_issue_index
+        matches: Snapshot.continuity_matches result
+
+    Returns:
+        numpy float64 array of totals, by snapshot position
+    """
+    import numpy as np
+    from snapshot import REF_ABSENT, SnapshotIndex
+
+    def column(name: str, dtype: Any) -> Any:
+        return np.frombuffer(snapshot.column(name), dtype=dtype)
+
+    count = snapshot.count
+    numbers = column('number', np.int64)
+
+    continuity = np.zeros(count, dtype=np.float64)
+    continuity[[i for i, (directory, _) in matches.items() if directory is not None]] += 50
+    recent_labels = {label.lower() for label in context['recent_labels']}
+    overlap = [k for k, name in enumerate(snapshot.table('label_names')) if name in recent_labels]
+    if overlap:
+        in_recent = np.isin(column('label_ids', np.uint32), overlap)
+        continuity[_segment_sums(np, in_recent, column('label_offsets', np.uint32)) > 0] += 30
+    related = np.zeros(count, dtype=bool)
+    related[[i for i, (_, recent_issue) in matches.items() if recent_issue is not None]] = True
+    similar = context.get('similar_issues')
+    if similar:
+        related |= np.isin(numbers, list(similar))
+    continuity[related] += 20
+    continuity = np.minimum(continuity, 100.0)
+
+    priority = np.array([score for score, _ in PRIORITY_LEVELS], dtype=np.float64)[column('priority', np.uint8)]
+
+    updated = column('updated_us', np.int64)
+    freshness_known = (updated != UPDATED_MISSING) & (updated != UPDATED_INVALID)
+    updated_us = np.where(freshness_known, updated, 0)
+
+    # Unknown blockers count as open, as in calculate_dependency_score
+    if isinstance(issue_index, SnapshotIndex):
+        ref_states = column('blocker_ref_states', np.uint8)
+        blocker_open = ((ref_states == STATE_OPEN) | (ref_states == REF_ABSENT)).astype(np.int64)
+    else:
+        blocker_open = np.array([
+            not issue_index.get(ref) or issue_index[ref]['state'] == 'OPEN'
+            for ref in snapshot.table('blocker_refs')
+        ], dtype=np.int64)
+    blocker_offsets = column('blocker_offsets', np.uint32)
+    blocker_count = np.diff(blocker_offsets.astype(np.int64))
+    open_count = _segment_sums(np, blocker_open[column('blocker_ids', np.uint32)], blocker_offsets)
+
+    if isinstance(issue_index, SnapshotIndex):
+        open_depth = column('open_depth', np.uint32).astype(np.int64)
+        bonus = np.minimum(UNBLOCK_BONUS_MAX, column('unblocks', np.uint32) * UNBLOCK_BONUS)
+    else:
+        open_depth = np.zeros(count, dtype=np.int64)
+        bonus = np.zeros(count, dtype=np.float64)
+        for i, number in enumerate(numbers.tolist()):
+            entry = issue_index.get(str(number))
+            if entry is not None:
+                open_depth[i] = entry.get('open_depth', 0)
+                bonus[i] = unblock_bonus(entry)
+
+    return column_totals(
+        continuity, priority, updated_us, freshness_known, blocker_count, open_count, open_depth, bonus
+    )
+
+
+def rank_snapshot(
+    snapshot: 'Snapshot',
+    context: Dict[str, Any],
+    issue_index: Mapping[str, Dict[str, Any]],
+    top_n: Optional[int] = None,
+    engine: str = 'python'
+) -> List[IssueRecord]:
+    """
+    Rank a snapshot's issues, decoding only the ones returned
+
+    Continuity matches come from the snapshot's term index. The NumPy
+    engine scores the columns in place (see snapshot_totals) and builds
+    records just for the returned issues; the Python engine builds every
+    record and uses rank_issues. Either way the order equals
+    rank_all_issues over the same issues.
+
+    Args:
+        snapshot: Open snapshot (see snapshot.py)
+        context: Context dict from parse_state_file
+        issue_index: Index from snapshot_issue_index
+        top_n: Only return the best N
+        engine: 'python', 'numpy', or 'auto' (see rank_all_issues)
+
+    Returns:
+        Records in ranking order
+    """
+    from keep_trace import span
+
+    with span('score.continuity_match'):
+        matches = snapshot.continuity_matches(
+            tuple(context['recent_directories']),
+            tuple(context['recent_issues'])
+        )
+
+    if not use_vectorized(engine, snapshot.count, top_n):
+        records = [snapshot.record(i, matches.get(i, (None, None))) for i in range(snapshot.count)]
+        return rank_issues(records, context, issue_index, top_n)
+
+    import numpy as np
+
+    if not snapshot.count:
+        return []
+    totals = snapshot_totals(snapshot, context, issue_index, matches)
+    numbers = np.frombuffer(snapshot.column('number'), dtype=np.int64)
+
+    # Primary key: score descending; secondary: issue number ascending
+    order = np.lexsort((numbers, -totals))
+    if top_n is not None:
+        order = order[:max(top_n, 0)]
+    return [snapshot.record(i, matches.get(i, (None, None))) for i in order.tolist()]
+
+
+def handle_zero_issues(context: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Handle case when no issues exist
+
+    Args:
+        context: Context dict from parse_state_file
+
+    Returns:
+        Dict with zero-issues status and next steps
+    """
+    return {
+        'status': 'no_issues',
+        'message': 'No issues found in repository',
+        'suggested_action': 'initialize_project',
+        'next_steps': [
+            'Check CLAUDE.md files are current',
+            'Search for planning documents (ROADMAP.md, TODO.md, etc.)',
+            'Analyze codebase for improvement opportunities',
+            'Create 3-5 starter issues based on findings',
+            'Start work on chosen issue'
+        ],
+        'recommendations': []
+    }
+
+
+def format_recommendations(scored_issues: List[Dict[str, Any]], top_n: int = 5) -> str:
+    """
+    Format scored issues as recommendations
+    """
+    if not scored_issues:
+        zero_result = handle_zero_issues({})
+        return zero_result['message'] + "\n\nSuggested next steps:\n" + \
+               '\n'.join(f"  {i+1}. {step}" for i, step in enumerate(zero_result['next_steps']))
+
+    lines = ["🎯 Recommended Next Work\n"]
+
+    # Top recommendation
+    top = scored_issues[0]
+    lines.append(f"🔥 Hot Recommendation:")
+    lines.append(f"{top.get('repo', '')}#{top['number']} - {top['title']}")
+    lines.append(f"├─ Score: {top['total_score']}/100")
+    lines.append(f"├─ {top['continuity_reason']}")
+    if top['unblocks']:
+        lines.append(f"├─ Unblocks {top['unblocks']} waiting issue{'s' if top['unblocks'] != 1 else ''}")
+    lines.append(f"└─ Priority: {top['priority_reason']}")
+    lines.append("")
+
+    # Other options
+    if len(scored_issues) > 1:
+        lines.append("📋 Other Good Options:\n")
+        for i, issue in enumerate(scored_issues[1:top_n], start=2):
+            lines.append(f"{i}. {issue.get('repo', '')}#{issue['number']} - {issue['title']}")
+            lines.append(f"   └─ Score: {issue['total_score']} | {issue['priority_reason']}")
+            if issue['dependency_score'] < 100 or issue['unblocks']:
+                lines.append(f"      {issue['dependency_reason']}")
+            lines.append("")
+
+    return '\n'.join(lines)
+
+
+# Per-issue functions timed in aggregate when tracing
+TRACED_COMPONENTS = {
+    'calculate_continuity_score': 'score.continuity',
+    'calculate_priority_score': 'score.priority',
+    'calculate_freshness_score': 'score.freshness',
+    'calculate_dependency_score': 'score.dependency',
+    'parse_blockers': 'score.parse_blockers',
+    'compact_issue': 'load.compact_issue',
+}
+
+
+def instrument_scoring(tracer: 'Tracer'):
+    """
+    Route the score components through tracer.timed
+
+    Rebinds the module-level functions (and the matcher and memo
+    methods), so scoring code carries no checks when tracing is off.
+    """
+    import issue_record
+
+    module = globals()
+    for name, label in TRACED_COMPONENTS.items():
+        if not hasattr(module[name], '__wrapped__'):
+            module[name] = tracer.timed(module[name], label)
+    # compact_issue scans bodies through issue_record's own binding
+    issue_record.parse_blockers = module['parse_blockers']
+    for cls, method, label in (
+        (ContinuityMatcher, 'match', 'score.continuity_match'),
+        (ScoreMemo, 'match', 'score.memo_match'),
+    ):
+        if not hasattr(getattr(cls, method), '__wrapped__'):
+            setattr(cls, method, tracer.timed(getattr(cls, method), label))
+
+
+def main(argv: Optional[List[str]] = None):
+    """CLI interface"""
+    import argparse
+
+    from keep_trace import configure as configure_trace, span
+
+    parser = argparse.ArgumentParser(description='Score GitHub issues')
+    parser.add_argument(
+        '--recent-work',
+        default='.claude/state.md',
+        help='Path to state.md file'
+    )
+    parser.add_argument(
+        '--issues',
+        help='Path to JSON file with issues (or use stdin)'
+    )
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=5,
+        help='Number of recommendations to show'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Output as JSON instead of formatted text'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream input (JSON array or JSON Lines) and keep only the top N results'
+    )
+    parser.add_argument(
+        '--blocker-states',
+        help='JSON file mapping blocker numbers to states (from github_sync.py blocker-states)'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=['auto', 'python', 'numpy'],
+        default='auto',
+        help='Scoring engine (numpy is optional; falls back to python)'
+    )
+    parser.add_argument(
+        '--repos',
+        help='Comma-separated owner/repo list: fetch and rank all their open issues together'
+    )
+    parser.add_argument(
+        '--snapshot',
+        help='Columnar snapshot to score instead of JSON (from github_sync.py snapshot)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Trace phase timings (see keep_trace.py) and print a report to stderr'
+    )
+
+    args = parser.parse_args(argv)
+
+    tracer = configure_trace('score_issues', args.profile)
+    if tracer is not None:
+        instrument_scoring(tracer)
+
+    if args.repos:
+        if args.issues or args.stream or args.blocker_states or args.snapshot:
+            parser.error('--repos fetches the issues itself; drop --issues, --stream, --snapshot and --blocker-states')
+        from github_ops import GitHubError
+        from multi_repo import parse_repos, score_repos
+
+        try:
+            repos = parse_repos(args.repos)
+        except ValueError as e:
+            parser.error(f'--repos: {e}')
+        try:
+            scored, cycles = score_repos(repos, args.recent_work, None if args.json else args.top, args.engine)
+        except GitHubError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        for repo, repo_cycles in cycles.items():
+            for cycle in repo_cycles:
+                print(f"Warning: blocker cycle between {repo}#{f', {repo}#'.join(cycle)}", file=sys.stderr)
+
+        with span('format'):
+            if args.json:
+                write_json_list(scored, sys.stdout)
+                sys.stdout.write('\n')
+            else:
+                print(format_recommendations(scored, args.top))
+        return
+
+    if args.snapshot:
+        if args.issues or args.stream:
+            parser.error('--snapshot holds the issues; drop --issues and --stream')
+        from snapshot import Snapshot, SnapshotError
+
+        with span('parse_state'):
+            context = parse_state_file(args.recent_work)
+        known_states = None
+        if args.blocker_states:
+            with open(args.blocker_states) as f:
+                known_states = json.load(f)
+
+        try:
+            with span('load.snapshot'):
+                snapshot = Snapshot(args.snapshot)
+        except (OSError, SnapshotError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        with snapshot:
+            # The index is only read here: the snapshot has no `updatedAt` strings to key it by
+            text_index = open_similarity_index(context)
+            context = with_similar_issues(context, text_index, snapshot.column('number'))
+            close_text_index(text_index)
+
+            with span('score.index'):
+                issue_index = snapshot_issue_index(snapshot, known_states)
+            cycles = blocker_cycles(issue_index) if known_states else issue_index.cycles()
+            for cycle in cycles:
+                print(f"Warning: blocker cycle between #{', #'.join(cycle)}", file=sys.stderr)
+
+            with span('score', issues=snapshot.count, engine=args.engine):
+                ranked = rank_snapshot(snapshot, context, issue_index, None if args.json else args.top, args.engine)
+
+            # The stored index reads the snapshot as results are built
+            with span('format'):
+                scored = (score_issue(issue, context, [], issue_index) for issue in ranked)
+                if args.json:
+                    write_json_list(scored, sys.stdout)
+                    sys.stdout.write('\n')
+                else:
+                    print(format_recommendations(list(scored), args.top))
+        return
+
+    # Use the warm daemon when one is running (text output only needs the top N);
+    # profiling always scores in-process. Without it, input is decoded incrementally
+    issues_text = None
+    if not args.stream and tracer is None:
+        from keep_daemon import DaemonError, DaemonUnavailable, daemon_running, request as daemon_request
+
+        scored = None
+        if daemon_running():
+            issues_text = None if args.issues else sys.stdin.read()
+            try:
+                scored = daemon_request('score', {
+                    'recent_work': os.path.abspath(args.recent_work),
+                    'issues_path': os.path.abspath(args.issues) if args.issues else None,
+                    'issues_text': issues_text,
+                    'blocker_states': os.path.abspath(args.blocker_states) if args.blocker_states else None,
+                    'top': None if args.json else args.top,
+                    'engine': args.engine,
+                })
+            except (DaemonUnavailable, DaemonError):
+                pass
+
+        if scored is not None:
+            if args.json:
+                print(json.dumps(scored, indent=2))
+            else:
+                print(format_recommendations(scored, args.top))
+            return
+
+    # Load context
+    with span('parse_state'):
+        context = parse_state_file(args.recent_work)
+    size = len(issues_text) if issues_text is not None else input_size(args.issues)
+    use_memos = size is None or size >= MEMO_MIN_INPUT_BYTES
+    if use_memos:
+        with span('load.blocker_memo'):
+            load_blocker_memo()
+
+    known_states = None
+    if args.blocker_states:
+        with open(args.blocker_states) as f:
+            known_states = json.load(f)
+
+    text_index = open_similarity_index(context)
+
+    if args.stream:
+        with span('score', engine='stream'):
+            if args.issues:
+                with open(args.issues) as f:
+                    scored = score_issues_streaming(f, context, args.top, known_states, text_index)
+            else:
+                scored = score_issues_streaming(sys.stdin, context, args.top, known_states, text_index)
+        save_blocker_memo()
+        close_text_index(text_index)
+
+        with span('format'):
+            output = json.dumps(scored, indent=2) if args.json else format_recommendations(scored, args.top)
+        print(output)
+        return
+
+    # Reuse continuity scans from the previous run where inputs are unchanged
+    with span('load.score_memo'):
+        memo_path = score_memo_path() if use_memos else None
+        memo = ScoreMemo.load(memo_path) if memo_path is not None else None
+
+    # Decode and compact one issue at a time; bodies are dropped as they're scanned
+    with span('load.decode'):
+        if args.issues:
+            with open(args.issues) as f:
+                issues = list(compact_issues(iter_json_issues(f), context, memo, text_index))
+        else:
+            source = io.StringIO(issues_text) if issues_text is not None else sys.stdin
+            issues = list(compact_issues(iter_json_issues(source), context, memo, text_index))
+        issues_text = None
+
+    context = with_similar_issues(context, text_index, (issue.number for issue in issues))
+    close_text_index(text_index)
+
+    with span('score.index'):
+        issue_index = build_issue_index(issues, known_states)
+    for cycle in blocker_cycles(issue_index):
+        print(f"Warning: blocker cycle between #{', #'.join(cycle)}", file=sys.stderr)
+
+    # Rank issues - text output only needs the top N
+    with span('score', issues=len(issues), engine=args.engine):
+        ranked = rank_all_issues(issues, context, issue_index, None if args.json else args.top, args.engine)
+    with span('save'):
+        save_blocker_memo()
+        if memo is not None:
+            memo.save()
+
+    # Output - results (with rationale) are built as they're written
+    with span('format'):
+        scored = (score_issue(issue, context, issues, issue_index) for issue in ranked)
+        if args.json:
+            write_json_list(scored, sys.stdout)
+            sys.stdout.write('\n')
+        else:
+            print(format_recommendations(list(scored), args.top))
+
+if __name__ == '__main__':
+    main()
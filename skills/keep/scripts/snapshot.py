@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+"""
+Columnar issue snapshots for Keep
+
+A snapshot is one binary file holding an issue export laid out for the
+scorer rather than as JSON:
+
+- Fixed-width columns, one value per issue: number, state code,
+  priority code, `updatedAt` (epoch microseconds) and offsets into the
+  label and blocker lists (see issue_record for the codes)
+- String heaps for titles and bodies, addressed by offset columns
+- Label and blocker ids into small JSON tables of distinct names / refs
+- A term index: the distinct whitespace-separated words of each
+  lowercased title + body, with the issues containing them, and the
+  numbers written after `#` in each body. Continuity matching (see
+  scoring.ContinuityMatcher) is answered from these instead of scanning
+  every body.
+- The blocker graph analysis (see blocker_graph), run when the file is
+  written: each issue's open_depth, unblocks and cycle, and the state of
+  every blocker ref. SnapshotIndex serves these as the issue index, so
+  scoring doesn't redo it (unless outside blocker states are supplied).
+
+`github_sync.py snapshot` writes one; `score_issues.py --snapshot`
+memory-maps it and reads only the columns scoring needs. Bodies stay on
+disk unless a title or body is asked for.
+
+Files are written in the machine's byte order and refused on machines
+with the other one. Stdlib only.
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from blocker_graph import analyze_blocker_graph
+from blockers import parse_blockers
+from issue_record import (
+    STATE_NAMES, IssueRecord, intern_labels, parse_updated, priority_code, state_code,
+)
+
+
+SNAPSHOT_MAGIC = b'KEEPSNAP'
+
+# Bump when the layout or the meaning of a column changes; older files
+# are refused
+SNAPSHOT_VERSION = 1
+
+# Fields `github_sync.py snapshot` fetches
+SNAPSHOT_FIELDS = 'number,title,body,labels,state,updatedAt'
+
+# Written natively; reads back as BYTE_ORDER_MARK only in the same byte order
+BYTE_ORDER_MARK = 0x01020304
+
+# magic, version, byte order mark, section count, issue count
+HEADER = struct.Struct('=8sIIIQ')
+SECTION = struct.Struct('=QQ')
+
+# Sections in file order: (name, array typecode, or None for raw bytes)
+SECTIONS = (
+    ('number', 'q'),
+    ('state', 'B'),
+    ('priority', 'B'),
+    ('updated_us', 'q'),
+    ('title_offsets', 'Q'),
+    ('titles', None),
+    ('body_offsets', 'Q'),
+    ('bodies', None),
+    ('label_offsets', 'I'),
+    ('label_ids', 'I'),
+    ('label_names', None),
+    ('blocker_offsets', 'I'),
+    ('blocker_ids', 'I'),
+    ('blocker_refs', None),
+    ('term_offsets', 'Q'),
+    ('terms', None),
+    ('term_posting_offsets', 'Q'),
+    ('term_postings', 'I'),
+    ('mentions', None),
+    ('mention_posting_offsets', 'Q'),
+    ('mention_postings', 'I'),
+    ('graph', 'B'),
+    ('open_depth', 'I'),
+    ('unblocks', 'I'),
+    ('cycle', 'I'),
+    ('cycles', None),
+    ('blocker_ref_states', 'B'),
+)
+
+# blocker_ref_states value for refs that aren't issues in the snapshot
+REF_ABSENT = 255
+
+# Sections are aligned so every column can be viewed in place
+ALIGNMENT = 8
+
+# Digits written after '#' (a body contains '#N' iff one of these starts with N)
+MENTION = re.compile(r'#(\d+)')
+
+
+class SnapshotError(Exception):
+    """Snapshot can't be written or read"""
+    pass
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _postings(index: Dict[str, array]) -> Tuple[List[str], array, array]:
+    """Keys of a word -> issue positions map with their concatenated postings and offsets"""
+    offsets = array('Q', [0])
+    postings = array('I')
+    for positions in index.values():
+        postings.extend(positions)
+        offsets.append(len(postings))
+    return list(index), offsets, postings
+
+
+def _write_graph(columns: Dict[str, array], refs: List[str]) -> List[List[str]]:
+    """
+    Analyze the blocker graph of the columns so far and add its columns
+
+    The index covers the issues that name blockers or are named as one,
+    as scoring.snapshot_issue_index builds it.
+
+    Returns:
+        Blocker cycles (see analyze_blocker_graph)
+    """
+    offsets = columns['blocker_offsets']
+    ids = columns['blocker_ids']
+    referenced = set(refs)
+    keys = [str(number) for number in columns['number']]
+    index = {}
+    for i, key in enumerate(keys):
+        if offsets[i + 1] != offsets[i] or key in referenced:
+            index[key] = {
+                'state': STATE_NAMES[columns['state'][i]],
+                'blockers': tuple(refs[k] for k in ids[offsets[i]:offsets[i + 1]]),
+            }
+    cycles = analyze_blocker_graph(index)
+
+    cycle_ids = {tuple(cycle): k for k, cycle in enumerate(cycles)}
+    for key in keys:
+        entry = index.get(key)
+        columns['graph'].append(entry is not None)
+        columns['open_depth'].append(entry['open_depth'] if entry else 0)
+        columns['unblocks'].append(entry['unblocks'] if entry else 0)
+        columns['cycle'].append(cycle_ids[tuple(entry['cycle'])] + 1 if entry and entry['cycle'] else 0)
+    for ref in refs:
+        entry = index.get(ref)
+        columns['blocker_ref_states'].append(state_code(entry['state']) if entry else REF_ABSENT)
+    return cycles
+
+
+def write_snapshot(issues: Iterable[Dict[str, Any]], path: str) -> Dict[str, Any]:
+    """
+    Write issues to a snapshot file
+
+    Issues are consumed one at a time: titles and bodies are spooled to
+    temporary files, so only the fixed-width columns and the term index
+    are held in memory. The file is replaced atomically.
+
+    Args:
+        issues: Issue dicts in `gh issue list --json` shape (any
+            iterable, e.g. list_issues or iter_json_issues)
+        path: Snapshot file to write
+
+    Returns:
+        Dict with path, issues (count) and bytes (file size)
+
+    Raises:
+        SnapshotError: If an issue number isn't an integer
+    """
+    columns = {name: array(typecode) for name, typecode in SECTIONS if typecode}
+    for name in ('title_offsets', 'body_offsets', 'label_offsets', 'blocker_offsets'):
+        columns[name].append(0)
+    labels: Dict[str, int] = {}
+    refs: Dict[str, int] = {}
+    terms: Dict[str, array] = {}
+    mentions: Dict[str, array] = {}
+
+    with tempfile.TemporaryFile() as titles, tempfile.TemporaryFile() as bodies:
+        count = 0
+        for issue in issues:
+            number = issue['number']
+            if not isinstance(number, int) or isinstance(number, bool):
+                raise SnapshotError(f"issue number {number!r} is not an integer")
+            title = issue.get('title') or ''
+            body = issue.get('body') or ''
+            names = intern_labels(issue.get('labels'))
+
+            columns['number'].append(number)
+            columns['state'].append(state_code(issue.get('state')))
+            columns['priority'].append(priority_code(names))
+            columns['updated_us'].append(parse_updated(issue.get('updatedAt')))
+
+            titles.write(title.encode('utf-8'))
+            columns['title_offsets'].append(titles.tell())
+            bodies.write(body.encode('utf-8'))
+            columns['body_offsets'].append(bodies.tell())
+
+            columns['label_ids'].extend(labels.setdefault(name, len(labels)) for name in names)
+            columns['label_offsets'].append(len(columns['label_ids']))
+            columns['blocker_ids'].extend(refs.setdefault(ref, len(refs)) for ref in parse_blockers(body))
+            columns['blocker_offsets'].append(len(columns['blocker_ids']))
+
+            # The text ContinuityMatcher.match scans, split into words
+            for word in dict.fromkeys(f"{title} {body}".lower().split()):
+                positions = terms.get(word)
+                if positions is None:
+                    positions = terms[word] = array('I')
+                positions.append(count)
+            for digits in dict.fromkeys(MENTION.findall(body)):
+                positions = mentions.get(digits)
+                if positions is None:
+                    positions = mentions[digits] = array('I')
+                positions.append(count)
+            count += 1
+
+        ref_list = list(refs)
+        cycles = _write_graph(columns, ref_list)
+
+        words, columns['term_posting_offsets'], columns['term_postings'] = _postings(terms)
+        terms.clear()
+        columns['term_offsets'].append(0)
+        heap = bytearray()
+        for word in words:
+            heap += word.encode('utf-8')
+            heap += b'\n'
+            columns['term_offsets'].append(len(heap))
+        mention_keys, columns['mention_posting_offsets'], columns['mention_postings'] = _postings(
+            dict(sorted(mentions.items()))
+        )
+        mentions.clear()
+
+        payloads = {
+            'titles': titles,
+            'bodies': bodies,
+            'label_names': json.dumps(list(labels)).encode('utf-8'),
+            'blocker_refs': json.dumps(ref_list).encode('utf-8'),
+            'cycles': json.dumps(cycles).encode('utf-8'),
+            'terms': bytes(heap),
+            'mentions': json.dumps(mention_keys).encode('utf-8'),
+        }
+        del heap, words
+
+        def size(name: str) -> int:
+            payload = payloads.get(name, columns.get(name))
+            if isinstance(payload, array):
+                return len(payload) * payload.itemsize
+            if isinstance(payload, bytes):
+                return len(payload)
+            payload.seek(0, os.SEEK_END)
+            return payload.tell()
+
+        table = []
+        offset = _aligned(HEADER.size + SECTION.size * len(SECTIONS))
+        for name, _ in SECTIONS:
+            length = size(name)
+            table.append((offset, length))
+            offset = _aligned(offset + length)
+
+        target = Path(path)
+        fd, tmp = tempfile.mkstemp(prefix=f'.{target.name}.', dir=str(target.parent))
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                out.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, BYTE_ORDER_MARK, len(SECTIONS), count))
+                for entry in table:
+                    out.write(SECTION.pack(*entry))
+                for (name, typecode), (start, _) in zip(SECTIONS, table):
+                    out.write(b'\0' * (start - out.tell()))
+                    payload = payloads.get(name, columns.get(name))
+                    if isinstance(payload, array):
+                        payload.tofile(out)
+                    elif isinstance(payload, bytes):
+                        out.write(payload)
+                    else:
+                        payload.seek(0)
+                        while True:
+                            chunk = payload.read(1 << 20)
+                            if not chunk:
+                                break
+                            out.write(chunk)
+                written = out.tell()
+            os.replace(tmp, target)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    return {'path': str(target), 'issues': count, 'bytes': written}
+
+
+class Snapshot:
+    """
+    A memory-mapped snapshot file
+
+    Columns are memoryviews straight onto the mapping (nothing is copied
+    or decoded until used). Issues are addressed by position, 0 to
+    count - 1, in the order they were written.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise SnapshotError(f"{path}: not a Keep snapshot")
+
+        if len(self._map) < HEADER.size:
+            self._map.close()
+            raise SnapshotError(f"{path}: not a Keep snapshot")
+        magic, version, mark, sections, count = HEADER.unpack_from(self._map)
+        if magic != SNAPSHOT_MAGIC:
+            self._map.close()
+            raise SnapshotError(f"{path}: not a Keep snapshot")
+        if version != SNAPSHOT_VERSION or sections != len(SECTIONS):
+            self._map.close()
+            raise SnapshotError(f"{path}: snapshot version {version}, expected {SNAPSHOT_VERSION}; rewrite it")
+        if mark != BYTE_ORDER_MARK:
+            self._map.close()
+            raise SnapshotError(f"{path}: written with {'big' if sys.byteorder == 'little' else 'little'}-endian byte order")
+
+        self.count = count
+        self._sections: Dict[str, Tuple[int, int]] = {}
+        for i, (name, _) in enumerate(SECTIONS):
+            offset, length = SECTION.unpack_from(self._map, HEADER.size + i * SECTION.size)
+            if offset + length > len(self._map):
+                self._map.close()
+                raise SnapshotError(f"{path}: truncated snapshot")
+            self._sections[name] = (offset, length)
+        self._views: Dict[str, memoryview] = {}
+        self._tables: Dict[str, List[str]] = {}
+
+    def close(self):
+        try:
+            for view in self._views.values():
+                view.release()
+            self._map.close()
+        except BufferError:
+            # Arrays made from the columns (e.g. numpy.frombuffer) still
+            # point into the mapping; it goes when they do
+            pass
+        self._views = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def column(self, name: str) -> memoryview:
+        """A section as a memoryview, typed for fixed-width columns (bytes for heaps)"""
+        view = self._views.get(name)
+        if view is None:
+            offset, length = self._sections[name]
+            view = memoryview(self._map)[offset:offset + length]
+            typecode = dict(SECTIONS)[name]
+            if typecode:
+                view = view.cast(typecode)
+            self._views[name] = view
+        return view
+
+    def table(self, name: str) -> List[str]:
+        """A JSON table section (label_names, blocker_refs, mentions), decoded once"""
+        values = self._tables.get(name)
+        if values is None:
+            values = self._tables[name] = json.loads(bytes(self.column(name)))
+        return values
+
+    def _text(self, heap: str, offsets: str, i: int) -> str:
+        bounds = self.column(offsets)
+        return str(self.column(heap)[bounds[i]:bounds[i + 1]], 'utf-8')
+
+    def title(self, i: int) -> str:
+        return self._text('titles', 'title_offsets', i)
+
+    def body(self, i: int) -> str:
+        return self._text('bodies', 'body_offsets', i)
+
+    def _ids(self, table: str, offsets: str, ids: str, i: int) -> Tuple[str, ...]:
+        bounds = self.column(offsets)
+        names = self.table(table)
+        return tuple(names[k] for k in self.column(ids)[bounds[i]:bounds[i + 1]])
+
+    def labels(self, i: int) -> Tuple[str, ...]:
+        """Lowercased label names, as IssueRecord.labels"""
+        return self._ids('label_names', 'label_offsets', 'label_ids', i)
+
+    def blockers(self, i: int) -> Tuple[str, ...]:
+        """Blocker refs parsed from the body, as IssueRecord.blockers"""
+        return self._ids('blocker_refs', 'blocker_offsets', 'blocker_ids', i)
+
+    def record(self, i: int, match: Tuple[Optional[str], Optional[str]] = (None, None)) -> IssueRecord:
+        """
+        The IssueRecord for position `i`
+
+        Args:
+            i: Issue position
+            match: Continuity match (see continuity_matches)
+        """
+        return IssueRecord(
+            self.column('number')[i],
+            self.title(i),
+            self.column('state')[i],
+            self.column('priority')[i],
+            self.column('updated_us')[i],
+            self.labels(i),
+            self.blockers(i),
+            match,
+        )
+
+    def _postings(self, offsets: str, postings: str, start: int, end: int) -> memoryview:
+        bounds = self.column(offsets)
+        return self.column(postings)[bounds[start]:bounds[end]]
+
+    def containing(self, text: str) -> List[int]:
+        """
+        Positions of issues whose lowercased title + body contain `text`
+
+        `text` must be lowercase without whitespace: it is looked up among
+        the words of the term index, not in the bodies.
+        """
+        needle = text.encode('utf-8')
+        start, length = self._sections['terms']
+        end = start + length
+        bounds = self.column('term_offsets')
+        found = set()
+        position = self._map.find(needle, start, end)
+        while position >= 0:
+            # Words are '\n'-terminated, so a hit lies within one word
+            word = bisect_right(bounds, position - start) - 1
+            found.update(self._postings('term_posting_offsets', 'term_postings', word, word + 1))
+            position = self._map.find(needle, start + bounds[word + 1], end)
+        return sorted(found)
+
+    def mentioning(self, number: str) -> List[int]:
+        """Positions of issues whose body contains `#number` (`number` all decimal digits)"""
+        keys = self.table('mentions')
+        start = bisect_left(keys, number)
+        end = bisect_left(keys, number + '\U0010ffff', start)
+        if start == end:
+            return []
+        return sorted(set(self._postings('mention_posting_offsets', 'mention_postings', start, end)))
+
+    def continuity_matches(
+        self,
+        directories: Tuple[str, ...],
+        recent_issues: Tuple[str, ...]
+    ) -> Dict[int, Tuple[Optional[str], Optional[str]]]:
+        """
+        ContinuityMatcher.match for every issue, from the term index
+
+        Same semantics: the first directory (in context order) contained in
+        the lowercased title + body, and the first recent issue whose `#N`
+        appears in the body. Patterns the index can't answer (directories
+        with whitespace, refs that aren't digits) fall back to reading
+        titles and bodies.
+
+        Returns:
+            Position -> (directory, recent issue) for issues matching
+            either; all other issues match (None, None)
+        """
+        best_directory: Dict[int, int] = {}
+        best_issue: Dict[int, int] = {}
+        fallback: Optional[List[str]] = None
+
+        def hits(pattern: str, in_body: bool) -> List[int]:
+            nonlocal fallback
+            if in_body and pattern.isdecimal():
+                return self.mentioning(pattern)
+            if not in_body and pattern.split() == [pattern]:
+                return self.containing(pattern)
+            if in_body:
+                return [i for i in range(self.count) if f'#{pattern}' in self.body(i)]
+            if fallback is None:
+                fallback = [f"{self.title(i)} {self.body(i)}".lower() for i in range(self.count)]
+            return [i for i, text in enumerate(fallback) if pattern in text]
+
+        # Later (lower-ranked) patterns first, so earlier ones overwrite
+        for best, patterns, in_body in (
+            (best_directory, [directory.lower() for directory in directories], False),
+            (best_issue, list(recent_issues), True),
+        ):
+            for k in reversed(range(len(patterns))):
+                if patterns[k] == '':
+                    best.update(dict.fromkeys(range(self.count), k))
+                    continue
+                for i in hits(patterns[k], in_body):
+                    best[i] = k
+
+        return {
+            i: (
+                directories[best_directory[i]] if i in best_directory else None,
+                recent_issues[best_issue[i]] if i in best_issue else None,
+            )
+            for i in best_directory.keys() | best_issue.keys()
+        }
+
+
+class SnapshotIndex(Mapping):
+    """
+    A snapshot's stored blocker graph, as a read-only issue index
+
+    Looks like build_issue_index's dict (number -> state, blockers,
+    open_depth, unblocks, cycle); entries are made from the columns on
+    first lookup. Only issues that name blockers or are named as one
+    have entries.
+    """
+
+    def __init__(self, snapshot: Snapshot):
+        self.snapshot = snapshot
+        self._positions: Optional[Dict[str, int]] = None
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def _position(self) -> Dict[str, int]:
+        if self._positions is None:
+            graph = self.snapshot.column('graph')
+            self._positions = {
+                str(number): i for i, number in enumerate(self.snapshot.column('number')) if graph[i]
+            }
+        return self._positions
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            i = self._position()[key]
+            snapshot = self.snapshot
+            cycle = snapshot.column('cycle')[i]
+            entry = self._entries[key] = {
+                'state': STATE_NAMES[snapshot.column('state')[i]],
+                'blockers': snapshot.blockers(i),
+                'open_depth': snapshot.column('open_depth')[i],
+                'unblocks': snapshot.column('unblocks')[i],
+                'cycle': snapshot.table('cycles')[cycle - 1] if cycle else None,
+            }
+        return entry
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._position())
+
+    def __len__(self) -> int:
+        return len(self._position())
+
+    def cycles(self) -> List[List[str]]:
+        """Blocker cycles, as scoring.blocker_cycles would list them"""
+        return self.snapshot.table('cycles')
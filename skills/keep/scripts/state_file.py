@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Section-aware parser for .claude/state.md
+
+Reads the documented sections (see skills/keep/references/file-formats.md)
+in one pass:
+
+- Last Updated
+- Active Work: current issue, branch, started, progress, next steps,
+  open questions, optional labels
+- Recent Work: previous issues with completion dates
+- Blockers
+- Context: directories, notes, related issues
+
+Parse results are cached in a sidecar (.claude/cache/state.json) keyed
+by the file's mtime and size, so repeated calls from the start, save
+and done flows don't re-read the markdown.
+
+Usage:
+    python state_file.py [--path .claude/state.md] [--no-cache]
+"""
+
+import json
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# Bump when the parsed shape changes so stale sidecars are ignored
+# (2: repo_issue_refs)
+STATE_CACHE_VERSION = 2
+
+SECTION = re.compile(r'^(#{2,3})\s+(.+?)\s*$')
+FIELD = re.compile(r'^\*\*(.+?):\*\*\s*(.*)$')
+ISSUE_REF = re.compile(r'#(\d+)')
+# '#12' or 'owner/repo#12', the owner and repository shaped as in
+# blockers.BLOCKER_PATTERN and not part of a path
+REPO_ISSUE_REF = re.compile(
+    r'(?:(?<![\w./-])([a-z\d](?:[a-z\d]|-(?=[a-z\d])){0,38}/(?!\.\.?#)[\w.-]{1,100}))?#(\d+)',
+    re.IGNORECASE
+)
+ISSUE_TITLE = re.compile(r'^#(\d+)\s*(?:[-–—:]\s*(.*))?$')
+COMPLETED = re.compile(r'\s*\((?:Completed|Closed)\s+([^)]*)\)\s*$', re.IGNORECASE)
+PERCENTAGE = re.compile(r'\s*\((\d+)%(?:\s+done)?\)\s*$')
+WORKING_IN = re.compile(r'working primarily in\s+(.*)', re.IGNORECASE)
+LIST_ITEM = re.compile(r'^(?:[-*+]|\d+[.)])\s+(.*)$')
+
+PROGRESS_STATUS = {
+    '✅': 'completed',
+    '🔄': 'in_progress',
+    '⏸️': 'pending',
+    '⏸': 'pending',
+}
+
+
+def _empty_state() -> Dict[str, Any]:
+    return {
+        'last_updated': None,
+        'active_work': None,
+        'recent_work': [],
+        'blockers': [],
+        'context': {'directories': [], 'notes': [], 'related_issues': []},
+        'labels': [],
+        'directories': [],
+        'issue_refs': [],
+        'repo_issue_refs': [],
+    }
+
+
+def _split_list(value: str) -> List[str]:
+    """Split 'a, b and c' / 'a b' into items"""
+    items = re.split(r'[,\s]+', value.strip())
+    return [item for item in items if item and item.lower() != 'and']
+
+
+def _directories(text: str) -> List[str]:
+    """Directories from a 'Working primarily in ...' phrase"""
+    match = WORKING_IN.search(text)
+    if not match:
+        return []
+    return [d.rstrip('/,.') for d in _split_list(match.group(1)) if d.rstrip('/,.')]
+
+
+def _issue_title(value: str) -> Dict[str, Any]:
+    """Parse '#1234 - Title (Completed 2024-10-22)'"""
+    completed = COMPLETED.search(value)
+    if completed:
+        value = value[:completed.start()]
+    match = ISSUE_TITLE.match(value.strip())
+    if not match:
+        return {'issue_number': None, 'title': value.strip() or None, 'completed': None}
+    return {
+        'issue_number': int(match.group(1)),
+        'title': (match.group(2) or '').strip() or None,
+        'completed': completed.group(1).strip() if completed else None,
+    }
+
+
+def parse_state(content: str) -> Dict[str, Any]:
+    """
+    Parse state.md content
+
+    Returns:
+        Dict with last_updated, active_work (None if empty), recent_work,
+        blockers, context, labels (explicit **Labels:** fields),
+        directories (from every "Working primarily in" line),
+        issue_refs (every #N in the file, in order) and repo_issue_refs
+        (the same references as written: 'N', or 'owner/repo#N' with
+        owner and repository lowercased)
+    """
+    state = _empty_state()
+    active: Dict[str, Any] = {
+        'issue_number': None,
+        'issue_title': None,
+        'branch': None,
+        'started': None,
+        'progress_items': [],
+        'next_steps': [],
+        'open_questions': [],
+    }
+    section = ''
+    subsection = ''
+
+    directories: Dict[str, None] = {}
+    issue_refs: Dict[str, None] = {}
+    repo_issue_refs: Dict[str, None] = {}
+    labels: Dict[str, None] = {}
+
+    for raw in content.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+
+        heading = SECTION.match(line)
+        if heading:
+            if len(heading.group(1)) == 2:
+                section = heading.group(2).lower()
+                subsection = ''
+            else:
+                subsection = heading.group(2).lower()
+            continue
+
+        for repo, number in REPO_ISSUE_REF.findall(line):
+            issue_refs[number] = None
+            repo_issue_refs[f'{repo.lower()}#{number}' if repo else number] = None
+        for directory in _directories(line):
+            directories[directory] = None
+
+        field = FIELD.match(line)
+        key = field.group(1).lower() if field else ''
+        value = field.group(2).strip() if field else ''
+
+        if key == 'last updated':
+            state['last_updated'] = value
+        elif key == 'labels':
+            for label in value.split(','):
+                if label.strip():
+                    labels[label.strip()] = None
+
+        elif section == 'active work':
+            if key == 'current issue':
+                parsed = _issue_title(value)
+                active['issue_number'] = parsed['issue_number']
+                active['issue_title'] = parsed['title']
+            elif key in ('branch', 'started'):
+                active[key] = value or None
+            elif subsection == 'open questions':
+                if line.startswith('→'):
+                    if active['open_questions']:
+                        active['open_questions'][-1]['decision'] = line.lstrip('→').strip()
+                else:
+                    item = LIST_ITEM.match(line)
+                    active['open_questions'].append({
+                        'question': item.group(1) if item else line,
+                        'decision': None,
+                    })
+            else:
+                item = LIST_ITEM.match(line)
+                if item and subsection == 'progress':
+                    text = item.group(1)
+                    status = 'unknown'
+                    for marker, name in PROGRESS_STATUS.items():
+                        if text.startswith(marker):
+                            status = name
+                            text = text[len(marker):].strip()
+                            break
+                    entry: Dict[str, Any] = {'status': status, 'text': text}
+                    percentage = PERCENTAGE.search(text)
+                    if percentage:
+                        entry['text'] = text[:percentage.start()]
+                        entry['percentage'] = int(percentage.group(1))
+                    active['progress_items'].append(entry)
+                elif item and subsection == 'next steps':
+                    active['next_steps'].append(item.group(1))
+
+        elif section == 'recent work':
+            if key == 'previous issue':
+                state['recent_work'].append(_issue_title(value))
+
+        elif section == 'blockers':
+            item = LIST_ITEM.match(line)
+            text = item.group(1) if item else line
+            if text.lower().rstrip('.') not in ('none', 'none currently'):
+                state['blockers'].append(text)
+
+        elif section == 'context':
+            item = LIST_ITEM.match(line)
+            text = item.group(1) if item else line
+            context = state['context']
+            found = _directories(text)
+            if found:
+                context['directories'].extend(d for d in found if d not in context['directories'])
+            else:
+                context['notes'].append(text)
+            for ref in ISSUE_REF.findall(text):
+                if int(ref) not in context['related_issues']:
+                    context['related_issues'].append(int(ref))
+
+    if active['issue_number'] is not None or active['progress_items'] or active['next_steps']:
+        state['active_work'] = active
+    state['labels'] = list(labels)
+    state['directories'] = list(directories)
+    state['issue_refs'] = list(issue_refs)
+    state['repo_issue_refs'] = list(repo_issue_refs)
+    return state
+
+
+def work_issue_numbers(state: Dict[str, Any]) -> List[int]:
+    """Active, recent and related issue numbers, in that order"""
+    numbers: Dict[int, None] = {}
+    active = state.get('active_work') or {}
+    if active.get('issue_number') is not None:
+        numbers[active['issue_number']] = None
+    for recent in state.get('recent_work', []):
+        if recent.get('issue_number') is not None:
+            numbers[recent['issue_number']] = None
+    for number in state.get('context', {}).get('related_issues', []):
+        numbers[number] = None
+    return list(numbers)
+
+
+def sidecar_path(state_path: Path) -> Optional[Path]:
+    """Cache location for a state file inside .claude/, else None"""
+    if state_path.parent.name == '.claude':
+        return state_path.parent / 'cache' / 'state.json'
+    return None
+
+
+def load_state(state_path: str = '.claude/state.md', use_cache: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Parse a state file, reusing the sidecar cache when it is current
+
+    Args:
+        state_path: Path to state.md
+        use_cache: Set False to always re-parse (the sidecar is still
+            refreshed)
+
+    Returns:
+        Parsed state (see parse_state), or None if the file doesn't exist
+    """
+    path = Path(state_path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+
+    key = {
+        'version': STATE_CACHE_VERSION,
+        'path': str(path.resolve()),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+    }
+    sidecar = sidecar_path(path)
+    if sidecar is not None and use_cache:
+        try:
+            cached = json.loads(sidecar.read_text())
+            if cached.get('key') == key:
+                return cached['state']
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+
+    try:
+        state = parse_state(path.read_text(encoding='utf-8', errors='replace'))
+    except OSError:
+        return None
+
+    if sidecar is not None:
+        try:
+            sidecar.parent.mkdir(parents=True, exist_ok=True)
+            tmp = sidecar.with_suffix('.tmp')
+            tmp.write_text(json.dumps({'key': key, 'state': state}))
+            tmp.replace(sidecar)
+        except OSError:
+            pass
+    return state
+
+
+def freshness(last_updated: Optional[str], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Classify how recently the state was saved
+
+    Returns:
+        Dict with freshness ('recent' < 24h, 'moderate' < 48h, 'stale',
+        or 'unknown') and hours_since_update
+    """
+    try:
+        updated = datetime.fromisoformat(last_updated.replace('Z', '+00:00'))
+        if updated.tzinfo is None:
+            updated = updated.replace(tzinfo=timezone.utc)
+    except (ValueError, AttributeError):
+        return {'freshness': 'unknown', 'hours_since_update': None}
+
+    hours = ((now or datetime.now(timezone.utc)) - updated).total_seconds() / 3600
+    if hours < 24:
+        label = 'recent'
+    elif hours < 48:
+        label = 'moderate'
+    else:
+        label = 'stale'
+    return {'freshness': label, 'hours_since_update': int(hours)}
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Parse .claude/state.md')
+    parser.add_argument('--path', default='.claude/state.md', help='Path to state.md file')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore the parse cache')
+    args = parser.parse_args()
+
+    state = load_state(args.path, use_cache=not args.no_cache)
+    if state is None:
+        print(json.dumps({'exists': False}))
+        return
+
+    print(json.dumps({'exists': True, **state, **freshness(state['last_updated'])}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Inverted text index over issue titles and bodies
+
+SQLite store under .claude/cache/ holding, per term, the issues that
+contain it and how often (a postings list), plus each issue's length and
+the `updatedAt` it was indexed at. The scorer keeps it current as issues
+pass through compact_issues: only issues whose `updatedAt` changed are
+re-tokenized. It then ranks issues against the text of recent work with
+BM25, reading just the postings of the query's terms instead of every
+body.
+
+Stdlib only. The index is only used inside Keep projects (where
+`.claude/` exists).
+"""
+
+import heapq
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+DEFAULT_INDEX_PATH = '.claude/cache/text_index.db'
+
+# BM25 parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Query terms looked up, rarest first; common terms add little but long postings
+MAX_QUERY_TERMS = 32
+
+# Terms in more than this fraction of issues are skipped at query time
+MAX_DF_FRACTION = 0.5
+
+# Changed issues buffered before they are written
+WRITE_BATCH = 500
+
+TOKEN = re.compile(r'[a-z0-9][a-z0-9_+#]*')
+
+STOPWORDS = frozenset(
+    'a an and are as at be been but by can do does for from has have how if in into is it its '
+    'not of on or should so than that the their then there these this to was we were what when '
+    'which will with would you'.split()
+)
+
+
+def _keep(token: str) -> bool:
+    return len(token) > 1 and token not in STOPWORDS and not token.isdigit()
+
+
+def term_counts(text: str) -> Counter:
+    """Occurrences of each lowercased word, without stopwords, numbers and single characters"""
+    counts = Counter(TOKEN.findall(text.lower()))
+    # Filter distinct words, not every occurrence
+    for token in [token for token in counts if not _keep(token)]:
+        del counts[token]
+    return counts
+
+
+def index_path() -> Optional[Path]:
+    """
+    Resolve the index file location
+
+    Returns:
+        Path from KEEP_TEXT_INDEX (`off` disables), else
+        .claude/cache/text_index.db when .claude/ exists, else None
+    """
+    override = os.environ.get('KEEP_TEXT_INDEX')
+    if override:
+        if override.lower() in ('off', '0', 'false'):
+            return None
+        return Path(override)
+    if Path('.claude').is_dir():
+        return Path(DEFAULT_INDEX_PATH)
+    return None
+
+
+class TextIndex:
+    """SQLite-backed BM25 index of issue text, updated per issue by `updatedAt`"""
+
+    def __init__(self, path: Path):
+        # Imported on open: scripts that only check for an index stay light
+        import sqlite3
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path), timeout=10)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS docs (
+                number INTEGER PRIMARY KEY,
+                updated_at TEXT,
+                length INTEGER NOT NULL,
+                terms TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                number INTEGER NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, number)
+            ) WITHOUT ROWID;
+        """)
+        self._indexed: Optional[Dict[int, Optional[str]]] = None
+        self._pending: Dict[int, Tuple[Optional[str], str]] = {}
+        # Set by callers that hit a database error: queued issues are
+        # dropped rather than written on close
+        self.failed = False
+
+    def close(self):
+        try:
+            if not self.failed:
+                self.flush()
+        finally:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, number: Any, updated_at: Optional[str], title: str, body: Optional[str]) -> bool:
+        """
+        Queue an issue for (re)indexing unless its `updatedAt` is unchanged
+
+        Args:
+            number: Issue number
+            updated_at: The issue's `updatedAt`; issues without one are
+                re-indexed every time
+            title: Issue title
+            body: Issue body
+
+        Returns:
+            True if the issue will be re-indexed
+        """
+        if self._indexed is None:
+            self._indexed = dict(self.conn.execute('SELECT number, updated_at FROM docs'))
+        number = int(number)
+        if updated_at and self._indexed.get(number) == updated_at:
+            return False
+        self._indexed[number] = updated_at
+        self._pending[number] = (updated_at, f"{title}\n{body or ''}")
+        if len(self._pending) >= WRITE_BATCH:
+            self.flush()
+        return True
+
+    def flush(self):
+        """Write queued issues"""
+        if not self._pending:
+            return
+        numbers = list(self._pending)
+        with self.conn:
+            stale = [
+                (term, number)
+                for number, terms in self.conn.execute(
+                    f"SELECT number, terms FROM docs WHERE number IN ({','.join('?' * len(numbers))})",
+                    numbers
+                )
+                for term in terms.split()
+            ]
+            self.conn.executemany('DELETE FROM postings WHERE term = ? AND number = ?', stale)
+
+            docs = []
+            postings = []
+            for number, (updated_at, text) in self._pending.items():
+                counts = term_counts(text)
+                docs.append((number, updated_at, sum(counts.values()), ' '.join(counts)))
+                postings.extend((term, number, tf) for term, tf in counts.items())
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO docs (number, updated_at, length, terms) VALUES (?, ?, ?, ?)',
+                docs
+            )
+            self.conn.executemany('INSERT INTO postings (term, number, tf) VALUES (?, ?, ?)', postings)
+        self._pending = {}
+
+    def search(
+        self,
+        text: str,
+        limit: int,
+        candidates: Optional[Iterable[Any]] = None,
+        exclude: Iterable[Any] = ()
+    ) -> List[Tuple[int, float, List[str]]]:
+        """
+        Rank indexed issues against `text` with BM25
+
+        Only the postings of the query's MAX_QUERY_TERMS rarest terms are
+        read (terms in more than MAX_DF_FRACTION of issues are dropped).
+
+        Args:
+            text: Query text
+            limit: Number of results
+            candidates: Only rank these issue numbers (default: all)
+            exclude: Issue numbers never to return
+
+        Returns:
+            (number, score, matched terms by contribution) for the best
+            `limit` issues, best first
+        """
+        self.flush()
+        count, total_length = self.conn.execute('SELECT COUNT(*), SUM(length) FROM docs').fetchone()
+        if not count:
+            return []
+        avg_length = (total_length or 0) / count or 1.0
+
+        weighted = []
+        for term in term_counts(text):
+            df = self.conn.execute('SELECT COUNT(*) FROM postings WHERE term = ?', (term,)).fetchone()[0]
+            if 0 < df <= count * MAX_DF_FRACTION:
+                weighted.append((math.log(1 + (count - df + 0.5) / (df + 0.5)), term))
+        weighted = heapq.nlargest(MAX_QUERY_TERMS, weighted)
+
+        allowed = None if candidates is None else {int(number) for number in candidates}
+        skip = {int(number) for number in exclude}
+        scores: Dict[int, float] = {}
+        matched: Dict[int, List[Tuple[float, str]]] = {}
+        for idf, term in weighted:
+            rows = self.conn.execute(
+                'SELECT p.number, p.tf, d.length FROM postings p JOIN docs d ON d.number = p.number '
+                'WHERE p.term = ?',
+                (term,)
+            )
+            for number, tf, length in rows:
+                if number in skip or (allowed is not None and number not in allowed):
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                contribution = idf * tf * (BM25_K1 + 1) / (tf + norm)
+                scores[number] = scores.get(number, 0.0) + contribution
+                matched.setdefault(number, []).append((contribution, term))
+
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [
+            (number, score, [term for _, term in sorted(matched[number], key=lambda item: (-item[0], item[1]))])
+            for number, score in best
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Indexed issue and posting counts"""
+        self.flush()
+        docs = self.conn.execute('SELECT COUNT(*) FROM docs').fetchone()[0]
+        postings = self.conn.execute('SELECT COUNT(*) FROM postings').fetchone()[0]
+        terms = self.conn.execute('SELECT COUNT(DISTINCT term) FROM postings').fetchone()[0]
+        return {'issues': docs, 'terms': terms, 'postings': postings}
+
+
+def open_text_index() -> Optional[TextIndex]:
+    """
+    Open the project text index
+
+    Returns:
+        TextIndex, or None when indexing is disabled or the file is unusable
+    """
+    path = index_path()
+    if path is None:
+        return None
+    import sqlite3
+
+    try:
+        return TextIndex(path)
+    except (sqlite3.Error, OSError):
+        return None
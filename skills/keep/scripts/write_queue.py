@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Durable queue for GitHub writes made while offline
+
+Comments and closes that can't reach GitHub are appended to a journal
+(.claude/queue/pending.jsonl) and replayed later by
+`github_sync.py flush`. The journal is append-only, one JSON record per
+line:
+
+    {"seq": 3, "op": "comment", "issue": "12", "body": "...", "queued_at": "..."}
+    {"seq": 4, "op": "close", "issue": "12", "reason": "...", "queued_at": "..."}
+    {"ack": [3]}
+    {"posted": [4]}
+
+`posted` records a close whose reason has already gone out as a comment
+while the close itself is still pending, so a retry only repeats the
+close. Every append is fsynced before returning, and a torn last line
+left by a crash is ignored, so a queued write is never lost and an
+acknowledged one is never replayed. Once nothing is pending the journal
+is emptied.
+
+Before replay, pending writes are coalesced per issue (see plan_flush):
+all comments and close reasons for an issue become one comment, and
+repeated closes become one close.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+
+DEFAULT_QUEUE_PATH = '.claude/queue/pending.jsonl'
+
+# Separator between coalesced comments
+COMMENT_SEPARATOR = '\n\n---\n\n'
+
+
+def queue_path() -> Optional[Path]:
+    """
+    Resolve the journal location
+
+    Returns:
+        Path from KEEP_WRITE_QUEUE, else .claude/queue/pending.jsonl when
+        .claude/ exists, else None (queueing unavailable)
+    """
+    override = os.environ.get('KEEP_WRITE_QUEUE')
+    if override:
+        return Path(override)
+    if Path('.claude').is_dir():
+        return Path(DEFAULT_QUEUE_PATH)
+    return None
+
+
+class WriteQueue:
+    """Append-only journal of pending GitHub writes"""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    @contextmanager
+    def locked(self) -> Iterator['WriteQueue']:
+        """Hold an exclusive lock (one flush at a time across processes)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix('.lock'), 'w') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield self
+
+    def _records(self) -> List[Dict[str, Any]]:
+        try:
+            data = self.path.read_text(encoding='utf-8')
+        except OSError:
+            return []
+        records = []
+        for line in data.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Torn write from a crash
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+        return records
+
+    def _append(self, records: List[Dict[str, Any]]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = ''.join(json.dumps(record) + '\n' for record in records)
+        with open(self.path, 'a+b') as f:
+            # Start on a fresh line if a crash left a torn record behind
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    payload = '\n' + payload
+            f.write(payload.encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """
+        Queued operations not yet acknowledged, in queue order
+
+        Closes whose reason was already posted come back without it.
+        """
+        records = self._records()
+        acked: Set[int] = set()
+        posted: Set[int] = set()
+        for record in records:
+            acked.update(record.get('ack', []))
+            posted.update(record.get('posted', []))
+        operations = []
+        for record in records:
+            if 'op' not in record or record['seq'] in acked:
+                continue
+            if record['seq'] in posted:
+                record = {key: value for key, value in record.items() if key != 'reason'}
+            operations.append(record)
+        return operations
+
+    def append(self, op: str, issue_number: str, **fields: Any) -> Dict[str, Any]:
+        """
+        Queue one write
+
+        Args:
+            op: 'comment' or 'close'
+            issue_number: Issue number (without #)
+            **fields: Operation data (body for comments, reason for closes)
+
+        Returns:
+            The journal record
+        """
+        with self.locked():
+            records = self._records()
+            seq = max((record.get('seq', 0) for record in records), default=0) + 1
+            record = {
+                'seq': seq,
+                'op': op,
+                'issue': str(issue_number),
+                **fields,
+                'queued_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            }
+            self._append([record])
+        return record
+
+    def ack(self, seqs: List[int]):
+        """Mark operations done (call with the lock held)"""
+        if seqs:
+            self._append([{'ack': sorted(seqs)}])
+
+    def posted(self, seqs: List[int]):
+        """Mark close reasons as posted (call with the lock held)"""
+        if seqs:
+            self._append([{'posted': sorted(seqs)}])
+
+    def compact(self):
+        """Empty the journal if nothing is pending (call with the lock held)"""
+        if not self.pending() and self.path.exists():
+            tmp = self.path.with_suffix('.tmp')
+            tmp.write_text('')
+            tmp.replace(self.path)
+
+
+def open_write_queue() -> Optional[WriteQueue]:
+    """Open the write queue, or return None outside a Keep project"""
+    path = queue_path()
+    return WriteQueue(path) if path is not None else None
+
+
+def plan_flush(operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Coalesce pending operations into the fewest API calls
+
+    Per issue (in order of first appearance):
+    - All comment bodies and close reasons are merged, in queue order,
+      into one comment (duplicate close reasons are kept once)
+    - Any number of closes become a single close, made after the comment
+
+    Args:
+        operations: Pending records from WriteQueue.pending()
+
+    Returns:
+        One step per issue with keys: issue, comment (merged body or
+        None), close (bool), comment_seqs, close_seqs, reason_seqs
+        (the closes whose reasons are in the comment)
+    """
+    steps: Dict[str, Dict[str, Any]] = {}
+    for record in operations:
+        step = steps.setdefault(record['issue'], {
+            'issue': record['issue'],
+            'parts': [],
+            'close': False,
+            'comment_seqs': [],
+            'close_seqs': [],
+            'reason_seqs': [],
+        })
+        if record['op'] == 'comment':
+            step['parts'].append(record.get('body', ''))
+            step['comment_seqs'].append(record['seq'])
+        elif record['op'] == 'close':
+            reason = record.get('reason')
+            if reason:
+                if reason not in step['parts']:
+                    step['parts'].append(reason)
+                step['reason_seqs'].append(record['seq'])
+            step['close'] = True
+            step['close_seqs'].append(record['seq'])
+
+    plan = []
+    for step in steps.values():
+        parts = step.pop('parts')
+        step['comment'] = COMMENT_SEPARATOR.join(parts) if parts else None
+        plan.append(step)
+    return plan
@@ -0,0 +1,13 @@
+"""
+Shared setup for the Keep script tests
+
+The scripts import each other as flat siblings, so their directory goes
+on sys.path the way running them directly would put it there.
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / 'skills' / 'keep' / 'scripts'
+
+sys.path.insert(0, str(SCRIPTS_DIR))
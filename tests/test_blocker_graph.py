@@ -0,0 +1,64 @@
+"""Tests for transitive blocker analysis (blocker_graph.py)"""
+
+from blocker_graph import analyze_blocker_graph
+
+
+def entry(blockers, state='OPEN'):
+    return {'state': state, 'blockers': [str(b) for b in blockers]}
+
+
+def test_layered_diamond_counts_distinct_dependents():
+    # 20 layers of 2 issues, each blocked by both issues of the layer
+    # before: 2 ** 20 chains end at every bottom issue
+    index = {}
+    previous = []
+    for layer in range(20):
+        current = [str(2 * layer + 1), str(2 * layer + 2)]
+        for number in current:
+            index[number] = entry(previous)
+        previous = current
+
+    assert analyze_blocker_graph(index) == []
+    assert index['1']['unblocks'] == 38
+    assert index['39']['unblocks'] == 0
+    assert index['39']['open_depth'] == 19
+
+
+def test_closed_issues_pass_through_but_are_not_counted():
+    index = {
+        '1': entry([]),
+        '2': entry([1], 'CLOSED'),
+        '3': entry([2]),
+        '4': entry([1, 3]),
+    }
+    analyze_blocker_graph(index)
+
+    assert index['1']['unblocks'] == 2
+    assert index['2']['unblocks'] == 2
+    assert index['4']['open_depth'] == 2
+
+
+def test_cycle_members_count_open_peers_once():
+    index = {
+        '1': entry([2]),
+        '2': entry([1]),
+        '3': entry([1, 2]),
+        '4': entry([3, 99]),
+    }
+    assert analyze_blocker_graph(index) == [['1', '2']]
+
+    assert index['1']['cycle'] == ['1', '2']
+    assert index['1']['unblocks'] == 3
+    assert index['3']['unblocks'] == 1
+    assert index['3']['cycle'] is None
+    # 99 isn't in the index, so it counts as open
+    assert index['4']['open_depth'] == 3
+
+
+def test_long_chain_stays_within_bounds():
+    count = 5000
+    index = {str(n): entry([n - 1] if n > 1 else []) for n in range(1, count + 1)}
+    analyze_blocker_graph(index)
+
+    assert index['1']['unblocks'] == count - 1
+    assert index[str(count)]['open_depth'] == count - 1
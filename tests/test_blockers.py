@@ -0,0 +1,116 @@
+"""Tests for blocker reference parsing and how cross-repository references score (blockers.py)"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from blockers import scan_blockers
+from conftest import SCRIPTS_DIR
+from scoring import score_all_issues
+
+CONTEXT = {'recent_directories': [], 'recent_labels': [], 'recent_issues': []}
+
+
+@pytest.mark.parametrize('body, refs', [
+    ('Depends on #12 and blocked by #7', ['12', '7']),
+    ('Depends on Octo-Org/my.repo#9', ['octo-org/my.repo#9']),
+    ('needs a/b#1, requires a/b#1', ['a/b#1']),
+    ('blocked by other/repo_2#12', ['other/repo_2#12']),
+    ('depends on ./src#3', []),
+    ('depends on ./src/auth#12', []),
+    ('needs ../lib/x#4', []),
+    ('needs ../..#4', []),
+    ('depends on lib/src/auth#12', []),
+    ('depends on src/auth/login#8', []),
+    ('depends on owner/..#5', []),
+    ('depends on owner/.#5', []),
+    ('blocked by -owner/repo#6', []),
+    ('blocked by owner-/repo#6', []),
+    ('depends on foo--bar/repo#6', []),
+    ('depends on foo_bar/repo#7', []),
+    (f"depends on {'a' * 40}/repo#9", []),
+    (f"depends on {'a' * 39}/repo#9", [f"{'a' * 39}/repo#9"]),
+])
+def test_reference_shapes(body, refs):
+    assert scan_blockers(body) == refs
+
+
+def issue(number, body, state='OPEN'):
+    return {'number': number, 'title': f'Issue {number}', 'body': body, 'labels': [], 'state': state,
+            'updatedAt': '2024-01-01T00:00:00Z'}
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy'])
+def test_path_like_reference_is_not_a_blocker(engine):
+    if engine == 'numpy':
+        pytest.importorskip('numpy')
+    issues = [issue(1, 'Tidy up, depends on ./src/auth#12'), issue(2, 'Plain')]
+
+    scored = {result['number']: result for result in score_all_issues(issues, CONTEXT, engine=engine)}
+
+    assert scored[1]['dependency_score'] == 100
+    assert scored[1]['dependency_reason'] == 'no dependencies'
+    assert scored[1]['total_score'] == scored[2]['total_score']
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy'])
+def test_unresolved_cross_repo_reference_counts_as_open(engine):
+    if engine == 'numpy':
+        pytest.importorskip('numpy')
+    issues = [issue(1, 'Blocked by other/repo#12'), issue(2, 'Depends on #1')]
+
+    scored = {result['number']: result for result in score_all_issues(issues, CONTEXT, engine=engine)}
+
+    assert scored[1]['dependency_score'] == 75
+    assert scored[1]['dependency_reason'].startswith('blocked by other/repo#12')
+    assert scored[1]['blocker_depth'] == 1
+    assert scored[2]['blocker_depth'] == 2
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy'])
+def test_resolved_cross_repo_reference_uses_its_state(engine):
+    if engine == 'numpy':
+        pytest.importorskip('numpy')
+    issues = [issue(1, 'Depends on octo/lib#3, blocked by other/repo#12')]
+    known_states = {'octo/lib#3': 'CLOSED', 'other/repo#12': 'OPEN'}
+
+    (scored,) = score_all_issues(issues, CONTEXT, engine=engine, known_states=known_states)
+
+    assert scored['dependency_reason'] == 'blocked by other/repo#12 (octo/lib#3 done)'
+    assert scored['blocker_depth'] == 1
+
+
+def test_snapshot_scores_cross_repo_references_like_the_export(tmp_path):
+    pytest.importorskip('numpy')
+    issues_path = tmp_path / 'issues.json'
+    issues_path.write_text(json.dumps([
+        issue(1, 'depends on ./src/auth#12'),
+        issue(2, 'depends on #1, needs octo/lib#3'),
+        issue(3, 'blocked by other/repo#12'),
+    ]))
+    states_path = tmp_path / 'states.json'
+    states_path.write_text(json.dumps({'octo/lib#3': 'CLOSED'}))
+    env = dict(os.environ, KEEP_DAEMON='off', KEEP_TEXT_INDEX='off', PYTHONHASHSEED='0')
+
+    def run(script, *args):
+        return subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / script), *args],
+            cwd=tmp_path, env=env, capture_output=True, text=True, check=True
+        ).stdout
+
+    run('github_sync.py', 'snapshot', 'issues.snap', '--issues', str(issues_path))
+    for extra, reason in (
+        ([], 'blocked by #1, octo/lib#3'),
+        (['--blocker-states', str(states_path)], 'blocked by #1 (octo/lib#3 done)'),
+    ):
+        from_export = run('score_issues.py', '--issues', str(issues_path), '--json', *extra)
+        from_snapshot = run('score_issues.py', '--snapshot', 'issues.snap', '--json', *extra)
+
+        assert from_snapshot == from_export
+        scored = {result['number']: result for result in json.loads(from_snapshot)}
+        assert scored[1]['dependency_reason'] == 'no dependencies; unblocks 1 issue'
+        assert scored[2]['dependency_reason'] == reason
+        assert scored[3]['dependency_reason'] == 'blocked by other/repo#12'
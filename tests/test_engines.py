@@ -0,0 +1,145 @@
+"""Differential tests for the NumPy scoring engine (scoring.rank_issues_vectorized)"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import scoring
+from conftest import SCRIPTS_DIR
+from scoring import build_issue_index, compact_issues, rank_key, score_all_issues, score_issue
+
+LABELS = ['urgent', 'high', 'High-Priority', 'low', 'low-priority', 'bug', 'auth', 'api']
+DIRECTORIES = ['src/auth', 'src/api', 'lib/db']
+
+
+def random_issues(rng, count):
+    """Issues covering every scoring branch: bad timestamps, unknown and closed blockers, ties"""
+    now = datetime.now(timezone.utc)
+    issues = []
+    for number in rng.sample(range(1, count * 3), count):
+        words = [rng.choice(['fix', 'the', 'login', 'cache']) for _ in range(rng.randint(0, 12))]
+        if rng.random() < 0.3:
+            words.append(rng.choice(DIRECTORIES))
+        for _ in range(rng.choice([0, 0, 1, 3])):
+            verb = rng.choice(['depends on', 'Blocked by', 'requires'])
+            words.append(f"{verb} #{rng.randint(1, count * 3)}")
+        if rng.random() < 0.2:
+            words.append(f"see #{rng.randint(1, 20)}")
+
+        issue = {
+            'number': number,
+            'title': f"Issue {number}",
+            'body': ' '.join(words),
+            'labels': [{'name': name} for name in rng.sample(LABELS, rng.randint(0, 2))],
+            'state': rng.choice(['OPEN', 'OPEN', 'CLOSED']),
+        }
+        roll = rng.random()
+        if roll < 0.05:
+            issue['updatedAt'] = 'not-a-date'
+        elif roll < 0.1:
+            issue['updatedAt'] = ''
+        elif roll < 0.9:
+            updated = now - timedelta(seconds=rng.randint(0, 60 * 86400))
+            issue['updatedAt'] = updated.strftime('%Y-%m-%dT%H:%M:%SZ')
+        issues.append(issue)
+    return issues
+
+
+def random_context(rng):
+    return {
+        'recent_directories': rng.sample(DIRECTORIES, rng.randint(0, 2)),
+        'recent_labels': rng.sample(LABELS, rng.randint(0, 2)),
+        'recent_issues': [str(n) for n in rng.sample(range(1, 20), rng.randint(0, 3))],
+    }
+
+
+def reference_scores(issues, context, top_n, known_states=None):
+    """Every issue scored on its own, then sorted: the path both engines must match"""
+    records = list(compact_issues(issues, context))
+    index = build_issue_index(records, known_states)
+    scored = sorted(
+        (score_issue(record, context, records, index) for record in records),
+        key=lambda result: rank_key(result['total_score'], result['number'])
+    )
+    return scored if top_n is None else scored[:top_n]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_engines_match_the_per_issue_path(seed):
+    pytest.importorskip('numpy')
+    rng = random.Random(seed)
+    issues = random_issues(rng, rng.randint(1, 300))
+    context = random_context(rng)
+    top_n = rng.choice([None, 1, 5, 50])
+
+    expected = json.dumps(reference_scores(issues, context, top_n), indent=2)
+    for engine in ('python', 'numpy'):
+        assert json.dumps(score_all_issues(issues, context, top_n, engine=engine), indent=2) == expected
+
+
+def test_engines_match_with_outside_blocker_states():
+    pytest.importorskip('numpy')
+    rng = random.Random(99)
+    issues = random_issues(rng, 200)
+    context = random_context(rng)
+    known_states = {str(n): rng.choice(['OPEN', 'CLOSED']) for n in range(1, 600)}
+
+    expected = reference_scores(issues, context, None, known_states)
+    for engine in ('python', 'numpy'):
+        assert score_all_issues(issues, context, engine=engine, known_states=known_states) == expected
+
+
+@pytest.mark.parametrize('top_n', [None, 0, 3])
+def test_engines_agree_on_an_empty_backlog(top_n):
+    pytest.importorskip('numpy')
+    context = {'recent_directories': [], 'recent_labels': [], 'recent_issues': []}
+
+    for engine in ('python', 'numpy', 'auto'):
+        assert score_all_issues([], context, top_n, engine=engine) == []
+
+
+def test_numpy_engine_falls_back_without_numpy(monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise AssertionError('vectorized path used without NumPy')
+
+    monkeypatch.setattr(scoring, 'numpy_available', lambda: False)
+    monkeypatch.setattr(scoring, 'rank_issues_vectorized', unavailable)
+    rng = random.Random(7)
+    issues = random_issues(rng, 100)
+    context = random_context(rng)
+
+    assert score_all_issues(issues, context, 5, engine='numpy') == reference_scores(issues, context, 5)
+
+
+def run_cli(*args, cwd):
+    env = dict(os.environ, KEEP_DAEMON='off', KEEP_TEXT_INDEX='off', PYTHONHASHSEED='0')
+    return subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / 'score_issues.py'), *args],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+
+
+def test_cli_output_is_byte_identical_across_engines(tmp_path):
+    pytest.importorskip('numpy')
+    issues_path = tmp_path / 'issues.json'
+    issues_path.write_text(json.dumps(random_issues(random.Random(3), 500)))
+
+    for extra in ([], ['--json']):
+        outputs = [
+            run_cli('--issues', str(issues_path), '--engine', engine, *extra, cwd=tmp_path)
+            for engine in ('python', 'numpy')
+        ]
+        assert [result.returncode for result in outputs] == [0, 0]
+        assert outputs[0].stdout == outputs[1].stdout
+
+
+def test_cli_rejects_an_unknown_engine(tmp_path):
+    result = run_cli('--issues', '/dev/null', '--engine', 'fortran', cwd=tmp_path)
+
+    assert result.returncode == 2
+    assert "invalid choice: 'fortran'" in result.stderr
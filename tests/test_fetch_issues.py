@@ -0,0 +1,135 @@
+"""Tests for concurrent issue fetching through a fake `gh` (github_ops.fetch_issues)"""
+
+import json
+import os
+import sys
+import time
+
+import pytest
+
+import github_ops
+from github_ops import GitHubError, NotFoundError, RateLimitError, fetch_issues
+
+# Sleeps FAKE_GH_DELAY, logs its run to FAKE_GH_LOG, then answers
+# `gh api repos/{owner}/{repo}/issues/N --include`. Issues in
+# FAKE_GH_MISSING are 404s, FAKE_GH_DENIED fail authentication and
+# FAKE_GH_LIMITED hit the rate limit.
+FAKE_GH = '''#!{python}
+import json, os, sys, time
+args = sys.argv[1:]
+if not (args[:1] == ['api'] and '--include' in args and '/issues/' in args[1]):
+    print('fake gh: unsupported command: %s' % ' '.join(args), file=sys.stderr)
+    sys.exit(1)
+number = int(args[1].split('?')[0].rsplit('/', 1)[-1])
+started = time.time()
+time.sleep(float(os.environ.get('FAKE_GH_DELAY', '0')))
+with open(os.environ['FAKE_GH_LOG'], 'a') as log:
+    log.write(json.dumps([number, started, time.time()]) + '\\n')
+
+def listed(name):
+    return str(number) in os.environ.get(name, '').split(',')
+
+if listed('FAKE_GH_MISSING'):
+    print('gh: Not Found (HTTP 404)', file=sys.stderr)
+    sys.exit(1)
+if listed('FAKE_GH_DENIED'):
+    print('gh: HTTP 401: authentication required', file=sys.stderr)
+    sys.exit(1)
+if listed('FAKE_GH_LIMITED'):
+    print('gh: API rate limit exceeded for user', file=sys.stderr)
+    sys.exit(1)
+print('HTTP/2.0 200 OK')
+print('Content-Type: application/json; charset=utf-8')
+print()
+print(json.dumps({{'number': number, 'title': 'Issue %d' % number, 'body': 'Body %d' % number,
+                  'labels': [], 'state': 'open', 'updated_at': '2024-01-01T00:00:00Z'}}))
+'''
+
+
+@pytest.fixture
+def gh_log(tmp_path, monkeypatch):
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    gh = bin_dir / 'gh'
+    gh.write_text(FAKE_GH.format(python=sys.executable))
+    gh.chmod(0o755)
+    log = tmp_path / 'gh.log'
+    log.touch()
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('PATH', f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv('FAKE_GH_LOG', str(log))
+    monkeypatch.setenv('KEEP_RATE_LIMIT', 'off')
+    monkeypatch.delenv('KEEP_GH_BACKEND', raising=False)
+    return log
+
+
+def calls(log):
+    return [json.loads(line) for line in log.read_text().splitlines()]
+
+
+def max_overlap(runs):
+    events = sorted([(start, 1) for _, start, _ in runs] + [(end, -1) for _, _, end in runs])
+    running = peak = 0
+    for _, step in events:
+        running += step
+        peak = max(peak, running)
+    return peak
+
+
+def test_results_keep_input_order_and_skip_duplicates(gh_log):
+    issues = fetch_issues(['5', '3', '5', '9', '1'], concurrency=3, use_cache=False)
+
+    assert [issue['number'] for issue in issues] == [5, 3, 9, 1]
+    assert issues[1]['body'] == 'Body 3'
+    assert sorted(number for number, _, _ in calls(gh_log)) == [1, 3, 5, 9]
+
+
+def test_calls_overlap_up_to_the_concurrency_limit(gh_log, monkeypatch):
+    monkeypatch.setenv('FAKE_GH_DELAY', '0.3')
+    numbers = [str(n) for n in range(1, 9)]
+
+    start = time.perf_counter()
+    issues = fetch_issues(numbers, concurrency=4, use_cache=False)
+    elapsed = time.perf_counter() - start
+
+    assert len(issues) == 8
+    assert max_overlap(calls(gh_log)) == 4
+    # Sequential calls would take at least 8 * 0.3s
+    assert elapsed < 8 * 0.3
+
+
+def test_concurrency_of_one_runs_calls_in_turn(gh_log, monkeypatch):
+    monkeypatch.setenv('FAKE_GH_DELAY', '0.05')
+
+    fetch_issues(['1', '2', '3'], concurrency=1, use_cache=False)
+
+    assert max_overlap(calls(gh_log)) == 1
+
+
+def test_missing_issues_are_skipped(gh_log, monkeypatch, capsys):
+    monkeypatch.setenv('FAKE_GH_MISSING', '2')
+
+    issues = fetch_issues(['1', '2', '3'], use_cache=False)
+
+    assert [issue['number'] for issue in issues] == [1, 3]
+    assert 'Issue #2 not found, skipping' in capsys.readouterr().err
+
+
+def test_a_failed_fetch_is_raised(gh_log, monkeypatch):
+    monkeypatch.setenv('FAKE_GH_DENIED', '2')
+
+    with pytest.raises(GitHubError, match='Authentication failed') as raised:
+        fetch_issues(['1', '2', '3'], use_cache=False)
+
+    assert not isinstance(raised.value, NotFoundError)
+
+
+def test_rate_limit_is_raised_after_retries(gh_log, monkeypatch):
+    monkeypatch.setattr(github_ops.time, 'sleep', lambda seconds: None)
+    monkeypatch.setenv('FAKE_GH_LIMITED', '1')
+
+    with pytest.raises(RateLimitError):
+        fetch_issues(['1'], use_cache=False)
+
+    assert [number for number, _, _ in calls(gh_log)] == [1, 1, 1]
@@ -0,0 +1,365 @@
+"""Tests for the in-process GitHub client against a local stub server (github_http.py)"""
+
+import json
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import github_http
+import github_ops
+from github_http import GitHubHTTPClient, HTTPError
+from github_ops import (
+    GitHubError, NotFoundError, RateLimitError, close_issue, fetch_issue, http_backend, http_call, list_issues,
+    post_comment
+)
+from response_cache import ResponseCache
+
+
+class StubAPI(BaseHTTPRequestHandler):
+    """
+    Answers from `server.script`: one action per request, in order
+
+    Actions: an (int status, body) reply; 'drop' to read the request
+    and close the connection without answering; 'reply-then-close' to
+    answer 200 and close the idle connection without saying so.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def handle_one_request(self):
+        try:
+            super().handle_one_request()
+        except ConnectionError:
+            self.close_connection = True
+
+    def _serve(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        self.server.seen.append((self.command, self.path, body))
+        action = self.server.script.pop(0) if self.server.script else (200, {})
+        if action == 'drop':
+            self.close_connection = True
+            return
+        status, data = (200, {}) if action == 'reply-then-close' else action
+        raw = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+        if action == 'reply-then-close':
+            self.close_connection = True
+
+    do_GET = do_POST = do_PATCH = _serve
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubAPI)
+    server.seen = []
+    server.script = []
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server):
+    client = GitHubHTTPClient('token', f'http://127.0.0.1:{server.server_port}')
+    yield client
+    client.close()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(github_ops.time, 'sleep', lambda seconds: None)
+
+
+def methods(server):
+    return [method for method, _, _ in server.seen]
+
+
+def wait_for_close(client):
+    # Give the server's FIN time to arrive on the idle connection
+    deadline = time.time() + 2
+    while not client._dropped() and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_post_after_idle_close_goes_out_once_on_a_new_connection(server, client):
+    server.script = ['reply-then-close', (201, {'id': 1})]
+    client.request('GET', '/repos/o/r')
+    wait_for_close(client)
+
+    status, _, data = client.request('POST', '/repos/o/r/issues/1/comments', body={'body': 'hi'})
+
+    assert (status, data) == (201, {'id': 1})
+    assert methods(server) == ['GET', 'POST']
+
+
+def test_post_lost_in_flight_is_not_resent(server, client):
+    server.script = ['drop']
+
+    with pytest.raises(HTTPError) as raised:
+        client.request('POST', '/repos/o/r/issues/1/comments', body={'body': 'hi'})
+
+    assert raised.value.status == 0
+    assert not raised.value.retryable
+    assert methods(server) == ['POST']
+
+
+def test_http_call_does_not_retry_a_lost_post(server, client):
+    server.script = ['drop', (201, {'id': 2})]
+
+    with pytest.raises(GitHubError):
+        http_call(lambda: client.request('POST', '/repos/o/r/issues/1/comments', body={'body': 'hi'}))
+
+    assert methods(server) == ['POST']
+
+
+def test_http_call_does_not_retry_a_post_server_error(server, client):
+    server.script = [(502, {'message': 'Bad Gateway'}), (201, {'id': 2})]
+
+    with pytest.raises(GitHubError, match='502'):
+        http_call(lambda: client.request('POST', '/repos/o/r/issues/1/comments', body={'body': 'hi'}))
+
+    assert methods(server) == ['POST']
+
+
+def test_lost_get_is_resent_on_a_fresh_connection(server, client):
+    server.script = ['drop', (200, {'number': 1})]
+
+    status, _, data = client.request('GET', '/repos/o/r/issues/1')
+
+    assert (status, data) == (200, {'number': 1})
+    assert methods(server) == ['GET', 'GET']
+
+
+def test_graphql_query_marked_idempotent_is_retried(server, client):
+    server.script = [(502, {'message': 'Bad Gateway'}), (200, {'data': {}})]
+
+    result = http_call(lambda: client.request('POST', client.graphql_path, body={'query': '{}'}, idempotent=True))
+
+    assert result[2] == {'data': {}}
+    assert methods(server) == ['POST', 'POST']
+
+
+def test_refused_connection_is_retryable_for_any_method():
+    probe = socket.socket()
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    client = GitHubHTTPClient('token', f'http://127.0.0.1:{port}')
+
+    with pytest.raises(HTTPError) as raised:
+        client.request('POST', '/repos/o/r/issues/1/comments', body={'body': 'hi'})
+
+    assert raised.value.status == 0
+    assert raised.value.retryable
+
+
+REST_ISSUES = {
+    n: {'number': n, 'title': f'Issue {n}', 'body': None if n == 2 else f'Body {n}',
+        'labels': [{'node_id': 'L1', 'name': 'bug', 'description': None, 'color': 'f00'}] if n == 1 else [],
+        'state': 'open', 'created_at': f'2024-01-0{n}T00:00:00Z', 'updated_at': f'2024-02-0{n}T00:00:00Z',
+        'html_url': f'https://github.com/o/r/issues/{n}'}
+    for n in range(1, 6)
+}
+
+
+class FakeGitHub(BaseHTTPRequestHandler):
+    """
+    Enough of the REST and GraphQL APIs for the backend functions
+
+    Requests need `Authorization: Bearer t`. While `server.limited` is
+    set, every request is refused as over the rate limit. Issue reads
+    carry an ETag that changes with `updated_at`; `server.not_modified`
+    counts the 304s served.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, data=None, headers=()):
+        raw = json.dumps(data).encode() if data is not None else b''
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _serve(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        self.server.seen.append((self.command, self.path, body, self.client_address[1]))
+        if self.headers.get('Authorization') != 'Bearer t':
+            return self._reply(401, {'message': 'Bad credentials'})
+        if self.server.limited:
+            return self._reply(403, {'message': 'API rate limit exceeded'}, [
+                ('X-RateLimit-Remaining', '0'), ('X-RateLimit-Reset', str(int(time.time()) + 3600))
+            ])
+
+        issue = re.fullmatch(r'/repos/o/r/issues/(\d+)(/comments)?', self.path)
+        if self.command == 'POST' and self.path == '/graphql':
+            return self._graphql(body)
+        if issue and int(issue.group(1)) not in REST_ISSUES:
+            return self._reply(404, {'message': 'Not Found'})
+        if issue and self.command == 'GET':
+            etag = f'"issue-{issue.group(1)}-{REST_ISSUES[int(issue.group(1))]["updated_at"]}"'
+            if self.headers.get('If-None-Match') == etag:
+                self.server.not_modified += 1
+                return self._reply(304, headers=[('ETag', etag)])
+            return self._reply(200, REST_ISSUES[int(issue.group(1))], [('ETag', etag)])
+        if issue and self.command == 'POST' and issue.group(2):
+            return self._reply(201, {'id': 1, 'body': body['body'], 'html_url': 'https://github.com/o/r#c1'})
+        if issue and self.command == 'PATCH':
+            return self._reply(200, dict(REST_ISSUES[int(issue.group(1))], **body))
+        self._reply(404, {'message': 'Not Found'})
+
+    def _graphql(self, body):
+        first = int(re.search(r'issues\(first: (\d+)', body['query']).group(1))
+        offset = int(body['variables']['cursor'] or 0)
+        numbers = sorted(REST_ISSUES, reverse=True)
+        page = numbers[offset:offset + first]
+        more = offset + first < len(numbers)
+        nodes = [{'number': n, 'title': REST_ISSUES[n]['title']} for n in page]
+        self._reply(200, {'data': {'repository': {'issues': {
+            'pageInfo': {'hasNextPage': more, 'endCursor': str(offset + first) if more else None},
+            'nodes': nodes,
+        }}}})
+
+    do_GET = do_POST = do_PATCH = _serve
+
+
+@pytest.fixture
+def github(tmp_path, monkeypatch):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGitHub)
+    server.seen = []
+    server.limited = False
+    server.not_modified = 0
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True).start()
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('KEEP_GH_BACKEND', 'http')
+    monkeypatch.setenv('KEEP_GITHUB_API_URL', f'http://127.0.0.1:{server.server_port}')
+    monkeypatch.setenv('GH_TOKEN', 't')
+    monkeypatch.setenv('GH_REPO', 'o/r')
+    monkeypatch.setenv('KEEP_RATE_LIMIT', 'off')
+    monkeypatch.setattr(github_http, '_token', None)
+    monkeypatch.setattr(github_ops, '_http_backend', None)
+    monkeypatch.setattr(github_ops, '_http_backend_checked', False)
+    yield server
+    backend = github_ops._http_backend
+    if backend is not None:
+        backend[0].close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_issue_returns_the_gh_shape(github):
+    issue = fetch_issue('1', use_cache=False)
+
+    assert issue == {
+        'number': 1, 'title': 'Issue 1', 'body': 'Body 1',
+        'labels': [{'id': 'L1', 'name': 'bug', 'description': '', 'color': 'f00'}],
+        'state': 'OPEN', 'createdAt': '2024-01-01T00:00:00Z', 'updatedAt': '2024-02-01T00:00:00Z',
+        'url': 'https://github.com/o/r/issues/1',
+    }
+    assert fetch_issue('2', use_cache=False)['body'] == ''
+
+
+def test_requests_share_one_keep_alive_connection(github):
+    for number in ('1', '2', '3'):
+        fetch_issue(number, use_cache=False)
+
+    assert len({port for _, _, _, port in github.seen}) == 1
+
+
+def test_list_issues_pages_through_graphql(github):
+    issues = list(list_issues('open', use_cache=False, fields='number,title'))
+
+    assert [issue['number'] for issue in issues] == [5, 4, 3, 2, 1]
+
+    github.seen.clear()
+    assert [issue['number'] for issue in list_issues('open', limit=2, use_cache=False, fields='number')] == [5, 4]
+    assert len(github.seen) == 1
+
+
+def test_comment_and_close_send_the_expected_writes(github):
+    assert post_comment('3', 'Done')['body'] == 'Done'
+    closed = close_issue('3')
+
+    assert closed['state'] == 'CLOSED'
+    assert [(method, path, body) for method, path, body, _ in github.seen] == [
+        ('POST', '/repos/o/r/issues/3/comments', {'body': 'Done'}),
+        ('PATCH', '/repos/o/r/issues/3', {'state': 'closed'}),
+    ]
+
+
+def test_etag_revalidation_is_answered_from_the_response_cache(github, tmp_path):
+    (tmp_path / '.claude').mkdir()
+
+    first = fetch_issue('4', use_cache=False)
+    second = fetch_issue('4', use_cache=False)
+
+    assert second == first
+    assert [path for _, path, _, _ in github.seen] == ['/repos/o/r/issues/4'] * 2
+    assert github.not_modified == 1
+    with ResponseCache(tmp_path / '.claude' / 'cache' / 'responses.db') as cache:
+        assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 1)
+
+
+def test_changed_etag_replaces_the_cached_response(github, tmp_path, monkeypatch):
+    (tmp_path / '.claude').mkdir()
+    fetch_issue('4', use_cache=False)
+    monkeypatch.setitem(REST_ISSUES, 4, dict(REST_ISSUES[4], title='Renamed', updated_at='2024-03-01T00:00:00Z'))
+
+    changed = fetch_issue('4', use_cache=False)
+    assert changed['title'] == 'Renamed'
+    assert github.not_modified == 0
+
+    assert fetch_issue('4', use_cache=False) == changed
+    assert github.not_modified == 1
+    with ResponseCache(tmp_path / '.claude' / 'cache' / 'responses.db') as cache:
+        assert cache.stats()['entries'] == 1
+        assert cache.validators('repos/o/r/issues/4') == {'If-None-Match': '"issue-4-2024-03-01T00:00:00Z"'}
+
+
+def test_missing_issue_raises_not_found(github):
+    with pytest.raises(NotFoundError):
+        fetch_issue('99', use_cache=False)
+
+
+def test_bad_token_fails_authentication(github, monkeypatch):
+    monkeypatch.setenv('GH_TOKEN', 'wrong')
+
+    with pytest.raises(GitHubError, match='Authentication failed'):
+        fetch_issue('1', use_cache=False)
+
+
+def test_exhausted_rate_limit_is_raised_without_waiting(github, monkeypatch):
+    monkeypatch.setattr(github_ops.time, 'sleep', lambda seconds: pytest.fail('waited for the rate limit'))
+    github.limited = True
+
+    with pytest.raises(RateLimitError):
+        fetch_issue('1', use_cache=False)
+
+
+def test_backend_falls_back_to_gh_without_a_token(github, monkeypatch, tmp_path, capsys):
+    monkeypatch.delenv('GH_TOKEN')
+    monkeypatch.delenv('GITHUB_TOKEN', raising=False)
+    monkeypatch.setenv('PATH', str(tmp_path))
+
+    assert http_backend() is None
+    assert 'HTTP backend unavailable' in capsys.readouterr().err
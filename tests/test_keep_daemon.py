@@ -0,0 +1,114 @@
+"""Tests for the daemon's warm state (keep_daemon.KeepDaemon)"""
+
+import json
+import os
+
+import pytest
+
+from issue_cache import IssueCache
+from issue_record import IssueRecord
+from keep_daemon import KeepDaemon
+
+STATE = """# Session State
+
+## Active Work
+
+**Current Issue:** #1 - Session store
+
+## Context
+- Working primarily in src/session/
+"""
+
+ISSUES = [
+    {'number': 1, 'title': 'Session store', 'body': 'src/session/store.py', 'labels': [], 'state': 'OPEN',
+     'createdAt': '2024-01-01T00:00:00Z', 'updatedAt': '2024-01-02T00:00:00Z'},
+    {'number': 2, 'title': 'Docs sidebar renderer', 'body': 'The sidebar renderer drops nested pages.',
+     'labels': [], 'state': 'OPEN', 'createdAt': '2024-01-01T00:00:00Z', 'updatedAt': '2024-01-02T00:00:00Z'},
+    {'number': 3, 'title': 'Login form', 'body': 'Unrelated.', 'labels': [], 'state': 'OPEN',
+     'createdAt': '2024-01-01T00:00:00Z', 'updatedAt': '2024-01-02T00:00:00Z'},
+]
+
+
+def touch(path, text):
+    # Same-second rewrites must still change the stamp
+    path.write_text(text)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ('KEEP_ISSUE_CACHE', 'KEEP_TEXT_INDEX', 'KEEP_DAEMON_SOCKET'):
+        monkeypatch.delenv(name, raising=False)
+    (tmp_path / '.claude' / 'work').mkdir(parents=True)
+    (tmp_path / '.claude' / 'state.md').write_text(STATE)
+    return KeepDaemon()
+
+
+def score(daemon):
+    return daemon.score({'issues_text': json.dumps(ISSUES), 'recent_work': '.claude/state.md'})
+
+
+def by_number(scored, number):
+    return next(result for result in scored if result['number'] == number)
+
+
+def test_unchanged_sources_reuse_scores(daemon):
+    first = score(daemon)
+
+    assert score(daemon) is first
+    assert len(daemon.scores.entries) == 1
+
+
+def test_state_file_edit_invalidates_scores(daemon, tmp_path):
+    before = score(daemon)
+    assert 'mentions src/session' in by_number(before, 1)['continuity_reason']
+
+    touch(tmp_path / '.claude' / 'state.md', STATE.replace('src/session/', 'src/docs/'))
+    after = score(daemon)
+
+    assert 'src/session' not in by_number(after, 1)['continuity_reason']
+
+
+def test_work_file_edit_invalidates_scores(daemon, tmp_path):
+    before = score(daemon)
+    assert 'similar' not in by_number(before, 2)['continuity_reason']
+
+    touch(tmp_path / '.claude' / 'work' / '1.md', 'Fix the docs sidebar renderer for nested pages')
+    after = score(daemon)
+
+    assert by_number(after, 2)['continuity_reason'].startswith('similar to recent work')
+
+
+def test_issues_file_edit_invalidates_scores(daemon, tmp_path):
+    path = tmp_path / 'issues.json'
+    path.write_text(json.dumps(ISSUES))
+    params = {'issues_path': str(path), 'recent_work': '.claude/state.md'}
+    assert by_number(daemon.score(params), 3)['title'] == 'Login form'
+
+    touch(path, json.dumps([dict(issue, title='Sign-in form') if issue['number'] == 3 else issue
+                            for issue in ISSUES]))
+
+    assert by_number(daemon.score(params), 3)['title'] == 'Sign-in form'
+
+
+def test_issue_cache_sync_invalidates_context(daemon, tmp_path):
+    assert daemon._context('.claude/state.md')['recent_labels'] == []
+
+    with IssueCache(tmp_path / '.claude' / 'cache' / 'issues.db') as cache:
+        cache.upsert([{'number': 1, 'title': 'Session store', 'labels': [{'name': 'area: auth'}],
+                       'state': 'OPEN', 'updatedAt': '2024-01-03T00:00:00Z'}])
+    path = tmp_path / '.claude' / 'cache' / 'issues.db'
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert daemon._context('.claude/state.md')['recent_labels'] == ['area: auth']
+
+
+def test_memo_keeps_records_not_issue_bodies(daemon):
+    score(daemon)
+
+    (records,) = [value for _, value in daemon.records.entries.values()]
+    assert all(isinstance(record, IssueRecord) for record in records)
+    assert [record.number for record in records] == [1, 2, 3]
@@ -0,0 +1,121 @@
+"""Tests for phase tracing (keep_trace.py, score_issues.py --profile)"""
+
+import atexit
+import json
+import re
+
+import pytest
+
+import issue_record
+import keep_trace
+import scoring
+
+STATE = """# Session State
+
+## Active Work
+
+**Current Issue:** #1 - Session store
+
+## Context
+- Working primarily in src/session/
+"""
+
+ISSUES = [
+    {'number': 1, 'title': 'Session store', 'body': 'src/session/store.py', 'labels': [], 'state': 'OPEN',
+     'updatedAt': '2024-01-02T00:00:00Z'},
+    {'number': 2, 'title': 'Login form', 'body': 'Depends on #1', 'labels': [{'name': 'urgent'}],
+     'state': 'OPEN', 'updatedAt': '2024-01-02T00:00:00Z'},
+]
+
+PHASES = [
+    'parse_state', 'load.decode', 'load.compact_issue', 'score.parse_blockers', 'score.continuity_match',
+    'score.index', 'score', 'score.continuity', 'score.priority', 'score.freshness', 'score.dependency',
+    'sort', 'format',
+]
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ('KEEP_TRACE', 'KEEP_TEXT_INDEX', 'KEEP_DAEMON_SOCKET'):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv('KEEP_DAEMON', 'off')
+    (tmp_path / '.claude').mkdir()
+    (tmp_path / '.claude' / 'state.md').write_text(STATE)
+    (tmp_path / 'issues.json').write_text(json.dumps(ISSUES))
+
+    # Tracing rebinds scoring functions and registers an exit hook; undo both
+    monkeypatch.setattr(keep_trace, '_tracer', None)
+    monkeypatch.setattr(keep_trace, '_configured', False)
+    for name in scoring.TRACED_COMPONENTS:
+        monkeypatch.setattr(scoring, name, getattr(scoring, name))
+    monkeypatch.setattr(issue_record, 'parse_blockers', issue_record.parse_blockers)
+    monkeypatch.setattr(scoring.ContinuityMatcher, 'match', scoring.ContinuityMatcher.match)
+    monkeypatch.setattr(scoring.ScoreMemo, 'match', scoring.ScoreMemo.match)
+    yield tmp_path
+    if keep_trace._tracer is not None:
+        atexit.unregister(keep_trace._tracer.flush)
+
+
+def phases(report):
+    return {line.split()[0] for line in report.splitlines()[1:]}
+
+
+@pytest.mark.parametrize('engine', ['python', 'auto'])
+def test_profile_reports_every_scoring_phase(project, capsys, engine):
+    scoring.main(['--issues', 'issues.json', '--json', '--profile', '--engine', engine])
+    keep_trace.get_tracer().flush()
+
+    out, err = capsys.readouterr()
+    assert sorted(issue['number'] for issue in json.loads(out)) == [1, 2]
+    assert set(PHASES) <= phases(err)
+    assert 'Trace written to .claude/cache/trace.jsonl' in err
+
+
+def test_trace_file_counts_hot_functions(project, capsys):
+    scoring.main(['--issues', 'issues.json', '--json', '--profile'])
+    keep_trace.get_tracer().flush()
+
+    records = keep_trace.read_trace(str(project / '.claude' / 'cache' / 'trace.jsonl'))
+    aggregates = {record['name']: record['args']['calls'] for record in records if record['cat'] == 'aggregate'}
+    assert aggregates['score.parse_blockers'] == 2
+    assert aggregates['load.compact_issue'] == 2
+    assert all(record['process'] == 'score_issues' for record in records)
+
+
+def test_chrome_trace_from_keep_trace(project, monkeypatch, capsys):
+    path = project / 'trace.json'
+    monkeypatch.setenv('KEEP_TRACE', str(path))
+
+    scoring.main(['--issues', 'issues.json', '--json'])
+    keep_trace.get_tracer().flush()
+
+    assert 'phase' not in capsys.readouterr().err
+    records = keep_trace.read_trace(str(path))
+    assert records[0] == {'name': 'process_name', 'ph': 'M', 'pid': records[1]['pid'],
+                          'args': {'name': 'score_issues'}}
+    assert {'parse_state', 'score.parse_blockers'} <= {record['name'] for record in records}
+
+
+def test_tracing_is_off_by_default(project):
+    assert keep_trace.get_tracer() is None
+    assert keep_trace.span('score') is keep_trace.span('format')
+
+
+def test_report_sums_calls_and_time():
+    records = [
+        {'name': 'score', 'ph': 'X', 'dur': 2000.0, 'args': {}},
+        {'name': 'gh', 'ph': 'X', 'dur': 1000.0, 'args': {}},
+        {'name': 'gh', 'ph': 'X', 'dur': 3000.0, 'args': {}},
+        {'name': 'score.priority', 'ph': 'X', 'dur': 500.0, 'args': {'calls': 10}},
+        {'name': 'process_name', 'ph': 'M', 'args': {'name': 'x'}},
+    ]
+
+    lines = keep_trace.format_report(records).splitlines()
+
+    assert [line.split()[:4] for line in lines[1:]] == [
+        ['gh', '2', '4.00', '2.000'],
+        ['score', '1', '2.00', '2.000'],
+        ['score.priority', '10', '0.50', '0.050'],
+    ]
+    assert re.match(r'phase\s+calls\s+total ms\s+mean ms', lines[0])
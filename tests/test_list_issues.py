@@ -0,0 +1,206 @@
+"""Tests for issue listing and the issue cache sync (github_ops.list_issues, sync_issue_cache)"""
+
+import json
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+import github_ops
+import issue_cache
+from conftest import SCRIPTS_DIR
+from github_ops import (
+    CLOSED_ISSUE_FIELDS, ISSUE_FIELDS, RECONCILE_INTERVAL, GitHubError, list_issues, sync_issue_cache,
+)
+from issue_cache import IssueCache
+
+ISSUES = [
+    {'number': 3, 'title': 'Open', 'body': 'open body', 'labels': [], 'state': 'OPEN',
+     'createdAt': '2024-01-03T00:00:00Z', 'updatedAt': '2024-01-05T00:00:00Z', 'url': 'u3'},
+    {'number': 2, 'title': 'Closed', 'body': 'closed body', 'labels': [], 'state': 'CLOSED',
+     'createdAt': '2024-01-02T00:00:00Z', 'updatedAt': '2024-01-06T00:00:00Z', 'url': 'u2'},
+    {'number': 1, 'title': 'Old', 'body': 'old body', 'labels': [], 'state': 'OPEN',
+     'createdAt': '2024-01-01T00:00:00Z', 'updatedAt': '2024-01-04T00:00:00Z', 'url': 'u1'},
+]
+
+# A month after ISSUES were updated; closed issues are synced from 2023-11-03
+NOW = datetime(2024, 2, 1, tzinfo=timezone.utc).timestamp()
+HISTORY = '2023-11-03T00:00:00Z'
+
+
+class FakePages:
+    """Serves `issues` (default ISSUES) one per page, projected to the requested fields"""
+
+    def __init__(self, monkeypatch, fail_after=None):
+        self.calls = []
+        self.issues = [dict(issue) for issue in ISSUES]
+        self.fail_after = fail_after
+        monkeypatch.setattr(github_ops, 'iter_issue_pages', self)
+
+    def __call__(self, state='open', fields=None, since=None, order='created', page_size=100):
+        self.calls.append((state, fields, since))
+        names = (fields or ISSUE_FIELDS).split(',')
+        served = 0
+        for issue in self.issues:
+            if state != 'all' and issue['state'] != state.upper():
+                continue
+            if since and issue['updatedAt'] < since:
+                continue
+            if self.fail_after is not None and served >= self.fail_after:
+                raise GitHubError('GitHub command failed: connection reset')
+            served += 1
+            yield [{name: issue[name] for name in names}]
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    path = tmp_path / 'issues.db'
+    monkeypatch.setattr(issue_cache, 'open_cache', lambda: IssueCache(path))
+    with IssueCache(path) as cache:
+        yield cache
+
+
+def test_sync_stores_closed_issues_without_bodies(cache, monkeypatch):
+    pages = FakePages(monkeypatch)
+
+    assert sync_issue_cache(cache, now=NOW) == 3
+
+    assert pages.calls == [('open', ISSUE_FIELDS, None), ('closed', CLOSED_ISSUE_FIELDS, HISTORY)]
+    assert cache.get('3')['body'] == 'open body'
+    assert 'body' not in cache.get('2')
+    assert cache.watermark == '2024-01-06T00:00:00Z'
+
+    pages.calls.clear()
+    sync_issue_cache(cache, now=NOW)
+    assert [since for _, _, since in pages.calls] == ['2024-01-06T00:00:00Z'] * 2
+
+
+def test_first_sync_skips_closed_issues_before_the_history_window(cache, monkeypatch):
+    pages = FakePages(monkeypatch)
+    now = datetime(2024, 6, 1, tzinfo=timezone.utc).timestamp()
+
+    assert sync_issue_cache(cache, now=now) == 2
+
+    assert pages.calls[1] == ('closed', CLOSED_ISSUE_FIELDS, '2024-03-03T00:00:00Z')
+    assert cache.get('2') is None
+    assert cache.watermark == '2024-01-05T00:00:00Z'
+
+
+def test_incremental_sync_merges_updates_and_advances_the_watermark(cache, monkeypatch):
+    pages = FakePages(monkeypatch)
+    sync_issue_cache(cache, now=NOW)
+    pages.issues[0].update(title='Open, renamed', updatedAt='2024-01-07T00:00:00Z')
+    pages.issues.insert(0, {**ISSUES[0], 'number': 4, 'title': 'New', 'updatedAt': '2024-01-08T00:00:00Z'})
+
+    # Issue 2 was updated exactly at the watermark, so it comes again
+    assert sync_issue_cache(cache, now=NOW + 60) == 3
+
+    assert cache.get('3')['title'] == 'Open, renamed'
+    assert cache.get('4')['title'] == 'New'
+    assert cache.get('1')['title'] == 'Old'
+    assert cache.watermark == '2024-01-08T00:00:00Z'
+
+
+def test_reconcile_drops_issues_github_no_longer_lists(cache, monkeypatch):
+    pages = FakePages(monkeypatch)
+    sync_issue_cache(cache, now=NOW)
+    del pages.issues[2]  # issue 1, deleted
+
+    sync_issue_cache(cache, now=NOW + 60)
+    assert cache.get('1') is not None
+    assert all(fields != 'number' for _, fields, _ in pages.calls)
+
+    pages.calls.clear()
+    sync_issue_cache(cache, now=NOW + RECONCILE_INTERVAL)
+    assert pages.calls[2:] == [('open', 'number', None), ('closed', 'number', '2023-11-04T00:00:00Z')]
+    assert cache.get('1') is None
+    assert cache.get('2') is not None and cache.get('3') is not None
+    assert cache.last_reconcile > 0
+
+    pages.calls.clear()
+    sync_issue_cache(cache, now=NOW + RECONCILE_INTERVAL + 60)
+    assert len(pages.calls) == 2
+
+
+def test_invalidated_issue_is_synced_again(cache, monkeypatch):
+    pages = FakePages(monkeypatch)
+    sync_issue_cache(cache, now=NOW)
+    assert cache.is_fresh()
+
+    # As after close_issue: GitHub has the change, the cache drops its copy
+    pages.issues[0].update(state='CLOSED', updatedAt='2024-01-09T00:00:00Z')
+    cache.invalidate('3')
+    assert cache.get('3') is None
+    assert not cache.is_fresh()
+
+    sync_issue_cache(cache, now=NOW + 60)
+    assert cache.get('3')['state'] == 'CLOSED'
+    assert cache.watermark == '2024-01-09T00:00:00Z'
+
+    pages.calls.clear()
+    assert [issue['number'] for issue in list_issues('open')] == [1]
+    assert pages.calls == []
+
+
+def test_interrupted_sync_keeps_the_old_watermark(cache, monkeypatch):
+    FakePages(monkeypatch, fail_after=1)
+
+    with pytest.raises(GitHubError):
+        sync_issue_cache(cache)
+
+    assert cache.watermark is None
+    assert not cache.is_fresh()
+
+
+def test_stale_cache_serves_a_projection_without_syncing(cache, monkeypatch):
+    pages = FakePages(monkeypatch)
+
+    listed = list(list_issues('open', fields='number,title'))
+
+    assert listed == [{'number': 3, 'title': 'Open'}, {'number': 1, 'title': 'Old'}]
+    assert pages.calls == [('open', 'number,title', None)]
+    assert cache.watermark is None
+
+
+def test_closed_issues_are_listed_from_github(cache, monkeypatch):
+    pages = FakePages(monkeypatch)
+    sync_issue_cache(cache, now=NOW)
+    pages.calls.clear()
+
+    listed = list(list_issues('closed'))
+    assert listed[0]['body'] == 'closed body'
+    assert pages.calls == [('closed', None, None)]
+
+    pages.calls.clear()
+    assert list(list_issues('closed', fields='number,state')) == [{'number': 2, 'state': 'CLOSED'}]
+    assert pages.calls == [('closed', 'number,state', None)]
+
+
+def test_list_issues_command_closes_the_array_on_error(tmp_path):
+    # A fake gh that serves one page claiming another, then fails in a
+    # way gh_command doesn't retry
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    page = {'data': {'repository': {'issues': {
+        'pageInfo': {'hasNextPage': True, 'endCursor': 'c1'},
+        'nodes': [{'number': 1, 'title': 'First'}],
+    }}}}
+    gh = bin_dir / 'gh'
+    gh.write_text(
+        '#!/bin/sh\n'
+        'case "$*" in *cursor=c1*) echo "gh: authentication token expired" >&2; exit 1;; esac\n'
+        f"echo '{json.dumps(page)}'\n"
+    )
+    gh.chmod(0o755)
+    env = {'PATH': f"{bin_dir}:/usr/bin:/bin", 'KEEP_RATE_LIMIT': 'off', 'KEEP_DAEMON': 'off'}
+
+    result = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / 'github_sync.py'), 'list-issues', '--fields', 'number,title',
+         '--no-cache'],
+        cwd=tmp_path, env=env, capture_output=True, text=True
+    )
+
+    assert result.returncode == 1
+    assert json.loads(result.stdout) == [{'number': 1, 'title': 'First'}]
+    assert 'listing incomplete' in result.stderr
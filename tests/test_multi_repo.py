@@ -0,0 +1,82 @@
+"""Tests for scoring several repositories against one state.md (multi_repo.py)"""
+
+import pytest
+
+import github_ops
+from multi_repo import merge_rankings, parse_repos, score_repos
+
+STATE = """# Session State
+
+## Active Work
+
+**Current Issue:** #1 - Session store
+
+## Recent Work
+
+**Previous Issue:** octo/web#2 - Login page (Completed 2024-01-01)
+"""
+
+
+def issue(number, body):
+    return {'number': number, 'title': f'Issue {number}', 'body': body, 'labels': [], 'state': 'OPEN',
+            'updatedAt': '2024-01-01T00:00:00Z'}
+
+
+BACKLOGS = {
+    'octo/api': [issue(5, 'Follow-up to #1'), issue(6, 'Follow-up to #2')],
+    'octo/web': [issue(5, 'Follow-up to #1'), issue(6, 'Follow-up to #2')],
+}
+
+
+@pytest.fixture
+def backlogs(tmp_path, monkeypatch):
+    monkeypatch.setenv('KEEP_DAEMON', 'off')
+    state = tmp_path / '.claude' / 'state.md'
+    state.parent.mkdir()
+    state.write_text(STATE)
+
+    def iter_issue_pages(state='open', fields=None, repo=None, **kwargs):
+        yield BACKLOGS[repo]
+
+    monkeypatch.setattr(github_ops, 'iter_issue_pages', iter_issue_pages)
+    monkeypatch.setattr(github_ops, 'resolve_issue_states', lambda refs: {})
+    return str(state)
+
+
+def test_bare_references_in_state_belong_to_the_first_repository(backlogs):
+    results, cycles = score_repos(['octo/api', 'octo/web'], backlogs, workers=1)
+
+    reasons = {f"{result['repo']}#{result['number']}": result['continuity_reason'] for result in results}
+    assert reasons == {
+        'octo/api#5': 'references #1',
+        'octo/api#6': 'no continuity',
+        'octo/web#5': 'no continuity',
+        'octo/web#6': 'references #2',
+    }
+    assert cycles == {}
+
+
+def test_repository_order_picks_the_primary(backlogs):
+    results, _ = score_repos(['octo/web', 'octo/api'], backlogs, workers=1)
+
+    referenced = {(result['repo'], result['number']) for result in results if result['continuity_score']}
+    assert referenced == {('octo/web', 5), ('octo/web', 6)}
+
+
+def test_parse_repos():
+    assert parse_repos(' Octo/API, octo/web,,octo/api ') == ['octo/api', 'octo/web']
+    with pytest.raises(ValueError):
+        parse_repos('octo')
+    with pytest.raises(ValueError):
+        parse_repos('octo/api#1')
+
+
+def test_merge_rankings_orders_by_score_number_then_repo():
+    rankings = [
+        [{'repo': 'b/b', 'number': 1, 'total_score': 90}, {'repo': 'b/b', 'number': 3, 'total_score': 50}],
+        [{'repo': 'a/a', 'number': 1, 'total_score': 90}, {'repo': 'a/a', 'number': 2, 'total_score': 50}],
+    ]
+
+    merged = merge_rankings(rankings, 3)
+
+    assert [(result['repo'], result['number']) for result in merged] == [('a/a', 1), ('b/b', 1), ('a/a', 2)]
@@ -0,0 +1,167 @@
+"""Tests for the shared rate limit budget (rate_limit.py)"""
+
+import json
+import time
+
+import pytest
+
+import rate_limit
+from github_ops import record_rate_limit
+from rate_limit import PACE_THRESHOLD, BudgetExhausted, RateLimitScheduler, get_scheduler, state_path
+
+
+@pytest.fixture
+def github_limits(monkeypatch):
+    """What `gh api rate_limit` reports (None: the call fails); `calls` counts queries"""
+    class Limits:
+        resources = None
+        calls = 0
+
+    def fetch():
+        Limits.calls += 1
+        return json.loads(json.dumps(Limits.resources)) if Limits.resources is not None else None
+
+    monkeypatch.setattr(rate_limit, 'fetch_rate_limits', fetch)
+    return Limits
+
+
+@pytest.fixture
+def slept(monkeypatch):
+    waits = []
+    monkeypatch.setattr(rate_limit.time, 'sleep', waits.append)
+    return waits
+
+
+@pytest.fixture
+def scheduler(tmp_path, github_limits, slept):
+    return RateLimitScheduler(tmp_path / 'keep' / 'rate_limit.json', max_wait=60)
+
+
+def bucket(scheduler, resource='graphql'):
+    return json.loads(scheduler.path.read_text())['buckets'][resource]
+
+
+def test_state_file_lives_in_the_user_cache(tmp_path, monkeypatch):
+    monkeypatch.delenv('KEEP_RATE_LIMIT_STATE', raising=False)
+    monkeypatch.delenv('XDG_CACHE_HOME', raising=False)
+    monkeypatch.setenv('HOME', str(tmp_path))
+    assert state_path() == tmp_path / '.cache' / 'keep' / 'rate_limit.json'
+
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'xdg'))
+    assert state_path() == tmp_path / 'xdg' / 'keep' / 'rate_limit.json'
+
+
+def test_unknown_budget_is_fetched_once_and_spent(scheduler, github_limits, slept):
+    github_limits.resources = {'graphql': {'limit': 5000, 'remaining': 4000, 'reset': time.time() + 3600}}
+
+    assert scheduler.acquire() == 0.0
+    assert scheduler.acquire() == 0.0
+
+    assert github_limits.calls == 1
+    assert bucket(scheduler)['remaining'] == 3998
+    assert slept == []
+
+
+def test_budget_refills_after_the_reset_time(scheduler, github_limits):
+    reset = time.time() - 1
+    scheduler.record('graphql', 5000, 0, reset)
+
+    scheduler.acquire()
+
+    refilled = bucket(scheduler)
+    assert refilled['remaining'] == 4999
+    assert refilled['reset'] > reset + 3000
+    assert github_limits.calls == 0
+
+
+def test_low_budget_is_paced_until_the_reset(scheduler, github_limits, slept):
+    reset = time.time() + 100
+    scheduler.record('graphql', 5000, 10, reset)
+
+    assert scheduler.acquire() == 0.0
+    second = scheduler.acquire()
+
+    # 10 requests left for ~100 s: one every ~10 s
+    assert 9 < second <= 10
+    assert slept == [second]
+    assert bucket(scheduler)['remaining'] == 8
+    assert github_limits.calls == 1  # refresh attempted while running low
+
+
+def test_exhausted_budget_waits_for_the_reset_or_fails_fast(scheduler, slept):
+    scheduler.record('core', 5000, 0, time.time() + 30)
+    assert 29 < scheduler.acquire('core') <= 30
+    assert bucket(scheduler, 'core')['remaining'] == 4999
+
+    scheduler.record('core', 5000, 0, time.time() + 600)
+    with pytest.raises(BudgetExhausted, match='core budget exhausted'):
+        scheduler.acquire('core')
+    assert len(slept) == 1
+
+
+def test_response_headers_update_the_budget(scheduler):
+    reset = time.time() + 3600
+    record_rate_limit(scheduler, {
+        'x-ratelimit-resource': 'core', 'x-ratelimit-limit': '5000', 'x-ratelimit-remaining': '4321',
+        'x-ratelimit-reset': str(reset),
+    })
+    assert bucket(scheduler, 'core') == {'limit': 5000, 'remaining': 4321, 'reset': reset}
+
+    # Incomplete or malformed headers are ignored
+    record_rate_limit(scheduler, {'x-ratelimit-resource': 'core', 'x-ratelimit-remaining': '1'})
+    record_rate_limit(scheduler, {'x-ratelimit-resource': 'core', 'x-ratelimit-limit': 'many',
+                                  'x-ratelimit-remaining': '1', 'x-ratelimit-reset': '0'})
+    assert bucket(scheduler, 'core')['remaining'] == 4321
+
+
+def test_new_window_in_headers_clears_pacing(scheduler):
+    reset = time.time() + 100
+    scheduler.record('graphql', 5000, int(5000 * PACE_THRESHOLD) - 1, reset)
+    scheduler.acquire()
+    assert 'next_at' in bucket(scheduler)
+
+    scheduler.record('graphql', 5000, 4999, reset + 3600)
+    assert 'next_at' not in bucket(scheduler)
+
+
+@pytest.mark.parametrize('content', ['{"buckets": ', '[1, 2]', '\0\0\0'])
+def test_corrupt_state_file_starts_over(scheduler, github_limits, content):
+    scheduler.path.parent.mkdir(parents=True)
+    scheduler.path.write_text(content)
+    github_limits.resources = {'graphql': {'limit': 5000, 'remaining': 5000, 'reset': time.time() + 3600}}
+
+    assert scheduler.acquire() == 0.0
+
+    assert bucket(scheduler)['remaining'] == 4999
+
+
+def test_missing_state_and_no_gh_means_no_pacing(scheduler, github_limits, slept):
+    assert not scheduler.path.exists()
+
+    assert scheduler.acquire() == 0.0
+
+    assert github_limits.calls == 1
+    assert json.loads(scheduler.path.read_text()) == {'refreshed': pytest.approx(time.time(), abs=60)}
+    assert slept == []
+
+
+def test_rate_limit_response_reports_the_wait(scheduler, github_limits):
+    github_limits.resources = {'graphql': {'limit': 5000, 'remaining': 0, 'reset': time.time() + 100}}
+    assert 100 < scheduler.on_rate_limited() <= 101
+
+    # Budget left means a secondary limit
+    github_limits.resources['graphql']['remaining'] = 10
+    assert scheduler.on_rate_limited() is None
+
+
+def test_scheduler_can_be_turned_off(tmp_path, monkeypatch):
+    monkeypatch.setattr(rate_limit, '_scheduler', None)
+    monkeypatch.setenv('KEEP_RATE_LIMIT_STATE', str(tmp_path / 'state.json'))
+    monkeypatch.setenv('KEEP_RATE_LIMIT', 'off')
+    assert get_scheduler() is None
+
+    monkeypatch.setenv('KEEP_RATE_LIMIT', 'on')
+    monkeypatch.setenv('KEEP_RATE_LIMIT_MAX_WAIT', 'soon')
+    scheduler = get_scheduler()
+    assert scheduler.path == tmp_path / 'state.json'
+    assert scheduler.max_wait == rate_limit.DEFAULT_MAX_WAIT
@@ -0,0 +1,76 @@
+"""Tests for the conditional-request cache (response_cache.py)"""
+
+import json
+
+import pytest
+
+from response_cache import ResponseCache, response_cache_path, response_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with ResponseCache(tmp_path / 'responses.db', max_bytes=100) as cache:
+        yield cache
+
+
+def test_validators_are_sent_back(cache):
+    assert cache.validators('repos/o/r') == {}
+
+    cache.store('repos/o/r', {'etag': '"v1"', 'last-modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}, {'id': 1})
+
+    assert cache.validators('repos/o/r') == {
+        'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+    }
+    assert cache.hit('repos/o/r') == (True, {'id': 1})
+
+
+def test_response_without_validators_is_not_kept(cache):
+    cache.store('repos/o/r', {'etag': '"v1"'}, {'id': 1})
+    cache.store('repos/o/r', {}, {'id': 2})
+
+    assert cache.validators('repos/o/r') == {}
+    assert cache.hit('repos/o/r') == (False, None)
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    body = {'pad': 'x' * 20}  # 33 bytes stored
+    for key in ('a', 'b', 'c'):
+        cache.store(key, {'etag': key}, body)
+    cache.hit('a')
+
+    cache.store('d', {'etag': 'd'}, body)
+
+    assert [key for key in 'abcd' if cache.validators(key)] == ['a', 'c', 'd']
+    stats = cache.stats()
+    assert (stats['entries'], stats['bytes'], stats['evictions']) == (3, 3 * len(json.dumps(body)), 1)
+
+
+def test_stats_count_hits_and_misses(cache):
+    cache.store('a', {'etag': 'a'}, [])
+    cache.hit('a')
+    cache.hit('a')
+    cache.hit('gone')
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['hit_rate']) == (2, 1, 0.667)
+
+    cache.clear()
+    assert cache.stats()['entries'] == 0
+    assert cache.stats()['hit_rate'] is None
+
+
+def test_response_key_ignores_parameter_order():
+    assert response_key('repos/o/r/labels', {'per_page': 100, 'page': 2}) == 'repos/o/r/labels?page=2&per_page=100'
+    assert response_key('repos/o/r') == 'repos/o/r'
+
+
+def test_cache_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('KEEP_RESPONSE_CACHE', raising=False)
+    assert response_cache_path() is None
+
+    (tmp_path / '.claude').mkdir()
+    assert str(response_cache_path()) == '.claude/cache/responses.db'
+
+    monkeypatch.setenv('KEEP_RESPONSE_CACHE', 'off')
+    assert response_cache_path() is None
@@ -0,0 +1,201 @@
+"""Tests for the persisted score and blocker memos (scoring.ScoreMemo, blockers.load_blocker_memo)"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import blockers
+import scoring
+from blockers import MEMO_MIN_BODY, load_blocker_memo, parse_blockers, save_blocker_memo
+from conftest import SCRIPTS_DIR
+from scoring import MEMO_MIN_INPUT_BYTES, ContinuityMatcher, ScoreMemo
+
+CONTEXT = {'recent_directories': ['src/auth'], 'recent_issues': ['7']}
+
+
+class CountingMatcher(ContinuityMatcher):
+    def __init__(self, context):
+        super().__init__(tuple(context['recent_directories']), tuple(context['recent_issues']))
+        self.scans = 0
+
+    def match(self, title, body):
+        self.scans += 1
+        return super().match(title, body)
+
+
+def test_score_memo_reuses_scans_until_the_body_changes(tmp_path):
+    path = tmp_path / 'scores.json'
+    memo = ScoreMemo.load(path)
+    matcher = CountingMatcher(CONTEXT)
+    key = memo.scan_key(CONTEXT)
+
+    assert memo.match(1, 'Login', 'Touches src/auth, see #7', matcher, key) == ('src/auth', '7')
+    memo.save()
+
+    memo = ScoreMemo.load(path)
+    assert memo.match(1, 'Login', 'Touches src/auth, see #7', matcher, key) == ('src/auth', '7')
+    assert matcher.scans == 1
+
+    assert memo.match(1, 'Login', 'Touches src/api now', matcher, key) == (None, None)
+    assert matcher.scans == 2
+
+
+def test_score_memo_rescans_when_the_context_changes(tmp_path):
+    memo = ScoreMemo.load(tmp_path / 'scores.json')
+    matcher = CountingMatcher(CONTEXT)
+    memo.match(1, 'Login', 'Touches src/auth', matcher, memo.scan_key(CONTEXT))
+
+    context = dict(CONTEXT, recent_directories=['src/api'])
+    assert memo.scan_key(context) != memo.scan_key(CONTEXT)
+    assert memo.match(1, 'Login', 'Touches src/auth', CountingMatcher(context), memo.scan_key(context)) == (None, None)
+
+    # Labels aren't part of the scan
+    assert memo.scan_key(dict(CONTEXT, recent_labels=['bug'])) == memo.scan_key(CONTEXT)
+
+
+def test_score_memo_version_bump_discards_entries(tmp_path, monkeypatch):
+    path = tmp_path / 'scores.json'
+    memo = ScoreMemo.load(path)
+    memo.match(1, 'Login', 'Touches src/auth', CountingMatcher(CONTEXT), memo.scan_key(CONTEXT))
+    memo.save()
+    assert ScoreMemo.load(path).entries
+
+    monkeypatch.setattr(scoring, 'SCORE_MEMO_VERSION', scoring.SCORE_MEMO_VERSION + 1)
+    assert ScoreMemo.load(path).entries == {}
+
+    path.write_text('{"version": ')
+    assert ScoreMemo.load(path).entries == {}
+
+
+def test_score_memo_drops_issues_not_seen_again(tmp_path):
+    path = tmp_path / 'scores.json'
+    memo = ScoreMemo.load(path)
+    key = memo.scan_key(CONTEXT)
+    for number in (1, 2):
+        memo.match(number, 'Issue', 'body', CountingMatcher(CONTEXT), key)
+    memo.save()
+
+    memo = ScoreMemo.load(path)
+    memo.match(2, 'Issue', 'body', CountingMatcher(CONTEXT), key)
+    memo.save()
+
+    assert set(json.loads(path.read_text())['entries']) == {'2'}
+
+
+@pytest.fixture
+def blocker_memo(tmp_path, monkeypatch):
+    monkeypatch.setattr(blockers, '_memo', {})
+    monkeypatch.setattr(blockers, '_memo_used', {})
+    monkeypatch.setattr(blockers, '_memo_dirty', False)
+    monkeypatch.setattr(blockers, '_memo_enabled', False)
+    return tmp_path / 'blockers.json'
+
+
+def long_body(text):
+    return text + ' ' + 'x' * MEMO_MIN_BODY
+
+
+def persisted(path):
+    return json.loads(path.read_text())['entries']
+
+
+def test_blocker_memo_is_off_until_loaded(blocker_memo):
+    assert parse_blockers(long_body('depends on #1')) == ['1']
+    assert blockers._memo == {}
+
+
+def test_blocker_memo_serves_persisted_results(blocker_memo, monkeypatch):
+    load_blocker_memo(blocker_memo)
+    body = long_body('depends on #1')
+    assert parse_blockers(body) == ['1']
+    assert parse_blockers('needs #2') == ['2']  # too short to memoize
+    save_blocker_memo(blocker_memo)
+    (key,) = persisted(blocker_memo)
+
+    # A stored result is trusted as long as the body hashes the same
+    blocker_memo.write_text(json.dumps({'version': blockers.BLOCKER_MEMO_VERSION, 'entries': {key: ['9']}}))
+    monkeypatch.setattr(blockers, '_memo', {})
+    load_blocker_memo(blocker_memo)
+    assert parse_blockers(body) == ['9']
+
+    assert parse_blockers(long_body('depends on #1, needs #3')) == ['1', '3']
+
+
+def test_blocker_memo_version_bump_discards_entries(blocker_memo, monkeypatch):
+    load_blocker_memo(blocker_memo)
+    parse_blockers(long_body('depends on #1'))
+    save_blocker_memo(blocker_memo)
+    (key,) = persisted(blocker_memo)
+    blocker_memo.write_text(json.dumps({'version': blockers.BLOCKER_MEMO_VERSION, 'entries': {key: ['9']}}))
+
+    monkeypatch.setattr(blockers, '_memo', {})
+    monkeypatch.setattr(blockers, 'BLOCKER_MEMO_VERSION', blockers.BLOCKER_MEMO_VERSION + 1)
+    load_blocker_memo(blocker_memo)
+
+    assert parse_blockers(long_body('depends on #1')) == ['1']
+
+
+STATE = """# Session State
+
+## Active Work
+
+**Current Issue:** #7 - Session store
+
+## Context
+- Working primarily in src/auth/
+"""
+
+
+def backlog(changed=()):
+    """Enough issues to pass MEMO_MIN_INPUT_BYTES, with long bodies"""
+    issues = []
+    for n in range(1, 301):
+        body = f"Touches {'src/auth' if n % 3 == 0 else 'src/api'}; see #{7 if n % 5 == 0 else n}. "
+        if n % 4 == 0:
+            body += f"Depends on #{n - 1}. "
+        if n in changed:
+            body = body.replace('src/api', 'src/auth') + 'Needs #1. '
+        issues.append({'number': n, 'title': f'Issue {n}', 'body': body + 'lorem ipsum ' * 50,
+                       'labels': [{'name': 'bug'}] if n % 7 == 0 else [], 'state': 'OPEN',
+                       'updatedAt': '2024-01-01T00:00:00Z'})
+    return json.dumps(issues)
+
+
+def test_cached_and_uncached_json_output_match(tmp_path):
+    project = tmp_path / 'project'
+    (project / '.claude').mkdir(parents=True)
+    state = project / '.claude' / 'state.md'
+    state.write_text(STATE)
+    outside = tmp_path / 'outside'
+    outside.mkdir()
+    issues = tmp_path / 'issues.json'
+    env = dict(os.environ, KEEP_DAEMON='off', KEEP_TEXT_INDEX='off', PYTHONHASHSEED='0')
+
+    def score(cwd):
+        return subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / 'score_issues.py'), '--issues', str(issues),
+             '--recent-work', str(state), '--json'],
+            cwd=cwd, env=env, capture_output=True, text=True, check=True
+        ).stdout
+
+    issues.write_text(backlog())
+    assert issues.stat().st_size >= MEMO_MIN_INPUT_BYTES
+    uncached = score(outside)
+    assert not (outside / '.claude').exists()
+
+    assert score(project) == uncached
+    assert (project / '.claude' / 'cache' / 'scores.json').exists()
+    assert (project / '.claude' / 'cache' / 'blockers.json').exists()
+    assert score(project) == uncached
+
+    # Changed bodies invalidate their entries
+    issues.write_text(backlog(changed={2, 10}))
+    uncached = score(outside)
+    assert score(project) == uncached
+
+    # ... and so does new recent work
+    state.write_text(STATE.replace('src/auth/', 'src/api/'))
+    assert score(project) == score(outside)
@@ -0,0 +1,144 @@
+"""Tests for the state.md parser and its sidecar cache (state_file.py)"""
+
+import json
+import os
+
+import pytest
+
+from state_file import STATE_CACHE_VERSION, load_state, parse_state, work_issue_numbers
+
+STATE = """# Session State
+
+**Last Updated:** 2024-10-22T14:30:00Z
+
+## Active Work
+
+**Current Issue:** #1234 - Session store
+**Branch:** feature/1234-session
+**Labels:** backend, auth
+
+### Progress
+- ✅ Schema (100% done)
+- 🔄 Token refresh (60%)
+
+### Next Steps
+1. Wire up octo/web#88
+
+## Recent Work
+
+**Previous Issue:** #1200 - Login form (Completed 2024-10-21)
+
+## Blockers
+
+- None currently
+
+## Context
+
+- Working primarily in src/auth/, src/session
+- Related: #1100
+"""
+
+
+@pytest.fixture
+def state_md(tmp_path):
+    path = tmp_path / '.claude' / 'state.md'
+    path.parent.mkdir()
+    path.write_text(STATE)
+    return path
+
+
+def sidecar(state_md):
+    return state_md.parent / 'cache' / 'state.json'
+
+
+def test_parse_sections():
+    state = parse_state(STATE)
+
+    active = state['active_work']
+    assert (active['issue_number'], active['issue_title'], active['branch']) == (1234, 'Session store',
+                                                                                 'feature/1234-session')
+    assert active['progress_items'] == [
+        {'status': 'completed', 'text': 'Schema', 'percentage': 100},
+        {'status': 'in_progress', 'text': 'Token refresh', 'percentage': 60},
+    ]
+    assert active['next_steps'] == ['Wire up octo/web#88']
+    assert state['recent_work'] == [{'issue_number': 1200, 'title': 'Login form', 'completed': '2024-10-21'}]
+    assert state['blockers'] == []
+    assert state['context']['directories'] == ['src/auth', 'src/session']
+    assert state['context']['related_issues'] == [1100]
+    assert state['labels'] == ['backend', 'auth']
+    assert state['issue_refs'] == ['1234', '88', '1200', '1100']
+    assert state['repo_issue_refs'] == ['1234', 'octo/web#88', '1200', '1100']
+    assert work_issue_numbers(state) == [1234, 1200, 1100]
+
+
+def test_sidecar_is_reused_while_mtime_and_size_match(state_md):
+    parsed = load_state(str(state_md))
+    cached = json.loads(sidecar(state_md).read_text())
+    assert cached['key']['version'] == STATE_CACHE_VERSION
+    assert cached['state'] == parsed
+
+    # Same size and mtime: served from the sidecar without reading the file
+    stat = state_md.stat()
+    state_md.write_text(STATE.replace('Session store', 'Session stork'))
+    os.utime(state_md, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert load_state(str(state_md))['active_work']['issue_title'] == 'Session store'
+    assert load_state(str(state_md), use_cache=False)['active_work']['issue_title'] == 'Session stork'
+
+
+def test_appended_lines_are_parsed(state_md):
+    load_state(str(state_md))
+
+    with open(state_md, 'a') as f:
+        f.write('- Working primarily in docs/\n')
+
+    state = load_state(str(state_md))
+    assert state['context']['directories'] == ['src/auth', 'src/session', 'docs']
+    assert json.loads(sidecar(state_md).read_text())['state'] == state
+
+
+def test_rewritten_file_of_the_same_size_is_parsed_again(state_md):
+    load_state(str(state_md))
+    stat = state_md.stat()
+
+    state_md.write_text(STATE.replace('#1200', '#1201'))
+    os.utime(state_md, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert state_md.stat().st_size == stat.st_size
+    assert load_state(str(state_md))['recent_work'][0]['issue_number'] == 1201
+
+
+def test_truncated_file_is_parsed_again(state_md):
+    load_state(str(state_md))
+
+    state_md.write_text(STATE[:STATE.index('## Recent Work')])
+
+    state = load_state(str(state_md))
+    assert state['recent_work'] == []
+    assert state['active_work']['issue_number'] == 1234
+
+    state_md.write_text('')
+    state = load_state(str(state_md))
+    assert state['active_work'] is None
+    assert state['issue_refs'] == []
+
+
+@pytest.mark.parametrize('content', ['{not json', '[]', '{"key": {}}', ''])
+def test_unreadable_sidecar_is_replaced(state_md, content):
+    sidecar(state_md).parent.mkdir()
+    sidecar(state_md).write_text(content)
+
+    assert load_state(str(state_md))['active_work']['issue_number'] == 1234
+    assert json.loads(sidecar(state_md).read_text())['state']['active_work']['issue_number'] == 1234
+
+
+def test_state_outside_claude_dir_has_no_sidecar(tmp_path):
+    path = tmp_path / 'state.md'
+    path.write_text(STATE)
+
+    assert load_state(str(path))['labels'] == ['backend', 'auth']
+    assert not (tmp_path / 'cache').exists()
+
+
+def test_missing_file(tmp_path):
+    assert load_state(str(tmp_path / '.claude' / 'state.md')) is None
@@ -0,0 +1,91 @@
+"""Tests for scoring through text index database errors (scoring.py)"""
+
+import io
+import json
+import sqlite3
+
+import pytest
+
+from scoring import close_text_index, parse_state_file, score_all_issues, score_issues_streaming
+from text_index import TextIndex
+
+STATE = """# Session State
+
+## Active Work
+
+**Current Issue:** #1 - Cache invalidation for the session store
+
+### Next Steps
+1. Expire session cache entries on logout
+
+## Context
+- Working primarily in src/session/
+"""
+
+ISSUES = [
+    {'number': 1, 'title': 'Cache invalidation for the session store', 'body': 'src/session/store.py',
+     'labels': [], 'state': 'OPEN', 'createdAt': '2024-01-01T00:00:00Z', 'updatedAt': '2024-01-02T00:00:00Z'},
+    {'number': 2, 'title': 'Session cache keeps expired entries', 'body': 'Entries outlive logout.',
+     'labels': [], 'state': 'OPEN', 'createdAt': '2024-01-01T00:00:00Z', 'updatedAt': '2024-01-02T00:00:00Z'},
+    {'number': 3, 'title': 'Render docs sidebar', 'body': 'Unrelated.',
+     'labels': [{'name': 'priority: high'}], 'state': 'OPEN',
+     'createdAt': '2024-01-01T00:00:00Z', 'updatedAt': '2024-01-02T00:00:00Z'},
+]
+
+
+def locked(*args, **kwargs):
+    raise sqlite3.OperationalError('database is locked')
+
+
+@pytest.fixture
+def context(tmp_path):
+    state = tmp_path / 'state.md'
+    state.write_text(STATE)
+    return parse_state_file(str(state))
+
+
+@pytest.fixture
+def text_index(tmp_path):
+    index = TextIndex(tmp_path / 'text_index.db')
+    yield index
+    index.conn.close()
+
+
+def test_working_index_adds_similarity(context, text_index):
+    scored = score_all_issues([dict(issue) for issue in ISSUES], context, text_index=text_index)
+    close_text_index(text_index)
+
+    assert next(s for s in scored if s['number'] == 2)['continuity_reason'].startswith('similar to recent work')
+
+
+@pytest.mark.parametrize('method', ['add', 'flush', 'search'])
+def test_database_error_scores_without_similarity(context, text_index, monkeypatch, capsys, method):
+    expected = score_all_issues([dict(issue) for issue in ISSUES], context)
+    monkeypatch.setattr(text_index, method, locked)
+
+    scored = score_all_issues([dict(issue) for issue in ISSUES], context, text_index=text_index)
+    close_text_index(text_index)
+
+    assert scored == expected
+    assert text_index.failed
+    assert capsys.readouterr().err.count('Warning: text index unavailable') == 1
+
+
+def test_streaming_scores_through_a_failing_index(context, text_index, monkeypatch, capsys):
+    expected = score_issues_streaming(io.StringIO(json.dumps(ISSUES)), context, 3)
+    monkeypatch.setattr(text_index, 'add', locked)
+
+    scored = score_issues_streaming(io.StringIO(json.dumps(ISSUES)), context, 3, text_index=text_index)
+
+    assert scored == expected
+    assert 'database is locked' in capsys.readouterr().err
+
+
+def test_failing_close_drops_queued_issues(context, text_index, monkeypatch, capsys):
+    text_index.add(4, '2024-01-02T00:00:00Z', 'Queued', '')
+    monkeypatch.setattr(text_index, 'flush', locked)
+
+    close_text_index(text_index)
+
+    assert text_index.failed
+    assert 'database is locked' in capsys.readouterr().err
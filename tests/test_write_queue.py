@@ -0,0 +1,101 @@
+"""Tests for the offline write queue and its replay (write_queue.py, github_ops.flush_write_queue)"""
+
+import pytest
+
+import github_ops
+from github_ops import GitHubError, flush_write_queue, submit_write
+from write_queue import WriteQueue, plan_flush
+
+
+class FakeGitHub:
+    """Records comments and closes; closes fail while `down` is set"""
+
+    def __init__(self, monkeypatch):
+        self.comments = []
+        self.closes = []
+        self.down = False
+        monkeypatch.setattr(github_ops, 'post_comment', self.post_comment)
+        monkeypatch.setattr(github_ops, 'close_issue', self.close_issue)
+
+    def post_comment(self, issue_number, body):
+        self.comments.append((issue_number, body))
+        return {'success': True}
+
+    def close_issue(self, issue_number, reason=None):
+        assert reason is None
+        if self.down:
+            raise GitHubError('GitHub command failed: connection reset')
+        self.closes.append(issue_number)
+        return {'number': int(issue_number), 'state': 'CLOSED'}
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    path = tmp_path / 'pending.jsonl'
+    monkeypatch.setenv('KEEP_WRITE_QUEUE', str(path))
+    return WriteQueue(path)
+
+
+def test_plan_flush_coalesces_per_issue(queue):
+    queue.append('comment', '1', body='first')
+    queue.append('close', '1', reason='done')
+    queue.append('comment', '2', body='other')
+    queue.append('close', '1', reason='done')
+
+    plan = plan_flush(queue.pending())
+
+    assert [step['issue'] for step in plan] == ['1', '2']
+    assert plan[0]['comment'] == 'first\n\n---\n\ndone'
+    assert plan[0]['close'] is True
+    assert plan[0]['comment_seqs'] == [1]
+    assert plan[0]['close_seqs'] == [2, 4]
+    assert plan[0]['reason_seqs'] == [2, 4]
+    assert plan[1] == {
+        'issue': '2', 'comment': 'other', 'close': False,
+        'comment_seqs': [3], 'close_seqs': [], 'reason_seqs': [],
+    }
+
+
+def test_failed_close_does_not_repost_its_reason(queue, monkeypatch):
+    github = FakeGitHub(monkeypatch)
+    queue.append('close', '7', reason='Fixed in #8')
+
+    github.down = True
+    for _ in range(2):
+        summary = flush_write_queue()
+        assert summary['pending'] == 1
+        assert 'connection reset' in summary['error']
+
+    github.down = False
+    summary = flush_write_queue()
+
+    assert github.comments == [('7', 'Fixed in #8')]
+    assert github.closes == ['7']
+    assert summary['pending'] == 0
+    assert queue.pending() == []
+
+
+def test_direct_close_queues_only_the_close_once_reason_is_posted(queue, monkeypatch):
+    github = FakeGitHub(monkeypatch)
+    github.down = True
+
+    result = submit_write('close', '7', reason='Fixed in #8')
+
+    assert result['mode'] == 'offline_queued'
+    assert [op.get('reason') for op in queue.pending()] == [None]
+
+    github.down = False
+    flush_write_queue()
+
+    assert github.comments == [('7', 'Fixed in #8')]
+    assert github.closes == ['7']
+
+
+def test_torn_last_line_is_ignored(queue):
+    queue.append('comment', '1', body='kept')
+    with open(queue.path, 'a') as f:
+        f.write('{"seq": 2, "op": "comm')
+
+    queue.append('comment', '1', body='after')
+
+    assert [op['body'] for op in queue.pending()] == ['kept', 'after']